@@ -0,0 +1,168 @@
+"""
+Check the NumPy batch decoders against the per-log fast decoders and measure throughput.
+
+Random V2 Pair / V3 Pool logs (with boundary values: 0, 2^64 - 1, 2^64,
+2^256 - 1, negative int256, int24 limits) are decoded both ways and compared
+row by row, in raw JSON form and in web3 (HexBytes) form; then batch
+decoding of --swaps V2 Swap logs is timed.
+
+Usage:
+    python -m benchmarks.check_batch_decoder --samples 20000 --swaps 1000000
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from hexbytes import HexBytes
+
+from src.core.batch_decoder import columns_to_events
+from src.protocols.uniswap_v2.decoders import event_decoder as v2
+from src.protocols.uniswap_v3.decoders import event_decoder as v3
+
+
+UINT_EDGES = (0, 1, (1 << 64) - 1, 1 << 64, (1 << 128) - 1, (1 << 256) - 1)
+INT_EDGES = (0, -1, 1, (1 << 63) - 1, -(1 << 63), 1 << 63, -(1 << 63) - 1, (1 << 255) - 1, -(1 << 255))
+
+
+def _uint(rng: random.Random, bits: int = 256) -> int:
+    if rng.random() < 0.2:
+        return rng.choice([v for v in UINT_EDGES if v < 1 << bits])
+    return rng.getrandbits(rng.choice((16, 64, 96, bits)))
+
+
+def _int(rng: random.Random, bits: int = 256) -> int:
+    bound = 1 << (bits - 1)
+    if rng.random() < 0.2:
+        return rng.choice([v for v in INT_EDGES + (bound - 1, -bound) if -bound <= v < bound])
+    value = rng.getrandbits(rng.randint(1, bits - 1))
+    return -value if rng.random() < 0.5 else value
+
+
+def _word(value: int) -> bytes:
+    return value.to_bytes(32, 'big', signed=value < 0)
+
+
+def _address_word(rng: random.Random) -> bytes:
+    return bytes(12) + rng.getrandbits(160).to_bytes(20, 'big')
+
+
+def _log(rng: random.Random, topic0: str, topics: list, words: list) -> dict:
+    """Log in raw JSON-RPC form (hex strings), as replayed from fixtures."""
+    return {
+        'address': '0x' + rng.getrandbits(160).to_bytes(20, 'big').hex(),
+        'topics': [topic0] + ['0x' + topic.hex() for topic in topics],
+        'data': '0x' + b''.join(words).hex(),
+        'blockNumber': rng.randint(10_000_835, 20_000_000),
+        'transactionHash': '0x' + rng.getrandbits(256).to_bytes(32, 'big').hex(),
+        'logIndex': rng.randint(0, 500),
+    }
+
+
+def as_web3(log: dict) -> dict:
+    """Same log as returned by web3 (HexBytes topics, data and transaction hash)."""
+    return dict(
+        log,
+        topics=[HexBytes(topic) for topic in log['topics']],
+        data=HexBytes(log['data']),
+        transactionHash=HexBytes(log['transactionHash']),
+    )
+
+
+def v2_log(rng: random.Random, name: str) -> dict:
+    if name == 'swap':
+        return _log(rng, v2.get_swap_event_signature(), [_address_word(rng), _address_word(rng)],
+                    [_word(_uint(rng)) for _ in range(4)])
+    if name == 'mint':
+        return _log(rng, v2.get_mint_event_signature(), [_address_word(rng)], [_word(_uint(rng)) for _ in range(2)])
+    return _log(rng, v2.get_burn_event_signature(), [_address_word(rng), _address_word(rng)],
+                [_word(_uint(rng)) for _ in range(2)])
+
+
+def v3_log(rng: random.Random, name: str) -> dict:
+    topic0 = getattr(v3, f'get_{name}_event_signature')()
+    ticks = [_word(_int(rng, 24)), _word(_int(rng, 24))]
+    if name == 'initialize':
+        return _log(rng, topic0, [], [_word(_uint(rng, 160)), _word(_int(rng, 24))])
+    if name == 'mint':
+        return _log(rng, topic0, [_address_word(rng)] + ticks,
+                    [_address_word(rng), _word(_uint(rng, 128)), _word(_uint(rng)), _word(_uint(rng))])
+    if name == 'burn':
+        return _log(rng, topic0, [_address_word(rng)] + ticks,
+                    [_word(_uint(rng, 128)), _word(_uint(rng)), _word(_uint(rng))])
+    if name == 'collect':
+        return _log(rng, topic0, [_address_word(rng)] + ticks,
+                    [_address_word(rng), _word(_uint(rng, 128)), _word(_uint(rng, 128))])
+    if name == 'swap':
+        return _log(rng, topic0, [_address_word(rng), _address_word(rng)],
+                    [_word(_int(rng)), _word(_int(rng)), _word(_uint(rng, 160)), _word(_uint(rng, 128)),
+                     _word(_int(rng, 24))])
+    return _log(rng, topic0, [_address_word(rng), _address_word(rng)], [_word(_uint(rng)) for _ in range(4)])
+
+
+def check(name: str, logs: list, decode_one, decode_batch) -> int:
+    """Compare batch and per-log decoding of `logs`; return the number of mismatching rows."""
+    expected = {}
+    for log in logs:
+        event = decode_one(log)
+        expected.setdefault(event['event_type'], []).append(event)
+    mismatches = 0
+    for event_type, columns in decode_batch(logs).items():
+        for actual, reference in zip(columns_to_events(event_type, columns), expected[event_type]):
+            if actual != reference:
+                mismatches += 1
+                if mismatches <= 10:
+                    diff = {k: (actual.get(k), v) for k, v in reference.items() if actual.get(k) != v}
+                    print(f"Mismatch in {name} {event_type} (batch, per-log): {diff}")
+    print(f"{name:<8} {len(logs)} logs checked")
+    return mismatches
+
+
+def throughput(num_swaps: int, seed: int) -> None:
+    """Time per-log vs batch decoding of web3-form V2 Swap logs with realistic (64-bit) amounts."""
+    rng = random.Random(seed)
+    topic0 = v2.get_swap_event_signature()
+    logs = [
+        as_web3(_log(rng, topic0, [_address_word(rng), _address_word(rng)], [_word(rng.getrandbits(60)) for _ in range(4)]))
+        for _ in range(num_swaps)
+    ]
+    per_log_sample = logs[:min(num_swaps, 100_000)]
+    started = time.perf_counter()
+    for log in per_log_sample:
+        v2.decode_pair_event(log)
+    per_log = len(per_log_sample) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    v2.decode_pair_events_batch(logs)
+    elapsed = time.perf_counter() - started
+    print(f"per-log  {per_log:>12,.0f} events/s")
+    print(f"batch    {num_swaps / elapsed:>12,.0f} events/s  ({num_swaps} swaps in {elapsed:.2f}s)")
+    print(f"speedup  {num_swaps / elapsed / per_log:>12.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate batch decoders against per-log decoders and time them')
+    parser.add_argument('--samples', type=int, default=5_000, help='Random logs per protocol')
+    parser.add_argument('--swaps', type=int, default=1_000_000, help='V2 Swap logs for the throughput run')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    v2.configure_decoder_crosscheck(0.0)
+    v3.configure_decoder_crosscheck(0.0)
+    rng = random.Random(args.seed)
+    v2_names = ['swap', 'mint', 'burn']
+    v3_names = ['initialize', 'mint', 'burn', 'collect', 'swap', 'flash']
+    v2_logs = [v2_log(rng, rng.choice(v2_names)) for _ in range(args.samples)]
+    v3_logs = [v3_log(rng, rng.choice(v3_names)) for _ in range(args.samples)]
+    mismatches = 0
+    for form, convert in (('json', dict), ('web3', as_web3)):
+        mismatches += check(f'v2/{form}', [convert(log) for log in v2_logs], v2.decode_pair_event, v2.decode_pair_events_batch)
+        mismatches += check(f'v3/{form}', [convert(log) for log in v3_logs], v3.decode_pool_event, v3.decode_pool_events_batch)
+    print(f"\n{mismatches} mismatches\n")
+    throughput(args.swaps, args.seed + 1)
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
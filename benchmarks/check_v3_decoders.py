@@ -0,0 +1,158 @@
+"""
+Property check and throughput comparison of the fast V3 pool event decoders.
+
+Random and boundary values over the full range of every field type (int256
+amounts, int24 ticks, uint160 sqrtPriceX96, uint128 liquidity/amounts,
+addresses) are ABI-encoded with eth_abi, decoded by both the fast path and
+the eth_abi reference decoders, and compared field by field. Then decode
+throughput of both paths is measured on the same logs.
+
+Usage:
+    python -m benchmarks.check_v3_decoders --samples 20000
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from eth_abi import encode
+from hexbytes import HexBytes
+
+from src.core.addresses import format_addresses
+from src.protocols.uniswap_v3.decoders import event_decoder as d
+
+
+INT256 = (-(1 << 255), (1 << 255) - 1)
+INT24 = (-(1 << 23), (1 << 23) - 1)
+UINT256 = (0, (1 << 256) - 1)
+UINT160 = (0, (1 << 160) - 1)
+UINT128 = (0, (1 << 128) - 1)
+
+
+def _value(rng: random.Random, bounds: tuple) -> int:
+    """Boundary values (min, max, 0, +-1) in 1 of 4 draws, otherwise uniform over a random bit width."""
+    low, high = bounds
+    if rng.random() < 0.25:
+        return rng.choice([v for v in (low, high, 0, 1, -1, low + 1, high - 1) if low <= v <= high])
+    bits = rng.randint(1, high.bit_length())
+    value = rng.getrandbits(bits)
+    if low < 0 and rng.random() < 0.5:
+        value = -value - 1
+    return max(low, min(high, value))
+
+
+def _address(rng: random.Random) -> str:
+    return '0x' + rng.getrandbits(160).to_bytes(20, 'big').hex()
+
+
+def _topic(types: list, values: list) -> HexBytes:
+    return HexBytes(encode(types, values))
+
+
+def _random_log(rng: random.Random, name: str) -> dict:
+    """Random log for event `name` in the format returned by web3 (HexBytes topics/data)."""
+    owner, other = _address(rng), _address(rng)
+    tick_lower, tick_upper = _value(rng, INT24), _value(rng, INT24)
+    if name == 'initialize':
+        topics = []
+        data = encode(['uint160', 'int24'], [_value(rng, UINT160), _value(rng, INT24)])
+    elif name == 'mint':
+        topics = [_topic(['address'], [owner]), _topic(['int24'], [tick_lower]), _topic(['int24'], [tick_upper])]
+        data = encode(['address', 'uint128', 'uint256', 'uint256'],
+                      [other, _value(rng, UINT128), _value(rng, UINT256), _value(rng, UINT256)])
+    elif name == 'burn':
+        topics = [_topic(['address'], [owner]), _topic(['int24'], [tick_lower]), _topic(['int24'], [tick_upper])]
+        data = encode(['uint128', 'uint256', 'uint256'], [_value(rng, UINT128), _value(rng, UINT256), _value(rng, UINT256)])
+    elif name == 'collect':
+        topics = [_topic(['address'], [owner]), _topic(['int24'], [tick_lower]), _topic(['int24'], [tick_upper])]
+        data = encode(['address', 'uint128', 'uint128'], [other, _value(rng, UINT128), _value(rng, UINT128)])
+    elif name == 'swap':
+        topics = [_topic(['address'], [owner]), _topic(['address'], [other])]
+        data = encode(['int256', 'int256', 'uint160', 'uint128', 'int24'],
+                      [_value(rng, INT256), _value(rng, INT256), _value(rng, UINT160), _value(rng, UINT128), _value(rng, INT24)])
+    else:
+        topics = [_topic(['address'], [owner]), _topic(['address'], [other])]
+        data = encode(['uint256'] * 4, [_value(rng, UINT256) for _ in range(4)])
+
+    topic0 = HexBytes(getattr(d, f'get_{name}_event_signature')())
+    return {
+        'address': d.Web3.to_checksum_address(_address(rng)),
+        'topics': [topic0] + topics,
+        'data': HexBytes(data),
+        'blockNumber': rng.randint(12_369_621, 20_000_000),
+        'transactionHash': HexBytes(rng.getrandbits(256).to_bytes(32, 'big')),
+        'logIndex': rng.randint(0, 500),
+    }
+
+
+EVENTS = {
+    'initialize': (d.decode_initialize_event, d.decode_initialize_event_abi),
+    'mint': (d.decode_mint_event, d.decode_mint_event_abi),
+    'burn': (d.decode_burn_event, d.decode_burn_event_abi),
+    'collect': (d.decode_collect_event, d.decode_collect_event_abi),
+    'swap': (d.decode_swap_event, d.decode_swap_event_abi),
+    'flash': (d.decode_flash_event, d.decode_flash_event_abi),
+}
+
+
+_REFERENCE_BY_TOPIC = {
+    HexBytes(getattr(d, f'get_{name}_event_signature')()): reference for name, (_, reference) in EVENTS.items()
+}
+
+
+def _decode_pool_event_abi(log: dict) -> dict:
+    """decode_pool_event counterpart that uses only the eth_abi reference decoders."""
+    return _REFERENCE_BY_TOPIC[log['topics'][0]](log)
+
+
+def check(samples: int, seed: int) -> int:
+    """Compare fast and reference decoders on `samples` logs per event; return the number of mismatches."""
+    rng = random.Random(seed)
+    mismatches = 0
+    for name, (fast, reference) in EVENTS.items():
+        for _ in range(samples):
+            log = _random_log(rng, name)
+            expected = reference(log)
+            actual = format_addresses(fast(log))
+            if actual != expected:
+                mismatches += 1
+                if mismatches <= 10:
+                    diff = {k: (actual.get(k), v) for k, v in expected.items() if actual.get(k) != v}
+                    print(f"Mismatch in {name} (fast, reference): {diff}")
+        print(f"{name:<11} {samples} samples checked")
+    return mismatches
+
+
+def throughput(samples: int, seed: int) -> None:
+    """Print decode throughput of both paths on a swap-heavy mix (75% Swap)."""
+    rng = random.Random(seed)
+    names = ['swap'] * 15 + ['mint', 'mint', 'burn', 'collect', 'flash']
+    logs = [_random_log(rng, rng.choice(names)) for _ in range(samples)]
+
+    results = {}
+    for label, decode in (('eth_abi', _decode_pool_event_abi), ('fast', d.decode_pool_event)):
+        started = time.perf_counter()
+        for log in logs:
+            decode(log)
+        elapsed = time.perf_counter() - started
+        results[label] = samples / elapsed
+        print(f"{label:<8} {samples / elapsed:>12,.0f} events/s")
+    print(f"speedup  {results['fast'] / results['eth_abi']:>12.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate fast V3 decoders against eth_abi and compare throughput')
+    parser.add_argument('--samples', type=int, default=5_000, help='Random logs per event type')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    d.configure_decoder_crosscheck(0.0)
+    mismatches = check(args.samples, args.seed)
+    print(f"\n{mismatches} mismatches\n")
+    throughput(args.samples * 4, args.seed + 1)
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Compare two benchmark result files stage by stage.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/new.json
+"""
+
+import argparse
+import json
+
+
+# Metrics shown per stage
+METRICS = ('wall_s', 'events_per_s', 'rpc_calls_per_1k_events', 'peak_rss_mb')
+
+
+def _change(base, new) -> str:
+    if not base or new is None:
+        return 'n/a'
+    return f"{(new - base) / base:+.1%}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two benchmark result JSON files')
+    parser.add_argument('base', help='Baseline result JSON')
+    parser.add_argument('new', help='New result JSON')
+    args = parser.parse_args()
+
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+
+    print(f"base: {base['revision']} ({base['timestamp']})   new: {new['revision']} ({new['timestamp']})")
+    if base['protocol'] != new['protocol'] or base['params'] != new['params']:
+        print("Warning: results were produced with different protocol/parameters")
+
+    print(f"\n{'stage':<8} {'metric':<24} {'base':>12} {'new':>12} {'change':>9}")
+    for stage in base['stages']:
+        if stage not in new['stages']:
+            continue
+        for metric in METRICS:
+            b = base['stages'][stage].get(metric)
+            n = new['stages'][stage].get(metric)
+            print(f"{stage:<8} {metric:<24} {b if b is not None else '-':>12} {n if n is not None else '-':>12} {_change(b, n):>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+End-to-end benchmark of the pair/pool events pipeline (fetch, enrich, decode, write).
+
+Runs the real indexer functions against the local JSON-RPC stub
+(src.core.stub_server) serving either synthetic fixtures or fixtures recorded
+with RPC_RECORD_DIR, and writes per-stage metrics as JSON:
+
+    wall_s, events, events_per_s, rpc_calls, rpc_requests,
+    rpc_calls_per_1k_events, peak_rss_mb
+
+Usage:
+    python -m benchmarks.run_pipeline -p uniswap_v2 --events 50000
+    python -m benchmarks.run_pipeline -p uniswap_v3 --fixtures data/fixtures --latency-ms 30
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from web3 import Web3
+
+from benchmarks.synthetic import generate_fixtures
+from src.core.parallel_decode import decode_log_batches
+from src.core.rate_limiter import configure_rate_limiter
+from src.core.rpc import get_web3
+from src.core.rpc_cache import configure_rpc_cache
+from src.core.stub_server import StubBehaviour, start_stub_server
+
+
+STAGES = ('fetch', 'enrich', 'decode', 'write')
+
+
+def _pipeline(protocol: str) -> dict:
+    """Stage functions of the protocol's events indexer."""
+    if protocol == 'uniswap_v2':
+        from src.protocols.uniswap_v2.decoders.event_decoder import decode_pair_logs
+        from src.protocols.uniswap_v2.indexers import pairs_indexer as indexer
+        from src.protocols.uniswap_v2.storage.csv_storage import save_pair_events_to_csv
+        return {
+            'fetch': indexer.fetch_pair_logs_in_batches,
+            'indexer': indexer,
+            'decode': decode_pair_logs,
+            'write': lambda events: save_pair_events_to_csv(events, 'uniswap_v2_pair_events.csv'),
+        }
+    from src.protocols.uniswap_v3.decoders.event_decoder import decode_pool_logs
+    from src.protocols.uniswap_v3.indexers import pools_indexer as indexer
+    from src.protocols.uniswap_v3.storage.csv_storage import save_pool_events_to_csv
+    return {
+        'fetch': indexer.fetch_pool_logs_in_batches,
+        'indexer': indexer,
+        'decode': decode_pool_logs,
+        'write': lambda events: save_pool_events_to_csv(events, 'uniswap_v3_pool_events.csv'),
+    }
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (includes the in-process stub server)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return 'unknown'
+
+
+class StageTimer:
+    """Collects wall time, RPC traffic (as seen by the stub) and peak RSS per stage."""
+
+    def __init__(self, server):
+        self.server = server
+        self.stages = {}
+
+    def run(self, name: str, func, *args):
+        calls_before = self.server.stats['calls']
+        requests_before = self.server.stats['requests']
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        self.stages[name] = {
+            'wall_s': round(elapsed, 4),
+            'rpc_calls': self.server.stats['calls'] - calls_before,
+            'rpc_requests': self.server.stats['requests'] - requests_before,
+            'peak_rss_mb': round(_peak_rss_mb(), 1),
+        }
+        return result
+
+    def finish(self, num_events: int) -> dict:
+        """Add per-event rates and a 'total' entry."""
+        for stage in self.stages.values():
+            stage['events'] = num_events
+            stage['events_per_s'] = round(num_events / stage['wall_s'], 1) if stage['wall_s'] else None
+            stage['rpc_calls_per_1k_events'] = round(stage['rpc_calls'] * 1000 / num_events, 2) if num_events else None
+        total_wall = sum(stage['wall_s'] for stage in self.stages.values())
+        total_calls = sum(stage['rpc_calls'] for stage in self.stages.values())
+        self.stages['total'] = {
+            'wall_s': round(total_wall, 4),
+            'events': num_events,
+            'events_per_s': round(num_events / total_wall, 1) if total_wall else None,
+            'rpc_calls': total_calls,
+            'rpc_requests': sum(stage['rpc_requests'] for stage in self.stages.values()),
+            'rpc_calls_per_1k_events': round(total_calls * 1000 / num_events, 2) if num_events else None,
+            'peak_rss_mb': round(_peak_rss_mb(), 1),
+        }
+        return self.stages
+
+
+def run_benchmark(args) -> dict:
+    """Run all stages once and return the result document."""
+    with tempfile.TemporaryDirectory(prefix='bench_') as work_dir:
+        return _run_stages(args, work_dir)
+
+
+def _run_stages(args, work_dir: str) -> dict:
+    """Stages of run_benchmark; fixtures and outputs go to `work_dir`."""
+    pipeline = _pipeline(args.protocol)
+    indexer = pipeline['indexer']
+
+    fixture_dir = args.fixtures
+    if not fixture_dir:
+        fixture_dir = os.path.join(work_dir, 'fixtures')
+        generate_fixtures(
+            args.protocol, fixture_dir, num_events=args.events, num_pools=args.pools,
+            events_per_block=args.events_per_block, events_per_tx=args.events_per_tx, seed=args.seed,
+        )
+
+    behaviour = StubBehaviour(args.latency_ms, args.jitter_ms, args.rate_limit_prob, args.max_logs)
+    server = start_stub_server(fixture_dir, behaviour=behaviour)
+    baseline_rss = _peak_rss_mb()
+
+    # Measure the pipeline itself: no client-side throttling, no on-disk cache
+    configure_rate_limiter(0)
+    configure_rpc_cache('', 0, enabled=False)
+
+    config = {
+        'BATCH_SIZE': args.batch_size,
+        'FETCH_CONCURRENCY': args.workers,
+        'RPC_BATCH_SIZE': args.rpc_batch_size,
+        'TX_FROM_MODE': args.tx_from_mode,
+        'TX_FROM_BLOCK_RATIO': 3.0,
+        'ADAPTIVE_BATCH_SIZE': not args.fixed_window,
+        'MIN_BATCH_SIZE': 10,
+        'MAX_BATCH_SIZE': 100_000,
+        'TARGET_LOGS_PER_BATCH': 5_000,
+        'TARGET_BATCH_SECONDS': 3.0,
+    }
+    # Indexers pass checksummed addresses (load_*_addresses); web3 rejects lowercase ones in filters
+    addresses = [Web3.to_checksum_address(address) for address in server.store.log_addresses()]
+    start_block, end_block = server.store.log_block_range()
+
+    w3 = get_web3('http://%s:%d' % server.server_address)
+    timer = StageTimer(server)
+
+    logs = timer.run(
+        'fetch', lambda: pipeline['fetch'](
+            w3, addresses, start_block, end_block, config['BATCH_SIZE'],
+            workers=config['FETCH_CONCURRENCY'], window=indexer.make_window(config),
+        )
+    )
+    tx_sender_cache = timer.run('enrich', indexer.resolve_transaction_senders, w3, config, logs)
+
+    def decode_all():
+        # Same path as the indexers' _decode_chunk: batch decoders, worker pool for large sets
+        events, positions, errors = decode_log_batches(pipeline['decode'], logs, args.decode_workers)
+        if errors:
+            raise ValueError(errors[0][1])
+        events.set_column('tx_from', [
+            tx_sender_cache.get(indexer._tx_hash_hex(logs[position]['transactionHash']), '')
+            for position in positions
+        ])
+        return events
+
+    events = timer.run('decode', decode_all)
+
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        timer.run('write', pipeline['write'], events)
+    finally:
+        os.chdir(cwd)
+
+    stages = timer.finish(len(logs))
+    server.shutdown()
+    return {
+        'revision': _git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'protocol': args.protocol,
+        'source': 'fixtures' if args.fixtures else 'synthetic',
+        'params': {k: v for k, v in vars(args).items() if k != 'output'},
+        'block_range': [start_block, end_block],
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'stub_stats': dict(server.stats),
+        'stages': stages,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the pair/pool events pipeline against a local RPC stub')
+    parser.add_argument('-p', '--protocol', choices=['uniswap_v2', 'uniswap_v3'], default='uniswap_v2')
+    parser.add_argument('--fixtures', help='Replay recorded fixtures from this directory instead of synthetic data')
+    parser.add_argument('--events', type=int, default=20_000, help='Synthetic events to generate')
+    parser.add_argument('--pools', type=int, default=200, help='Synthetic pair/pool addresses')
+    parser.add_argument('--events-per-block', type=float, default=8.0)
+    parser.add_argument('--events-per-tx', type=float, default=2.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--batch-size', type=int, default=2000, help='Initial eth_getLogs window (BATCH_SIZE)')
+    parser.add_argument('--fixed-window', action='store_true', help='Disable the adaptive eth_getLogs window')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='FETCH_CONCURRENCY')
+    parser.add_argument('--decode-workers', type=int, default=1, help='DECODE_WORKERS (1 = in-process)')
+    parser.add_argument('--rpc-batch-size', type=int, default=50, help='RPC_BATCH_SIZE')
+    parser.add_argument('--tx-from-mode', choices=['auto', 'tx', 'block'], default='auto')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Stub response latency')
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--rate-limit-prob', type=float, default=0.0, help='Stub HTTP 429 probability')
+    parser.add_argument('--max-logs', type=int, default=10_000, help='Stub eth_getLogs cap before -32005')
+    parser.add_argument('-o', '--output', help='Result JSON path (default: benchmarks/results/<protocol>_<rev>.json)')
+    args = parser.parse_args()
+
+    result = run_benchmark(args)
+
+    output = args.output or os.path.join(
+        'benchmarks', 'results', f"{args.protocol}_{result['revision']}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+
+    print(f"\n{'stage':<8} {'wall_s':>9} {'events/s':>11} {'rpc calls':>10} {'calls/1k':>9} {'peak MB':>8}")
+    for name in STAGES + ('total',):
+        stage = result['stages'][name]
+        print(
+            f"{name:<8} {stage['wall_s']:>9.3f} {stage['events_per_s'] or 0:>11.1f} {stage['rpc_calls']:>10} "
+            f"{stage['rpc_calls_per_1k_events'] or 0:>9.2f} {stage['peak_rss_mb']:>8.1f}"
+        )
+    print(f"\nSaved results to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""Synthetic eth_getLogs / tx sender fixtures for Uniswap V2 and V3 pipeline benchmarks."""
+
+import json
+import os
+import random
+
+
+def _word(value: int) -> str:
+    """One 32-byte ABI word (two's complement for negative values), without 0x."""
+    return (value % (1 << 256)).to_bytes(32, 'big').hex()
+
+
+def _address_word(address: str) -> str:
+    return '0x' + '0' * 24 + address[2:]
+
+
+def _random_address(rng: random.Random) -> str:
+    return '0x' + rng.getrandbits(160).to_bytes(20, 'big').hex()
+
+
+def _v2_event(rng: random.Random, topics: dict) -> tuple:
+    """(topics, data) of a random V2 Pair event: 80% Swap, 10% Mint, 10% Burn."""
+    sender, to = _random_address(rng), _random_address(rng)
+    roll = rng.random()
+    if roll < 0.8:
+        amount_in, amount_out = rng.getrandbits(rng.choice((40, 64, 96))), rng.getrandbits(rng.choice((40, 64, 96)))
+        # amount0In, amount1In, amount0Out, amount1Out: token0 -> token1 or token1 -> token0
+        amounts = [amount_in, 0, 0, amount_out] if rng.random() < 0.5 else [0, amount_in, amount_out, 0]
+        return [topics['swap'], _address_word(sender), _address_word(to)], ''.join(_word(a) for a in amounts)
+    amounts = [rng.getrandbits(rng.choice((40, 64, 96))) for _ in range(2)]
+    if roll < 0.9:
+        return [topics['mint'], _address_word(sender)], ''.join(_word(a) for a in amounts)
+    return [topics['burn'], _address_word(sender), _address_word(to)], ''.join(_word(a) for a in amounts)
+
+
+def _v3_event(rng: random.Random, topics: dict) -> tuple:
+    """(topics, data) of a random V3 Pool event, weighted like mainnet traffic (mostly Swap)."""
+    a, b = _random_address(rng), _random_address(rng)
+    tick_lower = rng.randrange(-887220, 887220, 60)
+    tick_upper = tick_lower + 60 * rng.randint(1, 200)
+    roll = rng.random()
+    if roll < 0.75:
+        amount0 = rng.getrandbits(80)
+        amount1 = -rng.getrandbits(80)
+        if rng.random() < 0.5:
+            amount0, amount1 = -amount0, -amount1
+        data = [amount0, amount1, rng.getrandbits(150), rng.getrandbits(100), rng.randint(-887272, 887272)]
+        return [topics['swap'], _address_word(a), _address_word(b)], ''.join(_word(v) for v in data)
+    position = [topics['mint'], _address_word(a), _word(tick_lower), _word(tick_upper)]
+    if roll < 0.85:
+        data = _address_word(b)[2:] + ''.join(_word(rng.getrandbits(n)) for n in (100, 80, 80))
+        return position, data
+    if roll < 0.93:
+        position[0] = topics['burn']
+        return position, ''.join(_word(rng.getrandbits(n)) for n in (100, 80, 80))
+    if roll < 0.99:
+        position[0] = topics['collect']
+        data = _address_word(b)[2:] + ''.join(_word(rng.getrandbits(n)) for n in (80, 80))
+        return position, data
+    if roll < 0.995:
+        return [topics['initialize']], _word(rng.getrandbits(150)) + _word(rng.randint(-887272, 887272))
+    data = [rng.getrandbits(80) for _ in range(4)]
+    return [topics['flash'], _address_word(a), _address_word(b)], ''.join(_word(v) for v in data)
+
+
+def _event_topics(protocol: str) -> dict:
+    if protocol == 'uniswap_v2':
+        from src.protocols.uniswap_v2.decoders import event_decoder as d
+        names = ('swap', 'mint', 'burn')
+    else:
+        from src.protocols.uniswap_v3.decoders import event_decoder as d
+        names = ('initialize', 'mint', 'burn', 'collect', 'swap', 'flash')
+    return {name: getattr(d, f'get_{name}_event_signature')() for name in names}
+
+
+def generate_fixtures(
+    protocol: str,
+    fixture_dir: str,
+    num_events: int = 20_000,
+    num_pools: int = 200,
+    events_per_block: float = 8.0,
+    events_per_tx: float = 2.0,
+    start_block: int = 18_000_000,
+    seed: int = 1,
+) -> dict:
+    """
+    Write a replayable fixture (see src.core.stub_server) with synthetic pool/pair events.
+
+    The fixture contains the eth_getLogs result for the whole range plus
+    eth_getTransactionByHash, eth_getBlockReceipts and full-transaction
+    eth_getBlockByNumber responses, so every tx_from resolution method can be
+    replayed.
+
+    Args:
+        protocol: 'uniswap_v2' or 'uniswap_v3'
+        fixture_dir: Output directory (synthetic.jsonl is written there)
+        num_events: Number of logs to generate
+        num_pools: Number of distinct pair/pool addresses
+        events_per_block: Average logs per block
+        events_per_tx: Average logs per transaction
+        start_block: First block of the range
+        seed: RNG seed (same arguments give the same fixture)
+
+    Returns:
+        dict: addresses, start_block, end_block, num_events
+    """
+    rng = random.Random(seed)
+    topics = _event_topics(protocol)
+    make_event = _v2_event if protocol == 'uniswap_v2' else _v3_event
+    addresses = [_random_address(rng) for _ in range(num_pools)]
+
+    logs = []
+    tx_senders = {}
+    receipts = {}
+    block = start_block
+    tx_hash, tx_index = None, -1
+    log_index = 0
+    for _ in range(num_events):
+        if logs and rng.random() < 1.0 / events_per_block:
+            block += rng.randint(1, 3)
+            log_index, tx_index, tx_hash = 0, -1, None
+        if tx_hash is None or rng.random() < 1.0 / events_per_tx:
+            tx_hash = '0x' + rng.getrandbits(256).to_bytes(32, 'big').hex()
+            tx_index += 1
+            tx_senders[tx_hash] = (block, _random_address(rng))
+            receipts.setdefault(block, []).append(tx_hash)
+        event_topics, data = make_event(rng, topics)
+        logs.append({
+            'address': rng.choice(addresses),
+            'topics': event_topics,
+            'data': '0x' + data,
+            'blockNumber': hex(block),
+            'blockHash': '0x' + block.to_bytes(32, 'big').hex(),
+            'transactionHash': tx_hash,
+            'transactionIndex': hex(tx_index),
+            'logIndex': hex(log_index),
+            'removed': False,
+        })
+        log_index += 1
+    end_block = block
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    path = os.path.join(fixture_dir, 'synthetic.jsonl')
+    with open(path, 'w', encoding='utf-8') as f:
+        def write(method, params, result):
+            f.write(json.dumps({'method': method, 'params': params, 'result': result}, separators=(',', ':')) + '\n')
+
+        write('eth_blockNumber', [], hex(end_block + 1000))
+        write('eth_getLogs', [{'fromBlock': hex(start_block), 'toBlock': hex(end_block)}], logs)
+        for tx, (tx_block, sender) in tx_senders.items():
+            write('eth_getTransactionByHash', [tx], {'hash': tx, 'from': sender, 'blockNumber': hex(tx_block)})
+        for receipt_block, hashes in receipts.items():
+            write('eth_getBlockReceipts', [hex(receipt_block)], [
+                {'transactionHash': tx, 'from': tx_senders[tx][1], 'blockNumber': hex(receipt_block)} for tx in hashes
+            ])
+            write('eth_getBlockByNumber', [hex(receipt_block), True], {
+                'number': hex(receipt_block),
+                'hash': '0x' + receipt_block.to_bytes(32, 'big').hex(),
+                'timestamp': hex(1_700_000_000 + 12 * (receipt_block - start_block)),
+                'transactions': [
+                    {'hash': tx, 'from': tx_senders[tx][1], 'blockNumber': hex(receipt_block)} for tx in hashes
+                ],
+            })
+
+    return {'addresses': addresses, 'start_block': start_block, 'end_block': end_block, 'num_events': num_events}
@@ -0,0 +1 @@
+"""Core utilities shared by all protocol indexers."""
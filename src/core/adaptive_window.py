@@ -0,0 +1,106 @@
+"""Adaptive eth_getLogs block-window sizing driven by provider feedback."""
+
+import threading
+from collections import Counter
+
+
+class AdaptiveWindow:
+    """
+    Block span controller for eth_getLogs windows.
+
+    The span grows after fast responses with few logs, shrinks after slow or
+    large responses and after errors, and jumps straight to the span suggested
+    by the provider in -32005 errors. Safe to share between worker threads and
+    asyncio tasks.
+
+    Args:
+        initial_size: Starting span in blocks (BATCH_SIZE)
+        min_size: Smallest span the controller will choose
+        max_size: Largest span the controller will choose
+        target_logs: Logs per response considered "large"
+        target_seconds: Response time considered "slow"
+        adaptive: If False, the span stays at initial_size (fixed BATCH_SIZE behaviour)
+    """
+
+    def __init__(
+        self,
+        initial_size: int,
+        min_size: int = 1,
+        max_size: int = 100_000,
+        target_logs: int = 5_000,
+        target_seconds: float = 3.0,
+        adaptive: bool = True,
+    ):
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.target_logs = target_logs
+        self.target_seconds = target_seconds
+        self.adaptive = adaptive
+        self.initial_size = initial_size if not adaptive else self._clamp(initial_size)
+        self._size = self.initial_size
+        self._used = Counter()
+        self._lock = threading.Lock()
+        self.errors = 0
+
+    def _clamp(self, size: int) -> int:
+        return max(self.min_size, min(self.max_size, int(size)))
+
+    @property
+    def size(self) -> int:
+        """Current span in blocks."""
+        return self._size
+
+    def next_span(self) -> int:
+        """Span to use for the next window (recorded for the summary)."""
+        with self._lock:
+            self._used[self._size] += 1
+            return self._size
+
+    def record_success(self, span: int, num_logs: int, elapsed: float) -> None:
+        """
+        Feed back a completed window.
+
+        Args:
+            span: Number of blocks the window covered
+            num_logs: Number of logs returned
+            elapsed: Wall time of the request(s) in seconds
+        """
+        if not self.adaptive:
+            return
+        with self._lock:
+            if num_logs > self.target_logs or elapsed > self.target_seconds:
+                factor = min(self.target_logs / max(num_logs, 1), self.target_seconds / max(elapsed, 1e-6))
+                # Never shrink by more than 4x on a single observation
+                self._size = self._clamp(min(self._size, span * max(0.25, factor)))
+            elif num_logs < self.target_logs / 4 and elapsed < self.target_seconds / 4:
+                # Grow from the observed span, but not past 2x of the current size:
+                # another worker may have shrunk it in the meantime
+                self._size = self._clamp(min(span * 2, self._size * 2))
+
+    def record_error(self, suggested_span: int = None) -> None:
+        """
+        Feed back a failed window (-32005, timeout, provider error).
+
+        Args:
+            suggested_span: Span the provider said would work, if it sent one
+        """
+        with self._lock:
+            self.errors += 1
+            if not self.adaptive:
+                return
+            target = suggested_span if suggested_span else self._size // 2
+            self._size = self._clamp(min(self._size, target))
+
+    def summary(self) -> str:
+        """One-line description of the window sizes chosen during the run."""
+        with self._lock:
+            if not self._used:
+                return f"Window size: {self._size} blocks (no windows fetched)"
+            sizes = sorted(self._used.elements())
+            median = sizes[len(sizes) // 2]
+            most_used = ', '.join(f"{size}x{count}" for size, count in self._used.most_common(5))
+            return (
+                f"Window sizes (blocks): initial {self.initial_size}, final {self._size}, "
+                f"min {sizes[0]}, median {median}, max {sizes[-1]}; errors: {self.errors}; "
+                f"most used: {most_used}"
+            )
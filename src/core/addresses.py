@@ -0,0 +1,94 @@
+"""
+Checksum address formatting with a bounded LRU memo.
+
+Decoders keep addresses as raw 20-byte values; EIP-55 checksumming (a keccak
+per address) happens only where data leaves the pipeline (CSV output, logs).
+The same addresses (routers, popular pairs, WETH) repeat across millions of
+events, so checksums are memoized in a size-bounded LRU cache.
+"""
+
+from functools import lru_cache
+
+from web3 import Web3
+
+
+def _checksum(address: bytes) -> str:
+    return Web3.to_checksum_address(address)
+
+
+_cached_checksum = lru_cache(maxsize=100_000)(_checksum)
+
+
+def configure_address_cache(max_entries: int) -> None:
+    """
+    Set the size of the process-wide checksum cache (drops current entries).
+
+    Args:
+        max_entries: Maximum number of memoized addresses (0 disables caching)
+    """
+    global _cached_checksum
+    _cached_checksum = lru_cache(maxsize=max(0, max_entries))(_checksum)
+
+
+def to_checksum_address(address) -> str:
+    """
+    EIP-55 checksummed address, memoized.
+
+    Args:
+        address: Raw 20 bytes or a hex string (any case, with or without 0x)
+
+    Returns:
+        str: Checksummed 0x-prefixed address
+    """
+    if isinstance(address, str):
+        address = bytes.fromhex(address[2:] if address[:2] in ('0x', '0X') else address)
+    elif not isinstance(address, bytes):
+        raise ValueError(f"Unexpected address type: {type(address)}")
+    if len(address) != 20:
+        raise ValueError(f"Address must be 20 bytes, got {len(address)}")
+    return _cached_checksum(bytes(address))
+
+
+def to_address_bytes(address) -> bytes:
+    """Raw 20-byte form of an address given as bytes or a hex string."""
+    if isinstance(address, bytes):
+        return bytes(address[-20:])
+    return bytes.fromhex(address[2:] if address[:2] in ('0x', '0X') else address)
+
+
+def format_addresses(record: dict) -> dict:
+    """
+    Copy of `record` with raw 20-byte address values replaced by checksummed strings.
+
+    Args:
+        record: Decoded event/pair dict (other values are left as they are)
+
+    Returns:
+        dict: Record ready for output
+    """
+    return {
+        key: to_checksum_address(value) if isinstance(value, bytes) and len(value) == 20 else value
+        for key, value in record.items()
+    }
+
+
+def address_cache_info() -> dict:
+    """Hit/miss counters of the checksum cache."""
+    info = _cached_checksum.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'hit_rate': info.hits / lookups if lookups else 0.0,
+        'size': info.currsize,
+        'max_size': info.maxsize,
+    }
+
+
+def address_cache_summary() -> str:
+    """One-line checksum cache statistics."""
+    info = address_cache_info()
+    return (
+        f"Address cache: {info['hits']} hits, {info['misses']} misses ({info['hit_rate']:.1%} hit rate), "
+        f"{info['size']}/{info['max_size']} entries"
+    )
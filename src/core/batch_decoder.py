@@ -0,0 +1,338 @@
+"""
+Vectorized batch decoding of fixed-layout event logs with NumPy.
+
+The data payloads of many logs of one event type are concatenated into one
+buffer and viewed as an (n, words, 32) uint8 array; indexed topics are
+handled the same way. Integer fields are extracted a whole column at a time:
+a column is an int64/uint64 array when every value fits in 64 bits, and an
+object array of exact Python ints otherwise (only the overflowing rows are
+converted one by one).
+
+Output is columnar: {field: column}, where integer columns are NumPy arrays
+and address columns are lists of raw 20-byte values (see src.core.addresses).
+decode_event_batch puts the groups of a mixed log list together into one
+EventBatch (src.core.event_batch) in the original log order.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from src.core.event_batch import EventBatch
+
+
+class EventLayout:
+    """
+    Fixed ABI layout of one event type.
+
+    Args:
+        name: Event type written to decoded rows (e.g. 'swap')
+        address_field: Column for the emitting contract (e.g. 'pair_address')
+        num_topics: Topics including topic0
+        num_words: 32-byte words in data
+        fields: (name, source, index, abi_type) in output order; source is 'topic'
+            (index into topics) or 'data' (word index), abi_type is 'address',
+            'uintN' or 'intN'
+    """
+
+    def __init__(self, name: str, address_field: str, num_topics: int, num_words: int, fields: list):
+        self.name = name
+        self.address_field = address_field
+        self.num_topics = num_topics
+        self.num_words = num_words
+        self.fields = fields
+
+
+def _to_bytes(value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return bytes.fromhex(value[2:] if value[:2] in ('0x', '0X') else value)
+
+
+def _tx_hash_hex(tx_hash) -> str:
+    if isinstance(tx_hash, bytes):
+        return tx_hash.hex()
+    return tx_hash
+
+
+def _concat(values: list, size: int) -> bytes:
+    """
+    First `size` bytes of every value, concatenated.
+
+    Hex strings (raw JSON-RPC) are joined and decoded with a single
+    bytes.fromhex call; bytes/HexBytes (web3) of exactly `size` bytes are
+    joined without slicing. A value shorter than `size` yields a shorter
+    result, which callers check.
+    """
+    if values and isinstance(values[0], str) and all([value[:2] in ('0x', '0X') for value in values]):
+        try:
+            return bytes.fromhex(''.join([value[2:2 + 2 * size] for value in values]))
+        except (TypeError, ValueError):
+            pass
+    elif values and not isinstance(values[0], str) and set(map(len, values)) == {size}:
+        try:
+            return b''.join(values)
+        except TypeError:
+            pass
+    # Mixed bytes / strings, strings without 0x, or payloads longer than the layout
+    try:
+        return b''.join([bytes(_to_bytes(value))[:size] for value in values])
+    except (AttributeError, TypeError) as e:
+        raise ValueError(f"Expected hex string or bytes: {e}") from e
+
+
+def _data_matrix(logs: List[dict], num_words: int, event: str) -> np.ndarray:
+    """(n, num_words, 32) uint8 view of the logs' data payloads."""
+    size = num_words * 32
+    buffer = _concat([log['data'] for log in logs], size)
+    if len(buffer) != len(logs) * size:
+        for log in logs:
+            length = len(_to_bytes(log['data']))
+            if length < size:
+                raise ValueError(
+                    f"Data too short for {event} in tx {_tx_hash_hex(log['transactionHash'])}: "
+                    f"{length} bytes, expected {size}"
+                )
+        raise ValueError(f"Malformed data for {event}: expected {size} bytes per log")
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(len(logs), num_words, 32)
+
+
+def _topic_matrix(logs: List[dict], num_topics: int, event: str) -> np.ndarray:
+    """(n, num_topics, 32) uint8 view of the logs' topics; topic0 is left zeroed."""
+    for log in logs:
+        if len(log['topics']) < num_topics:
+            raise ValueError(f"Invalid number of topics for {event}: {len(log['topics'])}")
+    buffer = _concat([topic for log in logs for topic in log['topics'][1:num_topics]], 32)
+    if len(buffer) != len(logs) * (num_topics - 1) * 32:
+        raise ValueError(f"Malformed topics for {event}: topics must be 32 bytes")
+    matrix = np.zeros((len(logs), num_topics, 32), dtype=np.uint8)
+    matrix[:, 1:, :] = np.frombuffer(buffer, dtype=np.uint8).reshape(len(logs), num_topics - 1, 32)
+    return matrix
+
+
+def _exact(words: np.ndarray, rows: np.ndarray, signed: bool) -> list:
+    return [int.from_bytes(words[i].tobytes(), 'big', signed=signed) for i in rows]
+
+
+def uint_column(words: np.ndarray, bits: int = 256) -> np.ndarray:
+    """
+    uintN column from an (n, 32) array of ABI words.
+
+    Args:
+        words: Big-endian 32-byte words, one per row
+        bits: Declared width; values beyond it are rejected (like eth_abi padding checks)
+
+    Returns:
+        np.ndarray: uint64 column, or an object column of Python ints if any value exceeds 64 bits
+    """
+    low = np.ascontiguousarray(words[:, 24:]).view('>u8').ravel().astype(np.uint64)
+    high = words[:, :24].any(axis=1)
+    if bits < 64 and (low >> np.uint64(bits)).any():
+        raise ValueError(f"uint{bits} value out of range")
+    if not high.any():
+        return low
+    if bits <= 64:
+        raise ValueError(f"uint{bits} value out of range")
+    rows = np.flatnonzero(high)
+    column = low.astype(object)
+    limit = 1 << bits
+    for i, value in zip(rows, _exact(words, rows, signed=False)):
+        if value >= limit:
+            raise ValueError(f"uint{bits} value out of range: {value}")
+        column[i] = value
+    return column
+
+
+def int_column(words: np.ndarray, bits: int = 256) -> np.ndarray:
+    """
+    intN (two's complement) column from an (n, 32) array of ABI words.
+
+    Args:
+        words: Big-endian 32-byte words, one per row
+        bits: Declared width; values beyond it are rejected
+
+    Returns:
+        np.ndarray: int64 column, or an object column of Python ints if any value exceeds 64 bits
+    """
+    low = np.ascontiguousarray(words[:, 24:]).view('>i8').ravel().astype(np.int64)
+    # A value fits in int64 when the upper 24 bytes are the sign extension of the low 8
+    sign = np.where(low < 0, 0xff, 0x00).astype(np.uint8)
+    overflow = (words[:, :24] != sign[:, None]).any(axis=1)
+    if bits < 64:
+        bound = 1 << (bits - 1)
+        if ((low < -bound) | (low >= bound)).any():
+            raise ValueError(f"int{bits} value out of range")
+    if not overflow.any():
+        return low
+    if bits <= 64:
+        raise ValueError(f"int{bits} value out of range")
+    rows = np.flatnonzero(overflow)
+    column = low.astype(object)
+    bound = 1 << (bits - 1)
+    for i, value in zip(rows, _exact(words, rows, signed=True)):
+        if not -bound <= value < bound:
+            raise ValueError(f"int{bits} value out of range: {value}")
+        column[i] = value
+    return column
+
+
+def address_column(words: np.ndarray) -> list:
+    """Raw 20-byte addresses from an (n, 32) array of ABI words."""
+    buffer = np.ascontiguousarray(words[:, 12:]).tobytes()
+    return [buffer[i:i + 20] for i in range(0, len(buffer), 20)]
+
+
+def decode_batch(logs: List[dict], layout: EventLayout) -> dict:
+    """
+    Decode logs that all belong to one event type into columns.
+
+    Args:
+        logs: Raw logs from eth_getLogs with the same topic0
+        layout: Layout of the event
+
+    Returns:
+        dict: field -> column, in the field order of the per-log decoders
+            (contract address, event fields, block_number, transaction_hash, log_index)
+    """
+    try:
+        data = _data_matrix(logs, layout.num_words, layout.name) if layout.num_words else None
+        topics = _topic_matrix(logs, layout.num_topics, layout.name) if layout.num_topics > 1 else None
+        addresses = _concat([log['address'] for log in logs], 20)
+        if len(addresses) != len(logs) * 20:
+            raise ValueError(f"Malformed contract address for {layout.name}: addresses must be 20 bytes")
+        columns = {layout.address_field: [addresses[i:i + 20] for i in range(0, len(addresses), 20)]}
+        for name, source, index, abi_type in layout.fields:
+            words = (topics if source == 'topic' else data)[:, index, :]
+            if abi_type == 'address':
+                columns[name] = address_column(words)
+            elif abi_type.startswith('uint'):
+                columns[name] = uint_column(words, int(abi_type[4:] or 256))
+            else:
+                columns[name] = int_column(words, int(abi_type[3:] or 256))
+    except ValueError as e:
+        raise ValueError(f"Failed to decode {layout.name} batch: {e}") from e
+    columns['block_number'] = np.fromiter((log['blockNumber'] for log in logs), dtype=np.int64, count=len(logs))
+    columns['transaction_hash'] = [_tx_hash_hex(log['transactionHash']) for log in logs]
+    columns['log_index'] = np.fromiter((log['logIndex'] for log in logs), dtype=np.int64, count=len(logs))
+    return columns
+
+
+def decode_batches(logs: List[dict], layouts) -> dict:
+    """
+    Group logs of several event types by topic0 and decode each group.
+
+    Args:
+        logs: Raw logs from eth_getLogs
+        layouts: TopicRegistry mapping topic0 to EventLayout
+
+    Returns:
+        dict: event_type -> columns (see decode_batch), logs keep their relative order
+    """
+    by_topic = {}
+    for log in logs:
+        topic0 = log['topics'][0]
+        group = by_topic.get(topic0)
+        if group is None:
+            group = by_topic[topic0] = []
+        group.append(log)
+
+    groups = {}
+    for topic0, group in by_topic.items():
+        layout = layouts.get(topic0)
+        if layout is None:
+            shown = topic0.hex() if isinstance(topic0, bytes) else topic0
+            raise ValueError(f"Unknown {layouts.name} event topic0: {shown}")
+        if layout.name in groups:
+            # Same event with topic0 spelled differently (bytes vs hex string)
+            groups[layout.name][1].extend(group)
+        else:
+            groups[layout.name] = (layout, group)
+    return {name: decode_batch(group, layout) for name, (layout, group) in groups.items()}
+
+
+def columns_to_events(event_type: str, columns: dict) -> List[dict]:
+    """
+    Row dicts (as returned by the per-log decoders) from a decoded batch.
+
+    Args:
+        event_type: Value of the event_type field
+        columns: Output of decode_batch
+
+    Returns:
+        List[dict]: One event per row, integers as Python ints
+    """
+    names = list(columns)
+    values = [column.tolist() if isinstance(column, np.ndarray) else column for column in columns.values()]
+    return [{'event_type': event_type, **dict(zip(names, row))} for row in zip(*values)]
+
+
+def decode_event_batch(
+    logs: List[dict],
+    layouts,
+    decoders,
+    fields: Sequence[Tuple[str, str]],
+    crosscheck=None,
+    references=None,
+) -> Tuple[EventBatch, List[int], List[Tuple[int, str]]]:
+    """
+    Decode logs of several event types into one EventBatch, rows in log order.
+
+    Event types with a layout are decoded a group at a time (decode_batch).
+    Logs of other registered event types, and every log of a group that
+    failed as a whole (e.g. one malformed log), go through the per-log
+    decoders, so only the logs that really cannot be decoded are dropped.
+
+    Args:
+        logs: Raw logs from eth_getLogs
+        layouts: TopicRegistry mapping topic0 to EventLayout
+        decoders: TopicRegistry mapping topic0 to the per-log decoder
+        fields: Columns of the batch
+        crosscheck: DecoderCrossCheck validating a sample of the group-decoded rows
+        references: TopicRegistry of the reference (eth_abi) decoders used by crosscheck
+
+    Returns:
+        (batch, positions, errors): the decoded events, the index in `logs` of
+        every row, and (index, error message) for every log that was dropped
+    """
+    groups = {}
+    for position, log in enumerate(logs):
+        layout = layouts.get(log['topics'][0])
+        key = layout.name if layout is not None else None
+        if key not in groups:
+            groups[key] = (layout, [])
+        groups[key][1].append(position)
+
+    parts, positions, errors = [], [], []
+    for layout, group in groups.values():
+        group_logs = [logs[position] for position in group]
+        if layout is not None:
+            try:
+                columns = decode_batch(group_logs, layout)
+            except ValueError:
+                columns = None
+            if columns is not None:
+                columns['event_type'] = layout.name
+                hashes = _concat([log['transactionHash'] for log in group_logs], 32)
+                if len(hashes) == 32 * len(group):
+                    columns['transaction_hash'] = hashes
+                part = EventBatch.from_columns(fields, len(group), columns)
+                if crosscheck is not None:
+                    crosscheck.check_batch(part, group_logs, references.decode)
+                parts.append(part)
+                positions.extend(group)
+                continue
+        events = []
+        for position, log in zip(group, group_logs):
+            try:
+                events.append(decoders.decode(log))
+                positions.append(position)
+            except Exception as e:
+                errors.append((position, str(e)))
+        parts.append(EventBatch.from_events(fields, events))
+
+    batch = EventBatch.concat(fields, parts)
+    order = np.argsort(np.asarray(positions, dtype=np.int64), kind='stable')
+    if len(order) and (order != np.arange(len(order))).any():
+        batch = batch.take(order)
+    errors.sort()
+    return batch, [positions[i] for i in order.tolist()], errors
@@ -0,0 +1,233 @@
+"""
+Durable per-command checkpoints for resumable indexing runs.
+
+A checkpoint is a small JSON file per protocol and command that records the
+block range fully written to the output so far, together with the output's
+size in bytes and row count at that moment. Outputs are only ever appended
+to; after every chunk the output is flushed to disk (fsync) and only then is
+the checkpoint replaced atomically (temp file + os.replace).
+
+On resume the output is truncated back to the recorded size, which drops a
+partially written chunk left by a crash, so the data always matches the
+checkpoint exactly.
+"""
+
+import json
+import os
+import time
+from typing import Callable, Optional, Sequence
+
+from src.core.csv_append import check_header
+
+
+def _fsync_file(path: str) -> None:
+    with open(path, 'rb+') as f:
+        os.fsync(f.fileno())
+
+
+def atomic_write_json(path: str, data: dict) -> None:
+    """
+    Write `data` as JSON so that readers see either the old or the new file, never a partial one.
+
+    Args:
+        path: Target file
+        data: JSON-serializable dict
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    # Persist the rename itself
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+class Checkpoint:
+    """
+    Checkpoint of one command of one protocol, stored as {directory}/{protocol}_{command}.json.
+
+    Fields: protocol, command, output (path), start_block and end_block (the
+    written range), output_bytes and rows (output size at end_block), updated_at.
+
+    Args:
+        directory: Checkpoint directory (CHECKPOINT_DIR)
+        protocol: Protocol name (e.g. 'uniswap_v2')
+        command: Command name (e.g. 'index-pair-events')
+    """
+
+    def __init__(self, directory: str, protocol: str, command: str):
+        self.protocol = protocol
+        self.command = command
+        self.path = os.path.join(directory, f"{protocol}_{command}.json")
+        self.state = None
+
+    def load(self) -> Optional[dict]:
+        """Stored checkpoint, or None if there is none."""
+        if not os.path.isfile(self.path):
+            return None
+        with open(self.path, encoding='utf-8') as f:
+            self.state = json.load(f)
+        return self.state
+
+    def clear(self) -> None:
+        """Remove the checkpoint (a fresh run starts over)."""
+        self.state = None
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def start(self, start_block: int, output_path: str, rows: int = 0) -> None:
+        """Begin a run on a freshly created output (header only) or on an existing one holding `rows` rows (--append)."""
+        self.state = {
+            'protocol': self.protocol,
+            'command': self.command,
+            'output': output_path,
+            'start_block': start_block,
+            'end_block': start_block - 1,
+            'output_bytes': os.path.getsize(output_path),
+            'rows': rows,
+        }
+        self._save()
+
+    def resume(self, start_block: int, end_block: int, output_path: str) -> int:
+        """
+        Prepare to continue a previous run and return the first block still to index.
+
+        Truncates the output to the checkpointed size (drops rows written after
+        the last checkpoint).
+
+        Args:
+            start_block: START_BLOCK of this run (must match the checkpoint)
+            end_block: Last block of this run
+            output_path: Output file of this run (must match the checkpoint)
+
+        Returns:
+            int: First block to index (end_block + 1 when the range is already complete)
+
+        Raises:
+            ValueError: No checkpoint, or it belongs to a different range/output,
+                or the output is shorter than the checkpoint says
+        """
+        state = self.load()
+        if state is None:
+            raise ValueError(f"No checkpoint at {self.path}")
+        if os.path.abspath(state['output']) != os.path.abspath(output_path):
+            raise ValueError(f"Checkpoint is for output {state['output']}, not {output_path}")
+        if state['start_block'] != start_block:
+            raise ValueError(
+                f"Checkpoint starts at block {state['start_block']}, but START_BLOCK is {start_block}"
+            )
+        if not os.path.isfile(output_path):
+            raise ValueError(f"Output {output_path} is missing")
+        size = os.path.getsize(output_path)
+        if size < state['output_bytes']:
+            raise ValueError(
+                f"Output {output_path} has {size} bytes, checkpoint recorded {state['output_bytes']}"
+            )
+        if size > state['output_bytes']:
+            print(f"Discarding {size - state['output_bytes']} bytes written after the last checkpoint")
+            with open(output_path, 'rb+') as f:
+                f.truncate(state['output_bytes'])
+                os.fsync(f.fileno())
+        return min(state['end_block'], end_block) + 1
+
+    def commit(self, end_block: int, rows: int) -> None:
+        """
+        Record that everything up to `end_block` is in the output.
+
+        Call after the chunk has been appended; the output is synced to disk
+        before the checkpoint is replaced.
+
+        Args:
+            end_block: Last block of the chunk just written
+            rows: Rows appended for the chunk
+        """
+        output_path = self.state['output']
+        _fsync_file(output_path)
+        self.state['end_block'] = end_block
+        self.state['output_bytes'] = os.path.getsize(output_path)
+        self.state['rows'] += rows
+        self._save()
+
+    @property
+    def rows(self) -> int:
+        """Rows written so far (all runs)."""
+        return self.state['rows'] if self.state else 0
+
+    def _save(self) -> None:
+        self.state['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        atomic_write_json(self.path, self.state)
+
+
+def _count_rows(path: str) -> int:
+    """Data rows of a CSV output (lines after the header; rows never contain newlines)."""
+    lines = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            lines += block.count(b'\n')
+    return max(0, lines - 1)
+
+
+def start_or_resume(
+    checkpoint: Checkpoint,
+    start_block: int,
+    end_block: int,
+    resume: bool,
+    output_path: str,
+    create_output: Callable[[], str],
+    append: bool = False,
+    columns: Sequence[str] = (),
+) -> int:
+    """
+    Set up the output and checkpoint of a run and return the first block to index.
+
+    A fresh run (or --resume without a checkpoint) creates a header-only
+    output with `create_output` and starts a new checkpoint; --resume
+    continues the checkpointed run (see Checkpoint.resume). With --append an
+    existing output is kept and a new checkpoint for this range is started
+    on it; rows already in the output are skipped when appending (see
+    src.core.csv_append).
+
+    Args:
+        checkpoint: Checkpoint of the command
+        start_block: START_BLOCK of this run
+        end_block: Last block of this run
+        resume: Continue from the checkpoint (--resume)
+        output_path: Output file of the command
+        create_output: Creates (truncates) the output with only the header
+        append: Keep an existing output and add this range to it (--append)
+        columns: Expected header of the output (checked with --append)
+
+    Returns:
+        int: First block to index (greater than end_block if nothing is left)
+
+    Raises:
+        ValueError: The checkpoint cannot be resumed against this output/range,
+            or the existing output has a different header (--append)
+    """
+    if resume and checkpoint.load() is not None:
+        first_block = checkpoint.resume(start_block, end_block, output_path)
+        print(f"Resuming from block {first_block} ({checkpoint.rows} rows already in {output_path})")
+        return first_block
+    if append and os.path.isfile(output_path):
+        check_header(output_path, columns)
+        checkpoint.clear()
+        checkpoint.start(start_block, output_path, rows=_count_rows(output_path))
+        print(f"Appending blocks {start_block}-{end_block} to {output_path} ({checkpoint.rows} rows already in it)")
+        return start_block
+    if resume:
+        print(f"No checkpoint at {checkpoint.path}, starting from block {start_block}")
+    checkpoint.clear()
+    checkpoint.start(start_block, create_output())
+    return start_block
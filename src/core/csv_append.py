@@ -0,0 +1,225 @@
+"""
+Append-only CSV outputs deduplicated on (transaction_hash, log_index).
+
+Next to every output CSV a small SQLite key index ({csv}.keys.sqlite) holds
+one 36-byte key per row (32-byte transaction hash + 4-byte log index) and the
+byte offset the row was appended at. Appending looks keys up in the index
+instead of reading the CSV, so only rows that are not in the file yet are
+written.
+
+The index also stores the CSV size it corresponds to. If the CSV changed
+behind its back (a crash between writing rows and committing the index, or a
+checkpoint resume that truncated the file), only the affected tail of the CSV
+is re-scanned.
+"""
+
+import csv
+import io
+import itertools
+import os
+import sqlite3
+from typing import Optional, Sequence
+
+from src.core.csv_writer import as_columns, format_rows, header_line
+
+
+KEY_COLUMNS = ('transaction_hash', 'log_index')
+
+
+def _key(tx_hash, log_index) -> bytes:
+    """36-byte key: transaction hash bytes + big-endian log index."""
+    if isinstance(tx_hash, bytes):
+        raw = bytes(tx_hash)
+    else:
+        tx_hash = str(tx_hash)
+        raw = bytes.fromhex(tx_hash[2:] if tx_hash[:2] in ('0x', '0X') else tx_hash)
+    return raw + int(log_index).to_bytes(4, 'big')
+
+
+class KeyIndex:
+    """
+    On-disk set of the (transaction_hash, log_index) keys present in one CSV.
+
+    Args:
+        csv_path: Output CSV the index belongs to
+        columns: Column order of the CSV (must include transaction_hash and log_index)
+    """
+
+    def __init__(self, csv_path: str, columns: Sequence[str]):
+        self.csv_path = csv_path
+        self.columns = list(columns)
+        self.path = f"{csv_path}.keys.sqlite"
+        self._conn = sqlite3.connect(self.path, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS keys (k BLOB PRIMARY KEY, off INTEGER NOT NULL) WITHOUT ROWID')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS keys_off ON keys (off)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)')
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _recorded_size(self) -> Optional[int]:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'csv_bytes'").fetchone()
+        return row[0] if row else None
+
+    def _set_recorded_size(self, size: int) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('csv_bytes', ?)", (size,))
+
+    def _scan(self, offset: int, end: int) -> None:
+        """Add the keys of the CSV rows in bytes [offset, end) (offset is a line start)."""
+        if offset >= end:
+            return
+        hash_at, index_at = (self.columns.index(column) for column in KEY_COLUMNS)
+        with open(self.csv_path, 'rb') as f:
+            f.seek(offset)
+            reader = csv.reader(io.TextIOWrapper(f, encoding='utf-8', newline=''))
+            while True:
+                rows = list(itertools.islice(reader, 200_000))
+                if not rows:
+                    break
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO keys VALUES (?, ?)',
+                    ((_key(row[hash_at], row[index_at]), offset) for row in rows if row),
+                )
+
+    def sync(self) -> None:
+        """Bring the index in line with the CSV on disk (see module docstring)."""
+        size = os.path.getsize(self.csv_path)
+        header_size = len(header_line(self.columns))
+        recorded = self._recorded_size()
+        self._conn.execute('BEGIN')
+        try:
+            if recorded is None or recorded < header_size:
+                self._conn.execute('DELETE FROM keys')
+                self._scan(header_size, size)
+            elif size < recorded:
+                # Truncated: drop keys from the last append that started before the new end, re-scan from there
+                row = self._conn.execute('SELECT MAX(off) FROM keys WHERE off < ?', (size,)).fetchone()
+                start = row[0] if row[0] is not None else header_size
+                self._conn.execute('DELETE FROM keys WHERE off >= ?', (start,))
+                self._scan(start, size)
+            elif size > recorded:
+                self._scan(recorded, size)
+            self._set_recorded_size(size)
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def count(self) -> int:
+        """Number of keys (rows with distinct keys) in the CSV."""
+        return self._conn.execute('SELECT COUNT(*) FROM keys').fetchone()[0]
+
+    def append(self, rows) -> int:
+        """
+        Append the rows whose key is not in the CSV yet.
+
+        Keys are inserted and the rows written inside one transaction that is
+        committed together with the new CSV size.
+
+        Args:
+            rows: Output rows (already formatted) as a list of dicts or as columns
+                (column -> values), with transaction_hash and log_index
+
+        Returns:
+            int: Rows written
+        """
+        data = as_columns(rows, self.columns)
+        offset = os.path.getsize(self.csv_path)
+        self._conn.execute('BEGIN')
+        try:
+            new = []
+            for position, (tx_hash, log_index) in enumerate(zip(data['transaction_hash'], data['log_index'])):
+                cursor = self._conn.execute(
+                    'INSERT OR IGNORE INTO keys VALUES (?, ?)', (_key(tx_hash, log_index), offset)
+                )
+                if cursor.rowcount == 1:
+                    new.append(position)
+            if len(new) < len(data['transaction_hash']):
+                data = {column: [values[i] for i in new] for column, values in data.items()}
+            if new:
+                with open(self.csv_path, 'ab') as f:
+                    f.write(format_rows(data, self.columns))
+            self._set_recorded_size(os.path.getsize(self.csv_path))
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        return len(new)
+
+
+def check_header(csv_path: str, columns: Sequence[str]) -> None:
+    """
+    Make sure an existing CSV has exactly the expected header.
+
+    Raises:
+        ValueError: The header differs (e.g. the file was written by an older version)
+    """
+    expected = header_line(columns)
+    with open(csv_path, 'rb') as f:
+        actual = f.readline()
+    if actual != expected:
+        raise ValueError(
+            f"{csv_path} has header {actual.decode('utf-8', 'replace').strip()!r}, "
+            f"expected {expected.decode('utf-8').strip()!r}; re-index it without --append"
+        )
+
+
+_indexes = {}
+
+
+def _open_index(csv_path: str, columns: Sequence[str]) -> KeyIndex:
+    """Cached, synced key index of `csv_path` (synced once per process, then kept up to date by append)."""
+    path = os.path.abspath(csv_path)
+    index = _indexes.get(path)
+    if index is None or index.columns != list(columns):
+        check_header(csv_path, columns)
+        index = KeyIndex(csv_path, columns)
+        index.sync()
+        _indexes[path] = index
+    elif os.path.getsize(csv_path) != index._recorded_size():
+        index.sync()
+    return index
+
+
+def append_csv_rows(csv_path: str, rows, columns: Sequence[str]) -> int:
+    """
+    Append rows to an output CSV, skipping rows whose (transaction_hash, log_index) is already in it.
+
+    The CSV is created with its header if it does not exist.
+
+    Args:
+        csv_path: Output CSV
+        rows: Formatted rows, as a list of dicts or as columns (column -> values)
+        columns: Column order of the CSV
+
+    Returns:
+        int: Rows actually written
+    """
+    if not os.path.isfile(csv_path):
+        create_csv(csv_path, columns)
+    return _open_index(csv_path, columns).append(rows)
+
+
+def create_csv(csv_path: str, columns: Sequence[str]) -> None:
+    """Create (or truncate) an output CSV with only its header and drop its key index."""
+    reset_key_index(csv_path)
+    with open(csv_path, 'wb') as f:
+        f.write(header_line(columns))
+
+
+def reset_key_index(csv_path: str) -> None:
+    """Remove the key index of `csv_path` (the CSV is being rewritten)."""
+    index = _indexes.pop(os.path.abspath(csv_path), None)
+    if index is not None:
+        index.close()
+    for suffix in ('', '-wal', '-shm'):
+        path = f"{csv_path}.keys.sqlite{suffix}"
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def count_csv_rows(csv_path: str, columns: Sequence[str]) -> int:
+    """Rows with distinct keys in an existing output CSV (from its key index)."""
+    return _open_index(csv_path, columns).count()
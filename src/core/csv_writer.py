@@ -0,0 +1,160 @@
+"""
+Streaming CSV output without pandas.
+
+Rows are formatted with the csv module in the dialect pandas' to_csv uses
+(minimal quoting, '\\n' line endings, '' for empty cells), so files are
+byte-identical to the DataFrame output they replace. Formatted rows are
+collected in a buffer that is flushed to the file every `flush_bytes`, and
+large inputs are formatted `chunk_rows` rows at a time, so memory stays
+bounded whatever the output size.
+
+Output can be compressed on the fly (CSV_COMPRESSION): gzip uses the
+standard library, zstd the optional zstandard package. Compressed files get
+a .gz / .zst suffix and are readable with pd.read_csv as they are.
+"""
+
+import csv
+import gzip
+import io
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from src.core.event_batch import EventBatch
+
+
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+
+_SUFFIXES = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+
+
+def compressed_path(path: str, compression: str = 'none') -> str:
+    """Output path with the suffix of `compression` ('data/x.csv' -> 'data/x.csv.gz')."""
+    return path + _SUFFIXES[compression]
+
+
+def import_zstandard():
+    """The zstandard module, with an install hint when missing."""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd CSV output needs zstandard: pip install zstandard") from e
+    return zstandard
+
+
+def _open(path: str, compression: str, mode: str):
+    """Binary file object writing `path`, compressing with `compression`."""
+    if compression == 'gzip':
+        return gzip.open(path, mode, compresslevel=6)
+    if compression == 'zstd':
+        zstandard = import_zstandard()
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(path, mode))
+    if compression != 'none':
+        raise ValueError(f"CSV compression must be one of {', '.join(COMPRESSIONS)}, got: {compression}")
+    return open(path, mode)
+
+
+def as_columns(rows, columns: Sequence[str]) -> Dict[str, list]:
+    """Rows given as a list of dicts or as columns -> {column: values} (None for missing cells)."""
+    if isinstance(rows, dict):
+        size = max((len(values) for values in rows.values()), default=0)
+        return {column: list(rows[column]) if column in rows else [None] * size for column in columns}
+    return {column: [row.get(column) for row in rows] for column in columns}
+
+
+def header_line(columns: Sequence[str]) -> bytes:
+    """Header row of a CSV with `columns`."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerow(columns)
+    return buffer.getvalue().encode('utf-8')
+
+
+def format_rows(data: Dict[str, list], columns: Sequence[str]) -> bytes:
+    """
+    CSV lines (without header) of the rows in `data`.
+
+    Args:
+        data: Column -> values (strings or numbers; None is written as an empty cell)
+        columns: Column order of the output
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(zip(*[data[column] for column in columns]))
+    return buffer.getvalue().encode('utf-8')
+
+
+class CsvWriter:
+    """
+    CSV file written incrementally: write() rows as they come, close() at the end.
+
+    Args:
+        path: Output file (including the .gz / .zst suffix, see compressed_path)
+        columns: Column order of the output
+        compression: 'none', 'gzip' or 'zstd'
+        append: Add rows to an existing file (no header is written)
+        flush_bytes: Formatted bytes buffered before they are written to the file
+        chunk_rows: Rows formatted at a time
+    """
+
+    def __init__(
+        self,
+        path: str,
+        columns: Sequence[str],
+        compression: str = 'none',
+        append: bool = False,
+        flush_bytes: int = 4 << 20,
+        chunk_rows: int = 50_000,
+    ):
+        self.path = path
+        self.columns = list(columns)
+        self.flush_bytes = flush_bytes
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self._file = _open(path, compression, 'ab' if append else 'wb')
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        if not append:
+            self._add(header_line(self.columns))
+
+    def _add(self, data: bytes) -> None:
+        self._buffer.append(data)
+        self._buffered += len(data)
+        if self._buffered >= self.flush_bytes:
+            self.flush()
+
+    def write(self, rows) -> int:
+        """
+        Add rows to the output.
+
+        Args:
+            rows: EventBatch (cells formatted with EventBatch.formatted_column), list of row dicts,
+                or columns (column -> values) with already formatted values
+
+        Returns:
+            int: Rows written
+        """
+        if isinstance(rows, EventBatch):
+            for start in range(0, len(rows), self.chunk_rows):
+                chunk = rows.take(np.arange(start, min(start + self.chunk_rows, len(rows))))
+                data = {column: chunk.formatted_column(column) for column in self.columns}
+                self._add(format_rows(data, self.columns))
+            count = len(rows)
+        else:
+            data = as_columns(rows, self.columns)
+            count = len(data[self.columns[0]]) if self.columns else 0
+            for start in range(0, count, self.chunk_rows):
+                chunk = {column: values[start:start + self.chunk_rows] for column, values in data.items()}
+                self._add(format_rows(chunk, self.columns))
+        self.rows += count
+        return count
+
+    def flush(self) -> None:
+        """Write the buffered rows to the file."""
+        if self._buffer:
+            self._file.write(b''.join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
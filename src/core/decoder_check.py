@@ -0,0 +1,86 @@
+"""Sampled cross-check of fast-path event decoders against the eth_abi reference decoders."""
+
+import random
+import threading
+
+from src.core.addresses import format_addresses
+
+
+class DecoderCrossCheck:
+    """
+    Compares a sample of fast-path decoder results with the reference decoder.
+
+    With rate 0 (default) nothing is checked; with rate 1.0 every event is
+    decoded twice. On a mismatch the reference result is used and the
+    difference is reported.
+
+    Args:
+        name: Decoder family shown in reports (e.g. 'Uniswap V2')
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rate = 0.0
+        self.checked = 0
+        self.mismatches = 0
+        self._lock = threading.Lock()
+
+    def configure(self, rate: float) -> None:
+        """Set the share of events (0.0 - 1.0) that are cross-checked."""
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Decoder cross-check rate must be between 0 and 1, got: {rate}")
+        self.rate = rate
+
+    def check(self, fast_result: dict, reference, log: dict) -> dict:
+        """
+        Return `fast_result`, validating it against `reference(log)` for a sample of calls.
+
+        Args:
+            fast_result: Output of the fast decoder for `log` (raw 20-byte addresses allowed)
+            reference: Reference decoder (eth_abi based)
+            log: Raw log the result was decoded from
+
+        Returns:
+            dict: fast_result, or the reference result if they differ
+        """
+        if not self._sampled():
+            return fast_result
+        return self._compare(fast_result, reference, log)
+
+    def check_batch(self, batch, logs: list, reference) -> None:
+        """
+        Validate a sample of the rows of a batch-decoded EventBatch against `reference(log)`.
+
+        Args:
+            batch: EventBatch whose row i was decoded from logs[i]
+            logs: Raw logs the batch was decoded from
+            reference: Reference decoder; a row that differs is replaced by its result
+        """
+        if self.rate <= 0.0:
+            return
+        for index, log in enumerate(logs):
+            if not self._sampled():
+                continue
+            fast_result = batch.row(index)
+            result = self._compare(fast_result, reference, log)
+            if result is not fast_result:
+                batch.set_row(index, result)
+
+    def _sampled(self) -> bool:
+        return self.rate > 0.0 and (self.rate >= 1.0 or random.random() < self.rate)
+
+    def _compare(self, fast_result: dict, reference, log: dict) -> dict:
+        expected = reference(log)
+        formatted = format_addresses(fast_result)
+        with self._lock:
+            self.checked += 1
+            if expected == formatted:
+                return fast_result
+            self.mismatches += 1
+        diff = {k: (formatted.get(k), v) for k, v in expected.items() if formatted.get(k) != v}
+        print(f"\n{self.name} fast decoder mismatch in tx {expected.get('transaction_hash')} (fast, reference): {diff}")
+        return expected
+
+    def summary(self) -> str:
+        """One-line cross-check statistics."""
+        return f"{self.name} decoder cross-check: {self.checked} events checked, {self.mismatches} mismatches"
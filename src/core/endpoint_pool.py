@@ -0,0 +1,272 @@
+"""Multi-endpoint RPC pool with health-weighted load balancing and failover."""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Callable, List
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+from web3 import AsyncHTTPProvider, HTTPProvider
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.providers.base import JSONBaseProvider
+
+
+# Consecutive failures after which an endpoint is taken out of rotation
+DEFAULT_EJECT_AFTER = 3
+# First ejection period in seconds; doubles on each repeated ejection up to MAX_EJECT_SECONDS
+DEFAULT_EJECT_SECONDS = 30.0
+MAX_EJECT_SECONDS = 300.0
+
+# Smoothing factor for latency / error-rate moving averages
+_EWMA_ALPHA = 0.2
+# JSON-RPC error codes meaning "this endpoint is overloaded", worth trying elsewhere
+_RATE_LIMIT_CODES = (429, -32603, -32029)
+_RATE_LIMIT_MARKERS = ('429', 'Too Many Requests', 'rate limit', 'capacity')
+
+
+def split_rpc_urls(rpc_url) -> List[str]:
+    """Endpoint list from a comma-separated string (or an iterable of URLs)."""
+    urls = rpc_url.split(',') if isinstance(rpc_url, str) else list(rpc_url)
+    return [url.strip() for url in urls if url and url.strip()]
+
+
+def _host(url: str) -> str:
+    """Endpoint host for log messages (keeps API keys in paths out of the output)."""
+    return urlsplit(url).netloc or url
+
+
+class EndpointRateLimited(Exception):
+    """A JSON-RPC response that reports rate limiting; carries the response for the last endpoint."""
+
+    def __init__(self, response: dict):
+        super().__init__(response.get('error'))
+        self.response = response
+
+
+def is_rate_limited_response(response: dict) -> bool:
+    """True if a JSON-RPC response object is a rate-limit / overload error."""
+    error = response.get('error') if isinstance(response, dict) else None
+    if not error:
+        return False
+    if isinstance(error, dict) and error.get('code') in _RATE_LIMIT_CODES:
+        return True
+    error_str = str(error)
+    return any(marker in error_str for marker in _RATE_LIMIT_MARKERS)
+
+
+def is_failover_error(e: Exception) -> bool:
+    """True for errors that mean "try another endpoint": 429/5xx, connection errors, timeouts."""
+    if isinstance(e, EndpointRateLimited):
+        return True
+    if isinstance(e, requests.HTTPError):
+        status = e.response.status_code if e.response is not None else None
+        return status is None or status == 429 or status >= 500
+    if isinstance(e, aiohttp.ClientResponseError):
+        return e.status == 429 or e.status >= 500
+    return isinstance(e, (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        aiohttp.ClientConnectionError,
+        asyncio.TimeoutError,
+        TimeoutError,
+        ConnectionError,
+    ))
+
+
+class Endpoint:
+    """Observed health of one RPC endpoint."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency = 0.5  # seconds, optimistic prior until the first response
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    @property
+    def weight(self) -> float:
+        """Selection weight: fast endpoints with few errors get most of the traffic."""
+        return max(0.05, 1.0 - self.error_rate) / max(self.latency, 0.01)
+
+
+class EndpointPool:
+    """
+    Health-weighted set of RPC endpoints.
+
+    Requests are spread by weighted random choice (weight ~ success rate / latency).
+    An endpoint that fails `eject_after` times in a row with 429/5xx/connection
+    errors is ejected for `eject_seconds` (doubling on repeat ejections). Thread-safe.
+
+    Args:
+        urls: Endpoint URLs
+        eject_after: Consecutive failures before an endpoint is ejected
+        eject_seconds: First ejection period in seconds
+    """
+
+    def __init__(self, urls: List[str], eject_after: int = DEFAULT_EJECT_AFTER, eject_seconds: float = DEFAULT_EJECT_SECONDS):
+        if not urls:
+            raise ValueError("At least one RPC endpoint URL is required")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self._lock = threading.Lock()
+
+    def choose(self, exclude=()) -> Endpoint:
+        """Pick an endpoint not in `exclude` (URLs); ejected ones only if nothing else is left."""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [e for e in self.endpoints if e.url not in exclude]
+            healthy = [e for e in candidates if e.ejected_until <= now]
+            if healthy:
+                return random.choices(healthy, weights=[e.weight for e in healthy])[0]
+            # Everything is ejected: use the one that comes back first
+            return min(candidates or self.endpoints, key=lambda e: e.ejected_until)
+
+    def record_success(self, endpoint: Endpoint, elapsed: float) -> None:
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.latency += _EWMA_ALPHA * (elapsed - endpoint.latency)
+            endpoint.error_rate += _EWMA_ALPHA * (0.0 - endpoint.error_rate)
+            endpoint.consecutive_failures = 0
+
+    def record_failure(self, endpoint: Endpoint, error: Exception) -> None:
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.failures += 1
+            endpoint.error_rate += _EWMA_ALPHA * (1.0 - endpoint.error_rate)
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures < self.eject_after or len(self.endpoints) == 1:
+                return
+            period = min(MAX_EJECT_SECONDS, self.eject_seconds * 2 ** endpoint.ejections)
+            endpoint.ejections += 1
+            endpoint.ejected_until = time.monotonic() + period
+            endpoint.consecutive_failures = 0
+        print(f"\nEjecting RPC endpoint {_host(endpoint.url)} for {period:.0f}s after repeated failures: {error}")
+
+    def call_with_failover(self, call: Callable[[str], object]):
+        """
+        Run `call(url)` on a chosen endpoint, moving to another endpoint on failover errors.
+
+        Each endpoint is tried at most once; the last error is re-raised if all fail.
+        Other exceptions propagate immediately.
+        """
+        tried = set()
+        last_error = None
+        for _ in range(len(self.endpoints)):
+            endpoint = self.choose(exclude=tried)
+            tried.add(endpoint.url)
+            started = time.monotonic()
+            try:
+                result = call(endpoint.url)
+            except Exception as e:
+                if not is_failover_error(e):
+                    raise
+                self.record_failure(endpoint, e)
+                last_error = e
+                continue
+            self.record_success(endpoint, time.monotonic() - started)
+            return result
+        raise last_error
+
+    async def call_with_failover_async(self, call):
+        """Async counterpart of call_with_failover; `call(url)` returns an awaitable."""
+        tried = set()
+        last_error = None
+        for _ in range(len(self.endpoints)):
+            endpoint = self.choose(exclude=tried)
+            tried.add(endpoint.url)
+            started = time.monotonic()
+            try:
+                result = await call(endpoint.url)
+            except Exception as e:
+                if not is_failover_error(e):
+                    raise
+                self.record_failure(endpoint, e)
+                last_error = e
+                continue
+            self.record_success(endpoint, time.monotonic() - started)
+            return result
+        raise last_error
+
+    def summary(self) -> str:
+        """Per-endpoint request counts, error rate and latency."""
+        with self._lock:
+            return '; '.join(
+                f"{_host(e.url)}: {e.requests} requests, {e.failures} failed, "
+                f"latency {e.latency * 1000:.0f}ms, error rate {e.error_rate:.0%}"
+                for e in self.endpoints
+            )
+
+
+class MultiEndpointProvider(JSONBaseProvider):
+    """
+    Web3 provider that spreads requests over an EndpointPool of HTTP endpoints.
+
+    A request that fails with 429/5xx, a connection error or a rate-limit
+    JSON-RPC error is retried on another endpoint.
+    """
+
+    def __init__(self, urls: List[str], request_kwargs: dict = None, **pool_kwargs):
+        super().__init__()
+        self.endpoint_pool = EndpointPool(urls, **pool_kwargs)
+        self._providers = {url: HTTPProvider(url, request_kwargs=request_kwargs) for url in urls}
+
+    @property
+    def endpoint_uri(self) -> str:
+        """Currently preferred endpoint (for code that needs a single URL)."""
+        return self.endpoint_pool.choose().url
+
+    def make_request(self, method, params):
+        def call(url: str) -> dict:
+            response = self._providers[url].make_request(method, params)
+            if is_rate_limited_response(response):
+                raise EndpointRateLimited(response)
+            return response
+
+        try:
+            return self.endpoint_pool.call_with_failover(call)
+        except EndpointRateLimited as e:
+            # Every endpoint is rate limiting: hand the error to the caller's retry/backoff logic
+            return e.response
+
+    def __str__(self) -> str:
+        return f"RPC pool ({len(self._providers)} endpoints)"
+
+
+class AsyncMultiEndpointProvider(AsyncJSONBaseProvider):
+    """Async counterpart of MultiEndpointProvider built on AsyncHTTPProvider."""
+
+    def __init__(self, urls: List[str], **pool_kwargs):
+        super().__init__()
+        self.endpoint_pool = EndpointPool(urls, **pool_kwargs)
+        self._providers = {url: AsyncHTTPProvider(url) for url in urls}
+
+    @property
+    def endpoint_uri(self) -> str:
+        return self.endpoint_pool.choose().url
+
+    async def cache_async_session(self, session: aiohttp.ClientSession) -> None:
+        """Make every endpoint use the same pooled session."""
+        for provider in self._providers.values():
+            await provider.cache_async_session(session)
+
+    async def make_request(self, method, params):
+        async def call(url: str) -> dict:
+            response = await self._providers[url].make_request(method, params)
+            if is_rate_limited_response(response):
+                raise EndpointRateLimited(response)
+            return response
+
+        try:
+            return await self.endpoint_pool.call_with_failover_async(call)
+        except EndpointRateLimited as e:
+            return e.response
+
+    def __str__(self) -> str:
+        return f"Async RPC pool ({len(self._providers)} endpoints)"
@@ -0,0 +1,377 @@
+"""
+Columnar batches of decoded events.
+
+An EventBatch holds the events of one chunk as one array per column instead
+of one dict per event:
+
+    - addresses and transaction hashes: one packed buffer (20/32 bytes per row)
+    - block numbers, log indexes, ticks: int64 NumPy arrays
+    - amounts: uint64/int64 NumPy arrays, or object arrays of exact Python ints
+      when a value needs more than 64 bits (as produced by src.core.batch_decoder)
+    - text (event_type): small integer codes into a list of values
+
+Columns that do not apply to an event type (amount0In of a Mint) are masked
+out by a per-column validity array and come out as empty CSV cells / NULLs.
+
+Decoders fill batches column by column and the writers (CSV, Parquet,
+partitions, SQLite) read the columns directly, so no per-event dict exists
+between decoding and output. from_events / to_events convert from and to
+the per-event dicts of the reference decoders.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from hexbytes import HexBytes
+
+from src.core.addresses import to_address_bytes, to_checksum_address
+
+
+# Column kinds
+ADDRESS = 'address'
+HASH = 'hash'
+INT32 = 'int32'
+INT64 = 'int64'
+AMOUNT = 'amount'
+TEXT = 'text'
+
+_WIDTHS = {ADDRESS: 20, HASH: 32}
+
+# Transaction hashes are written the way the decoders print them (HexBytes.hex())
+_HASH_PREFIX = '0x' if HexBytes(b'\x00').hex().startswith('0x') else ''
+
+
+def _missing(value) -> bool:
+    return value is None or (isinstance(value, str) and value == '')
+
+
+def _hash_bytes(value) -> bytes:
+    if isinstance(value, bytes):
+        return bytes(value)
+    return bytes.fromhex(value[2:] if value[:2] in ('0x', '0X') else value)
+
+
+def _fits(dtype, value: int) -> bool:
+    if dtype == object:
+        return True
+    info = np.iinfo(dtype)
+    return info.min <= value <= info.max
+
+
+def _amount_array(values: List[int]) -> np.ndarray:
+    """uint64 or int64 array when every value fits, else an object array of Python ints."""
+    low, high = (min(values), max(values)) if values else (0, 0)
+    for dtype in (np.uint64, np.int64):
+        if _fits(dtype, low) and _fits(dtype, high):
+            return np.array(values, dtype=dtype)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _concat_arrays(arrays: List[np.ndarray]) -> np.ndarray:
+    """Concatenate integer columns without letting uint64 + int64 promote to float64."""
+    if len({array.dtype for array in arrays}) > 1:
+        arrays = [array.astype(object) for array in arrays]
+    return np.concatenate(arrays)
+
+
+class EventBatch:
+    """
+    Decoded events of several types in columns (see module docstring).
+
+    Args:
+        fields: [(column, kind)] every event of the batch may have; kinds are
+            ADDRESS, HASH, INT32, INT64, AMOUNT and TEXT
+        size: Number of rows (all columns start out empty)
+    """
+
+    def __init__(self, fields: Sequence[Tuple[str, str]], size: int = 0):
+        self.fields = list(fields)
+        self.kinds = dict(self.fields)
+        self._size = size
+        self._data = {}
+        self._valid = {}
+        self._categories = {}
+        for name, kind in self.fields:
+            self.clear_column(name)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_columns(cls, fields: Sequence[Tuple[str, str]], size: int, columns: Dict[str, object]) -> 'EventBatch':
+        """
+        Batch from columns of equal length; fields without a column stay empty.
+
+        Args:
+            fields: Columns of the batch
+            size: Number of rows
+            columns: column -> values (see set_column); a TEXT column may be a single
+                string shared by every row (e.g. the event_type of a decoded group)
+        """
+        batch = cls(fields, size)
+        for name, values in columns.items():
+            if name in batch.kinds:
+                batch.set_column(name, values)
+        return batch
+
+    @classmethod
+    def from_events(cls, fields: Sequence[Tuple[str, str]], events: List[dict]) -> 'EventBatch':
+        """Batch from per-event dicts (missing keys and '' are empty cells)."""
+        batch = cls(fields, len(events))
+        for name, _ in batch.fields:
+            batch.set_column(name, [event.get(name) for event in events])
+        return batch
+
+    @classmethod
+    def concat(cls, fields: Sequence[Tuple[str, str]], batches: List['EventBatch']) -> 'EventBatch':
+        """Rows of `batches` one after another (all batches must have the same fields)."""
+        batches = [batch for batch in batches if len(batch)]
+        if len(batches) == 1:
+            return batches[0]
+        result = cls(fields, sum(len(batch) for batch in batches))
+        if not batches:
+            return result
+        for name, kind in result.fields:
+            if kind in _WIDTHS:
+                result._data[name] = bytearray(b''.join(batch._data[name] for batch in batches))
+            elif kind == TEXT:
+                categories = list(dict.fromkeys(value for batch in batches for value in batch._categories[name]))
+                lookup = {value: code for code, value in enumerate(categories)}
+                result._categories[name] = categories
+                result._data[name] = np.concatenate([
+                    np.array([lookup[value] for value in batch._categories[name]], dtype=np.int32)[batch._data[name]]
+                    for batch in batches
+                ])
+            else:
+                result._data[name] = _concat_arrays([batch._data[name] for batch in batches])
+            masks = [batch._valid[name] for batch in batches]
+            if any(mask is not None for mask in masks):
+                result._valid[name] = np.concatenate([
+                    mask if mask is not None else np.ones(len(batch), dtype=bool)
+                    for batch, mask in zip(batches, masks)
+                ])
+            else:
+                result._valid[name] = None
+        return result
+
+    def take(self, indices) -> 'EventBatch':
+        """
+        Batch of the rows at `indices` (in that order).
+
+        Args:
+            indices: Integer index array (or boolean mask) into the rows
+        """
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        result = EventBatch(self.fields, len(indices))
+        for name, kind in self.fields:
+            data = self._data[name]
+            if kind in _WIDTHS:
+                width = _WIDTHS[kind]
+                matrix = np.frombuffer(data, dtype=np.uint8).reshape(self._size, width)
+                result._data[name] = bytearray(matrix[indices].tobytes())
+            else:
+                result._data[name] = data[indices]
+            if kind == TEXT:
+                result._categories[name] = list(self._categories[name])
+            valid = self._valid[name]
+            result._valid[name] = valid[indices] if valid is not None else None
+        return result
+
+    def clear_column(self, name: str) -> None:
+        """Mark every value of a column empty."""
+        kind = self.kinds[name]
+        if kind in _WIDTHS:
+            self._data[name] = bytearray(self._size * _WIDTHS[kind])
+        elif kind == TEXT:
+            self._data[name] = np.zeros(self._size, dtype=np.int32)
+            self._categories[name] = ['']
+        else:
+            self._data[name] = np.zeros(self._size, dtype=np.int64)
+        self._valid[name] = np.zeros(self._size, dtype=bool)
+
+    def set_column(self, name: str, values) -> None:
+        """
+        Replace a column.
+
+        Args:
+            name: Column
+            values: One value per row (None or '' for an empty cell). ADDRESS / HASH
+                columns take raw bytes or hex strings, or one packed buffer of
+                20/32 bytes per row; integer columns take ints or a NumPy array;
+                TEXT columns take strings or a single string for every row
+        """
+        kind = self.kinds[name]
+        if kind in _WIDTHS:
+            width = _WIDTHS[kind]
+            if isinstance(values, (bytes, bytearray)):
+                if len(values) != self._size * width:
+                    raise ValueError(f"Packed {name} column has {len(values)} bytes, expected {self._size * width}")
+                self._data[name] = bytearray(values)
+                self._valid[name] = None
+                return
+            try:
+                # Raw values of the right width (batch decoder output) are joined as they are
+                packed = b''.join(values)
+            except TypeError:
+                packed = None
+            if packed is not None and len(packed) == self._size * width:
+                self._data[name] = bytearray(packed)
+                self._valid[name] = None
+                return
+            convert = to_address_bytes if kind == ADDRESS else _hash_bytes
+            valid = np.array([not _missing(value) for value in values], dtype=bool)
+            empty = bytes(width)
+            self._data[name] = bytearray(b''.join([
+                convert(value) if ok else empty for value, ok in zip(values, valid.tolist())
+            ]))
+            self._valid[name] = None if valid.all() else valid
+        elif kind == TEXT:
+            if isinstance(values, str):
+                self._categories[name] = [values]
+                self._data[name] = np.zeros(self._size, dtype=np.int32)
+                self._valid[name] = None
+                return
+            valid = np.array([not _missing(value) for value in values], dtype=bool)
+            categories = list(dict.fromkeys(value for value in values if not _missing(value))) or ['']
+            lookup = {value: code for code, value in enumerate(categories)}
+            self._categories[name] = categories
+            self._data[name] = np.array([lookup.get(value, 0) for value in values], dtype=np.int32)
+            self._valid[name] = None if valid.all() else valid
+        elif isinstance(values, np.ndarray):
+            self._data[name] = values if kind == AMOUNT else values.astype(np.int64)
+            self._valid[name] = None
+        else:
+            valid = np.array([not _missing(value) for value in values], dtype=bool)
+            ints = [int(value) if ok else 0 for value, ok in zip(values, valid.tolist())]
+            self._data[name] = _amount_array(ints) if kind == AMOUNT else np.array(ints, dtype=np.int64)
+            self._valid[name] = None if valid.all() else valid
+
+    def valid(self, name: str) -> Optional[np.ndarray]:
+        """Boolean mask of the non-empty values of a column, or None when none is empty."""
+        return self._valid[name]
+
+    def packed(self, name: str) -> bytes:
+        """Packed buffer of an ADDRESS / HASH column (empty cells are zero bytes)."""
+        return bytes(self._data[name])
+
+    def array(self, name: str) -> np.ndarray:
+        """NumPy array of an integer column (empty cells are 0) or the codes of a TEXT column."""
+        return self._data[name]
+
+    def categories(self, name: str) -> List[str]:
+        """Values the codes of a TEXT column refer to."""
+        return self._categories[name]
+
+    def column(self, name: str) -> list:
+        """
+        Values of a column as Python objects, None for empty cells.
+
+        Addresses and hashes are raw bytes, integers Python ints, text str.
+        """
+        kind = self.kinds[name]
+        data = self._data[name]
+        if kind in _WIDTHS:
+            width = _WIDTHS[kind]
+            buffer = bytes(data)
+            values = [buffer[i:i + width] for i in range(0, len(buffer), width)]
+        elif kind == TEXT:
+            categories = self._categories[name]
+            values = [categories[code] for code in data.tolist()]
+        else:
+            values = data.tolist()
+        valid = self._valid[name]
+        if valid is None:
+            return values
+        return [value if ok else None for value, ok in zip(values, valid.tolist())]
+
+    def formatted_column(self, name: str) -> List[str]:
+        """
+        Values of a column as they appear in text output ('' for empty cells).
+
+        Addresses are checksummed, transaction hashes hex, integers decimal.
+        """
+        kind = self.kinds.get(name)
+        if kind is None:
+            return [''] * self._size
+        if kind == ADDRESS:
+            values = [to_checksum_address(value) if value is not None else '' for value in self.column(name)]
+        elif kind == HASH:
+            values = [_HASH_PREFIX + value.hex() if value is not None else '' for value in self.column(name)]
+        elif kind == TEXT:
+            values = [value if value is not None else '' for value in self.column(name)]
+        else:
+            values = [str(value) if value is not None else '' for value in self.column(name)]
+        return values
+
+    def counts(self, name: str = 'event_type') -> Dict[str, int]:
+        """Rows per value of a TEXT column (e.g. events per event_type)."""
+        codes = self._data[name]
+        valid = self._valid[name]
+        if valid is not None:
+            codes = codes[valid]
+        totals = np.bincount(codes, minlength=len(self._categories[name]))
+        return {value: int(total) for value, total in zip(self._categories[name], totals.tolist()) if total}
+
+    def row(self, index: int, keep_empty: bool = False) -> dict:
+        """
+        Event `index` as a dict (addresses raw bytes, hashes hex).
+
+        Args:
+            index: Row number
+            keep_empty: Include empty fields as None, so every row has all fields of the layout
+                (otherwise only the non-empty fields are set)
+        """
+        event = {}
+        for name, kind in self.fields:
+            valid = self._valid[name]
+            if valid is not None and not valid[index]:
+                if keep_empty:
+                    event[name] = None
+                continue
+            data = self._data[name]
+            if kind in _WIDTHS:
+                width = _WIDTHS[kind]
+                value = bytes(data[index * width:(index + 1) * width])
+                event[name] = value if kind == ADDRESS else _HASH_PREFIX + value.hex()
+            elif kind == TEXT:
+                event[name] = self._categories[name][int(data[index])]
+            else:
+                event[name] = int(data[index])
+        return event
+
+    def to_events(self, keep_empty: bool = False) -> List[dict]:
+        """Every event as a dict (see row)."""
+        return [self.row(index, keep_empty) for index in range(self._size)]
+
+    def set_row(self, index: int, event: dict) -> None:
+        """Overwrite event `index` with the fields of `event` (fields it lacks become empty)."""
+        for name, kind in self.fields:
+            value = event.get(name)
+            valid = self._valid[name]
+            if valid is None:
+                if _missing(value):
+                    valid = self._valid[name] = np.ones(self._size, dtype=bool)
+                else:
+                    valid = None
+            if valid is not None:
+                valid[index] = not _missing(value)
+            if _missing(value):
+                continue
+            data = self._data[name]
+            if kind in _WIDTHS:
+                width = _WIDTHS[kind]
+                data[index * width:(index + 1) * width] = to_address_bytes(value) if kind == ADDRESS else _hash_bytes(value)
+            elif kind == TEXT:
+                categories = self._categories[name]
+                if value not in categories:
+                    categories.append(value)
+                data[index] = categories.index(value)
+            else:
+                value = int(value)
+                if not _fits(data.dtype, value):
+                    data = self._data[name] = data.astype(object)
+                data[index] = value
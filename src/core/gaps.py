@@ -0,0 +1,310 @@
+"""
+Persistent ledger of block ranges that could not be fetched.
+
+When eth_getLogs retries run out, the indexers skip the range and carry on;
+every such range is recorded here instead of only being printed, so holes in
+a dataset can be found (verify-coverage) and re-fetched (backfill-gaps).
+
+The ledger is one JSON file per protocol ({CHECKPOINT_DIR}/{protocol}_gaps.json)
+holding the open gaps of every command, rewritten atomically on each change.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from src.core.checkpoint import Checkpoint, atomic_write_json
+
+
+Interval = Tuple[int, int]
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Sorted union of inclusive block intervals (adjacent intervals are joined)."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(intervals: List[Interval], removed: List[Interval]) -> List[Interval]:
+    """Parts of `intervals` not covered by `removed` (both inclusive, result merged)."""
+    result = []
+    removed = merge_intervals(removed)
+    for start, end in merge_intervals(intervals):
+        cursor = start
+        for r_start, r_end in removed:
+            if r_end < cursor or r_start > end:
+                continue
+            if r_start > cursor:
+                result.append((cursor, r_start - 1))
+            cursor = max(cursor, r_end + 1)
+        if cursor <= end:
+            result.append((cursor, end))
+    return result
+
+
+def split_intervals(intervals: List[Interval], size: int) -> List[Interval]:
+    """Intervals cut into pieces of at most `size` blocks."""
+    pieces = []
+    for start, end in intervals:
+        for piece_start in range(start, end + 1, max(1, size)):
+            pieces.append((piece_start, min(piece_start + size - 1, end)))
+    return pieces
+
+
+class GapLedger:
+    """
+    Open gaps of one protocol, per command.
+
+    Each entry is {"command", "start_block", "end_block", "reason", "recorded_at"}.
+    Safe to use from fetch worker threads.
+
+    Args:
+        directory: Ledger directory (CHECKPOINT_DIR)
+        protocol: Protocol name (e.g. 'uniswap_v2')
+        command: Command whose skipped ranges record_gap() files (e.g. 'index-pair-events')
+    """
+
+    def __init__(self, directory: str, protocol: str, command: Optional[str] = None):
+        self.path = os.path.join(directory, f"{protocol}_gaps.json")
+        self.command = command
+        self.recorded = []
+        self._lock = threading.Lock()
+
+    def _load(self) -> List[dict]:
+        if not os.path.isfile(self.path):
+            return []
+        with open(self.path, encoding='utf-8') as f:
+            return json.load(f)['gaps']
+
+    def _save(self, gaps: List[dict]) -> None:
+        gaps.sort(key=lambda gap: (gap['command'], gap['start_block']))
+        atomic_write_json(self.path, {'gaps': gaps})
+
+    def record(self, start_block: int, end_block: int, reason: str) -> None:
+        """
+        Persist a skipped range of the ledger's command.
+
+        Args:
+            start_block: First skipped block
+            end_block: Last skipped block
+            reason: Error that made the range be skipped
+        """
+        entry = {
+            'command': self.command,
+            'start_block': start_block,
+            'end_block': end_block,
+            'reason': reason[:500],
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        with self._lock:
+            gaps = self._load()
+            gaps.append(entry)
+            self._save(gaps)
+            self.recorded.append((start_block, end_block))
+        print(f"\nRecorded gap {start_block}-{end_block} in {self.path}")
+
+    def gaps(self, command: str) -> List[dict]:
+        """Open gap entries of `command`, ordered by start block."""
+        with self._lock:
+            return [gap for gap in self._load() if gap['command'] == command]
+
+    def intervals(self, command: str) -> List[Interval]:
+        """Open gaps of `command` as merged (start_block, end_block) intervals."""
+        return merge_intervals([(gap['start_block'], gap['end_block']) for gap in self.gaps(command)])
+
+    def resolve(self, command: str, start_block: int, end_block: int) -> None:
+        """
+        Remove [start_block, end_block] from the open gaps of `command` (it has been filled).
+
+        Ranges this process recorded as failed again stay open.
+        """
+        with self._lock:
+            filled = subtract_intervals([(start_block, end_block)], self.recorded)
+            kept = []
+            for gap in self._load():
+                if gap['command'] != command or gap['end_block'] < start_block or gap['start_block'] > end_block:
+                    kept.append(gap)
+                    continue
+                for rest_start, rest_end in subtract_intervals([(gap['start_block'], gap['end_block'])], filled):
+                    kept.append(dict(gap, start_block=rest_start, end_block=rest_end))
+            self._save(kept)
+
+    def clear(self, command: str, from_block: int = 0) -> None:
+        """Drop the open gaps of `command` from `from_block` on (that part of the output is rewritten)."""
+        self.resolve(command, from_block, 2 ** 63)
+
+    def commands(self) -> List[str]:
+        """Commands with open gaps."""
+        with self._lock:
+            return sorted({gap['command'] for gap in self._load()})
+
+    def recorded_within(self, start_block: int, end_block: int) -> bool:
+        """Whether this process recorded a gap overlapping [start_block, end_block]."""
+        with self._lock:
+            return any(start <= end_block and end >= start_block for start, end in self.recorded)
+
+
+def output_kind(config: dict) -> str:
+    """Event output selected by the config: 'csv', 'csv gzip', 'parquet', 'sqlite', 'partitioned csv', ..."""
+    if config['OUTPUT_LAYOUT'] == 'partitioned':
+        return f"partitioned {config['OUTPUT_FORMAT']}"
+    if config['OUTPUT_FORMAT'] == 'csv' and config['CSV_COMPRESSION'] != 'none':
+        return f"csv {config['CSV_COMPRESSION']}"
+    return config['OUTPUT_FORMAT']
+
+
+def gap_command(command: str, config: dict) -> str:
+    """
+    Ledger name of an events command for the configured output.
+
+    Gaps of the plain CSV output are filed under the command itself (they are
+    what verify-coverage and backfill-gaps work on); gaps of other outputs get
+    the output in parentheses, e.g. 'index-pair-events (parquet)', so they are
+    never backfilled into the wrong file.
+    """
+    kind = output_kind(config)
+    return command if kind == 'csv' else f"{command} ({kind})"
+
+
+_ledger = None
+
+
+def configure_gap_ledger(directory: str, protocol: str, command: str) -> GapLedger:
+    """
+    Install the process-wide ledger that skipped ranges are recorded to.
+
+    Args:
+        directory: Ledger directory (CHECKPOINT_DIR)
+        protocol: Protocol name
+        command: Command being run
+
+    Returns:
+        GapLedger
+    """
+    global _ledger
+    _ledger = GapLedger(directory, protocol, command)
+    return _ledger
+
+
+def record_gap(start_block: int, end_block: int, reason) -> None:
+    """Record a skipped range in the configured ledger (no-op when none is configured)."""
+    if _ledger is not None:
+        _ledger.record(start_block, end_block, str(reason))
+
+
+def fetch_intervals(
+    fetch: Callable[[int, int], List[dict]],
+    intervals: List[Interval],
+    piece_size: int,
+    workers: int,
+) -> Iterator[Tuple[int, int, List[dict]]]:
+    """
+    Fetch block intervals in pieces of at most `piece_size` blocks, `workers` pieces at a time.
+
+    Args:
+        fetch: Called as fetch(start_block, end_block) in a worker thread, returns logs
+        intervals: Inclusive (start_block, end_block) intervals
+        piece_size: Blocks per eth_getLogs call (BATCH_SIZE)
+        workers: Pieces fetched concurrently (FETCH_CONCURRENCY)
+
+    Yields:
+        (start_block, end_block, logs) per piece, in completion order
+    """
+    pieces = split_intervals(merge_intervals(intervals), piece_size)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(fetch, start, end): (start, end) for start, end in pieces}
+        for future in as_completed(futures):
+            start, end = futures[future]
+            yield start, end, future.result()
+
+
+def scan_output_blocks(path: str, chunksize: int = 500_000) -> Tuple[int, Optional[int], Optional[int]]:
+    """
+    Row count and lowest/highest block_number of a CSV output, read in chunks.
+
+    Returns:
+        (rows, min_block, max_block); blocks are None for an output without rows
+    """
+    rows = 0
+    min_block = max_block = None
+    for chunk in pd.read_csv(path, usecols=['block_number'], chunksize=chunksize):
+        if chunk.empty:
+            continue
+        rows += len(chunk)
+        low, high = int(chunk['block_number'].min()), int(chunk['block_number'].max())
+        min_block = low if min_block is None else min(min_block, low)
+        max_block = high if max_block is None else max(max_block, high)
+    return rows, min_block, max_block
+
+
+def gaps_within(ledger: GapLedger, command: str, start_block: int, end_block: int) -> List[Interval]:
+    """Open gaps of `command` clipped to [start_block, end_block]."""
+    return [
+        (max(start, start_block), min(end, end_block))
+        for start, end in ledger.intervals(command)
+        if end >= start_block and start <= end_block
+    ]
+
+
+def check_coverage(
+    checkpoint: Checkpoint,
+    ledger: GapLedger,
+    output_path: str,
+    start_block: int,
+    end_block: int,
+) -> List[Interval]:
+    """
+    Print the coverage of one command's output over [start_block, end_block].
+
+    Blocks are missing when they are outside the checkpointed (fully written)
+    range or inside an open gap of the ledger. The output itself is scanned
+    to check that it agrees with the checkpoint.
+
+    Args:
+        checkpoint: Checkpoint of the command
+        ledger: Gaps ledger of the protocol
+        output_path: Output file of the command
+        start_block: First block that should be covered
+        end_block: Last block that should be covered
+
+    Returns:
+        List of missing (start_block, end_block) intervals
+    """
+    command = checkpoint.command
+    state = checkpoint.load()
+    print(f"\n[{command}] {output_path}")
+    if state is None or not os.path.isfile(output_path):
+        print("  Not indexed yet" if state is None else "  Output is missing")
+        return [(start_block, end_block)]
+
+    written = (state['start_block'], state['end_block'])
+    not_indexed = subtract_intervals([(start_block, end_block)], [written] if written[0] <= written[1] else [])
+    gaps = gaps_within(ledger, command, start_block, end_block)
+    print(f"  Written: blocks {written[0]}-{written[1]}, {state['rows']} rows (checkpoint {state['updated_at']})")
+
+    rows, min_block, max_block = scan_output_blocks(output_path)
+    if rows > state['rows']:
+        print(f"  {rows - state['rows']} rows after the last checkpoint (dropped by --resume)")
+    elif rows < state['rows']:
+        print(f"  Output has {rows} rows, fewer than the {state['rows']} checkpointed")
+    if min_block is not None and (min_block < written[0] or max_block > written[1]):
+        print(f"  Output has rows outside the written range (blocks {min_block}-{max_block})")
+
+    for start, end in not_indexed:
+        print(f"  Not indexed: {start}-{end} ({end - start + 1} blocks)")
+    for start, end in gaps:
+        print(f"  Gap: {start}-{end} ({end - start + 1} blocks)")
+    missing = merge_intervals(not_indexed + gaps)
+    if not missing:
+        print("  Complete")
+    return missing
@@ -0,0 +1,144 @@
+"""
+Process-pool decode stage for large log sets.
+
+Logs are split into chunks and decoded in worker processes; results come back
+in the original order. Before pickling, every log is packed into a compact
+tuple of bytes/ints (no HexBytes, AttributeDict or hex strings), and decoded
+events carry raw 20-byte addresses (see src.core.addresses), so transfer
+costs stay small compared to decoding. decode_log_batches returns columnar
+EventBatches (src.core.event_batch), which pickle as a few flat buffers.
+A run opens one pool (open_decode_pool) and passes it to every call.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from src.core.event_batch import EventBatch
+
+
+# Below this many logs per worker the pool start-up and transfer cost more than they save
+MIN_LOGS_PER_WORKER = 2_000
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (affinity-aware where supported)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _to_bytes(value) -> bytes:
+    if isinstance(value, bytes):
+        return bytes(value)
+    return bytes.fromhex(value[2:] if value[:2] in ('0x', '0X') else value)
+
+
+def compact_log(log: dict) -> tuple:
+    """
+    Pack a log into (address, topics, data, block_number, tx_hash, log_index).
+
+    address/data are plain bytes, topics one bytes string of 32-byte topics.
+    The transaction hash is kept in the form the decoders output (hex string).
+    """
+    tx_hash = log['transactionHash']
+    return (
+        _to_bytes(log['address']),
+        b''.join(_to_bytes(topic) for topic in log['topics']),
+        _to_bytes(log['data']),
+        log['blockNumber'],
+        tx_hash.hex() if isinstance(tx_hash, bytes) else tx_hash,
+        log['logIndex'],
+    )
+
+
+def expand_log(packed: tuple) -> dict:
+    """Log dict (bytes fields) from compact_log output."""
+    address, topics, data, block_number, tx_hash, log_index = packed
+    return {
+        'address': address,
+        'topics': [topics[i:i + 32] for i in range(0, len(topics), 32)],
+        'data': data,
+        'blockNumber': block_number,
+        'transactionHash': tx_hash,
+        'logIndex': log_index,
+    }
+
+
+def open_decode_pool(workers: int, initializer: Callable = None, initargs: tuple = ()) -> Optional[ProcessPoolExecutor]:
+    """
+    Worker pool for decode_log_batches, started once per run.
+
+    Workers are started with forkserver (spawn where unavailable), never
+    fork: the indexer runs fetch and RPC threads, and forking a process
+    that holds their locks can deadlock the child. Workers therefore do not
+    inherit module state; pass `initializer` to configure it (e.g. the
+    decoder cross-check rate).
+
+    Args:
+        workers: Worker processes (1 or less: no pool, decoding stays in this process)
+        initializer: Called with `initargs` in every worker at start-up
+
+    Returns:
+        ProcessPoolExecutor to shut down at the end of the run, or None
+    """
+    if workers <= 1:
+        return None
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context(method),
+        initializer=initializer, initargs=initargs,
+    )
+
+
+def _decode_batch_chunk(decoder: Callable, chunk: List[tuple]) -> tuple:
+    """Worker: decode packed logs into (batch, positions, errors) (see decode_log_batches)."""
+    return decoder([expand_log(packed) for packed in chunk])
+
+
+def decode_log_batches(
+    decoder: Callable[[List[dict]], tuple],
+    logs: List[dict],
+    workers: int,
+    chunk_size: int = 5_000,
+    executor: Optional[ProcessPoolExecutor] = None,
+) -> Tuple[EventBatch, List[int], List[Tuple[int, str]]]:
+    """
+    Decode logs into one EventBatch, in worker processes when the set is large enough.
+
+    Args:
+        decoder: Module-level batch decode function (e.g. decode_pair_logs) returning
+            (batch, positions, errors); must be picklable
+        logs: Raw logs from eth_getLogs
+        workers: Worker processes (1 or less decodes in this process)
+        chunk_size: Logs per task sent to a worker
+        executor: Pool from open_decode_pool to run on; without one a pool is
+            started for this call only
+
+    Returns:
+        (batch, positions, errors): events in log order, the index in `logs` of every
+            row, and (index, error message) for logs that could not be decoded
+    """
+    workers = min(workers, len(logs) // MIN_LOGS_PER_WORKER)
+    if workers <= 1:
+        return decoder(logs)
+
+    chunks = []
+    for start in range(0, len(logs), chunk_size):
+        chunks.append([compact_log(log) for log in logs[start:start + chunk_size]])
+    own_pool = executor is None
+    if own_pool:
+        executor = open_decode_pool(workers)
+    batches, positions, errors = [], [], []
+    try:
+        results = executor.map(_decode_batch_chunk, [decoder] * len(chunks), chunks)
+        for offset, (batch, chunk_positions, chunk_errors) in zip(range(0, len(logs), chunk_size), results):
+            batches.append(batch)
+            positions.extend(offset + position for position in chunk_positions)
+            errors.extend((offset + position, error) for position, error in chunk_errors)
+    finally:
+        if own_pool:
+            executor.shutdown()
+    return EventBatch.concat(batches[0].fields, batches), positions, errors
@@ -0,0 +1,202 @@
+"""
+Typed Parquet output for decoded events (--format parquet).
+
+Every event type goes to its own file with its own schema, so there are no
+empty placeholder columns: addresses are fixed_size_binary(20), transaction
+hashes fixed_size_binary(32), block numbers int64, log indexes and ticks
+int32, and wide integers (uint128/uint160/uint256/int256) either
+decimal256(76, 0) or 32-byte big-endian two's complement (PARQUET_AMOUNTS).
+
+Rows are buffered and written as one row group per PARQUET_ROW_GROUP_BLOCKS
+blocks, so the block_number statistics of each row group describe a block
+range and readers can skip row groups outside the range they ask for. Files
+are written under a temporary name and renamed on close.
+
+pyarrow is only imported when Parquet output is used.
+"""
+
+import os
+from decimal import Decimal
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from src.core.event_batch import ADDRESS, AMOUNT, HASH, INT32, INT64, EventBatch
+
+# Flush a row group early when this many rows of one event type are buffered (bounds memory)
+MAX_ROW_GROUP_ROWS = 1_000_000
+
+_DECIMAL_DIGITS = 76
+
+
+def import_pyarrow():
+    """pyarrow and pyarrow.parquet, with an install hint when missing."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from e
+    return pyarrow, pyarrow.parquet
+
+
+def _arrow_type(pa, kind: str, amounts: str):
+    if kind == ADDRESS:
+        return pa.binary(20)
+    if kind == HASH:
+        return pa.binary(32)
+    if kind == INT32:
+        return pa.int32()
+    if kind == INT64:
+        return pa.int64()
+    if kind == AMOUNT:
+        return pa.decimal256(_DECIMAL_DIGITS, 0) if amounts == 'decimal' else pa.binary(32)
+    raise ValueError(f"Unknown column kind: {kind}")
+
+
+def arrow_schema(fields: Sequence[Tuple[str, str]], amounts: str = 'decimal'):
+    """
+    pyarrow schema for a list of (column, kind) pairs.
+
+    Args:
+        fields: Columns in output order with their kind (ADDRESS, HASH, INT32, INT64, AMOUNT)
+        amounts: 'decimal' (decimal256(76, 0)) or 'binary' (32-byte two's complement)
+    """
+    pa, _ = import_pyarrow()
+    return pa.schema([pa.field(name, _arrow_type(pa, kind, amounts)) for name, kind in fields])
+
+
+def _amount_decimal(value) -> Decimal:
+    value = int(value)
+    if abs(value) >= 10 ** _DECIMAL_DIGITS:
+        raise ValueError(f"Amount {value} does not fit decimal256({_DECIMAL_DIGITS}, 0); use PARQUET_AMOUNTS=binary")
+    return Decimal(value)
+
+
+def _amount_binary(value) -> bytes:
+    return int(value).to_bytes(32, 'big', signed=int(value) < 0)
+
+
+def _column(pa, batch: EventBatch, name: str, kind: str, amounts: str):
+    """Arrow array of one column of a batch; empty cells become nulls."""
+    arrow_type = _arrow_type(pa, kind, amounts)
+    valid = batch.valid(name)
+    if kind in (ADDRESS, HASH):
+        # Packed fixed-width values are handed to Arrow as they are
+        validity = pa.py_buffer(np.packbits(valid, bitorder='little')) if valid is not None else None
+        return pa.Array.from_buffers(arrow_type, len(batch), [validity, pa.py_buffer(batch.packed(name))])
+    mask = ~valid if valid is not None else None
+    if kind in (INT32, INT64):
+        return pa.array(batch.array(name), type=arrow_type, mask=mask)
+    convert = _amount_decimal if amounts == 'decimal' else _amount_binary
+    return pa.array([None if value is None else convert(value) for value in batch.column(name)], type=arrow_type)
+
+
+class ParquetEventWriter:
+    """
+    Writes decoded events of several types to one Parquet file per type.
+
+    Args:
+        paths: event_type -> output file
+        fields: event_type -> [(column, kind)] in output order
+        compression: Parquet codec ('zstd', 'snappy', 'gzip', 'brotli', 'lz4', 'none')
+        row_group_blocks: Blocks covered by one row group
+        amounts: 'decimal' or 'binary' (see module docstring)
+    """
+
+    def __init__(
+        self,
+        paths: Dict[str, str],
+        fields: Dict[str, Sequence[Tuple[str, str]]],
+        compression: str = 'zstd',
+        row_group_blocks: int = 10_000,
+        amounts: str = 'decimal',
+    ):
+        if amounts not in ('decimal', 'binary'):
+            raise ValueError(f"PARQUET_AMOUNTS must be 'decimal' or 'binary', got {amounts!r}")
+        self.pa, self.pq = import_pyarrow()
+        self.paths = paths
+        self.fields = fields
+        self.compression = None if compression == 'none' else compression
+        self.row_group_blocks = max(1, row_group_blocks)
+        self.amounts = amounts
+        self.schemas = {event_type: arrow_schema(columns, amounts) for event_type, columns in fields.items()}
+        self.rows = {event_type: 0 for event_type in fields}
+        self.row_groups = 0
+        self._buffers = {event_type: [] for event_type in fields}
+        self._group_start = None
+        self._writers = {}
+
+    def write(self, events: EventBatch, start_block: int, end_block: int) -> None:
+        """
+        Buffer the events of blocks [start_block, end_block]; a row group is written once it spans row_group_blocks.
+
+        Args:
+            events: Decoded events (with an event_type column)
+            start_block: First block of the chunk
+            end_block: Last block of the chunk
+        """
+        if self._group_start is None:
+            self._group_start = start_block
+        if len(events):
+            codes = events.array('event_type')
+            for code, event_type in enumerate(events.categories('event_type')):
+                selected = codes == code
+                if not selected.any():
+                    continue
+                if event_type not in self._buffers:
+                    raise ValueError(f"No Parquet schema for event type {event_type!r}")
+                self._buffers[event_type].append(events.take(selected))
+        if (
+            end_block - self._group_start + 1 >= self.row_group_blocks
+            or any(sum(map(len, parts)) >= MAX_ROW_GROUP_ROWS for parts in self._buffers.values())
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered events as one row group per event type."""
+        for event_type, parts in self._buffers.items():
+            if not parts:
+                continue
+            rows = EventBatch.concat(parts[0].fields, parts)
+            columns = [
+                _column(self.pa, rows, name, kind, self.amounts) for name, kind in self.fields[event_type]
+            ]
+            table = self.pa.Table.from_arrays(columns, schema=self.schemas[event_type])
+            self._writer(event_type).write_table(table, row_group_size=len(rows))
+            self.rows[event_type] += len(rows)
+            self.row_groups += 1
+            self._buffers[event_type] = []
+        self._group_start = None
+
+    def _writer(self, event_type: str):
+        writer = self._writers.get(event_type)
+        if writer is None:
+            path = self.paths[event_type]
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            writer = self.pq.ParquetWriter(
+                f"{path}.tmp", self.schemas[event_type], compression=self.compression
+            )
+            self._writers[event_type] = writer
+        return writer
+
+    def close(self) -> Dict[str, str]:
+        """
+        Flush, finish the files and move them into place.
+
+        Returns:
+            dict: event_type -> path of every file written (types without events get no file,
+                and a file left from an earlier run is removed)
+        """
+        self.flush()
+        written = {}
+        for event_type, path in self.paths.items():
+            writer = self._writers.get(event_type)
+            if writer is None:
+                if os.path.isfile(path):
+                    os.remove(path)
+                continue
+            writer.close()
+            os.replace(f"{path}.tmp", path)
+            written[event_type] = path
+        self._writers = {}
+        return written
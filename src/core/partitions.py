@@ -0,0 +1,386 @@
+"""
+Hive-partitioned event datasets (--layout partitioned).
+
+Events are written under
+
+    {root}/event_type={type}/block_bucket={first block}/[pair_bucket={n}/]part-{start}-{end}.{csv|parquet}
+
+where block buckets are PARTITION_BLOCKS blocks wide, the optional pair
+bucket is crc32(pair address) % PARTITION_PAIR_BUCKETS, and {start}-{end}
+is the block range of the run that wrote the file. Every finished file is
+listed in {root}/_manifest.json with its partition keys, min/max block, row
+count and the set of pair/pool addresses it contains (the manifest also
+holds the bucket sizes and the columns of every event type); read_events()
+uses the manifest to open only the files a query can match.
+
+Files are written under a temporary name and only become part of the
+dataset once they are renamed and listed in the manifest, so an interrupted
+run leaves no partial data behind. A new run replaces the files of earlier
+runs that lie entirely inside its block range and refuses partial overlaps;
+the replaced files stay listed until the run closes, so a run that fails
+keeps the earlier data (re-running the range then replaces both).
+"""
+
+import json
+import os
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.core.addresses import to_address_bytes, to_checksum_address
+from src.core.checkpoint import atomic_write_json
+from src.core.csv_writer import format_rows, header_line
+from src.core.event_batch import EventBatch
+
+
+MANIFEST = '_manifest.json'
+
+
+def pair_bucket(address, buckets: int) -> int:
+    """Hash bucket of a pair/pool address (stable across processes and runs)."""
+    return zlib.crc32(to_address_bytes(address)) % buckets
+
+
+def load_manifest(root: str) -> Optional[dict]:
+    """Manifest of the dataset at `root`, or None if nothing was written there yet."""
+    path = os.path.join(root, MANIFEST)
+    if not os.path.isfile(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class _CsvPartFile:
+    """Rows of one partition appended to a CSV with only the columns of its event type."""
+
+    def __init__(self, path: str, columns: Sequence[str]):
+        self.path = path
+        self.columns = list(columns)
+        with open(f"{path}.tmp", 'wb') as f:
+            f.write(header_line(self.columns))
+
+    def write(self, events: EventBatch, start_block: int, end_block: int) -> None:
+        data = {column: events.formatted_column(column) for column in self.columns}
+        with open(f"{self.path}.tmp", 'ab') as f:
+            f.write(format_rows(data, self.columns))
+
+    def close(self) -> None:
+        os.replace(f"{self.path}.tmp", self.path)
+
+
+class _ParquetPartFile:
+    """Rows of one partition written as typed Parquet (see src.core.parquet_sink)."""
+
+    def __init__(self, path: str, event_type: str, fields: Sequence[Tuple[str, str]], config: dict):
+        from src.core.parquet_sink import ParquetEventWriter
+
+        self.path = path
+        # Written to {path}.tmp and renamed on close
+        self._writer = ParquetEventWriter(
+            {event_type: path},
+            {event_type: fields},
+            compression=config['PARQUET_COMPRESSION'],
+            row_group_blocks=config['PARQUET_ROW_GROUP_BLOCKS'],
+            amounts=config['PARQUET_AMOUNTS'],
+        )
+
+    def write(self, events: EventBatch, start_block: int, end_block: int) -> None:
+        self._writer.write(events, start_block, end_block)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class PartitionedEventWriter:
+    """
+    Writes streamed events into a partitioned dataset and keeps its manifest.
+
+    Args:
+        root: Dataset directory (e.g. data/uniswap_v2/events)
+        fields: event_type -> [(column, kind)] (column order; kinds are used for Parquet)
+        pair_column: Address column partitions are hashed and indexed by ('pair_address' / 'pool_address')
+        start_block: First block of the run
+        end_block: Last block of the run
+        config: Configuration (OUTPUT_FORMAT, PARTITION_BLOCKS, PARTITION_PAIR_BUCKETS, PARQUET_*)
+
+    Raises:
+        ValueError: The dataset uses other bucket sizes, or a file of an earlier
+            run partly overlaps [start_block, end_block]
+    """
+
+    def __init__(
+        self,
+        root: str,
+        fields: Dict[str, Sequence[Tuple[str, str]]],
+        pair_column: str,
+        start_block: int,
+        end_block: int,
+        config: dict,
+    ):
+        self.root = root
+        self.fields = fields
+        self.pair_column = pair_column
+        self.start_block = start_block
+        self.end_block = end_block
+        self.config = config
+        self.format = config['OUTPUT_FORMAT']
+        self.bucket_blocks = max(1, config['PARTITION_BLOCKS'])
+        self.pair_buckets = max(0, config['PARTITION_PAIR_BUCKETS'])
+        self.rows = {event_type: 0 for event_type in fields}
+        self.files_written = 0
+        self._open = {}
+        self._replaced = []
+        self.manifest = self._prepare_manifest()
+
+    def _prepare_manifest(self) -> dict:
+        manifest = load_manifest(self.root)
+        if manifest is None:
+            return {
+                'pair_column': self.pair_column,
+                'bucket_blocks': self.bucket_blocks,
+                'pair_buckets': self.pair_buckets,
+                'columns': {event_type: [name for name, _ in columns] for event_type, columns in self.fields.items()},
+                'files': [],
+            }
+        if manifest['bucket_blocks'] != self.bucket_blocks or manifest['pair_buckets'] != self.pair_buckets:
+            raise ValueError(
+                f"{self.root} is partitioned by {manifest['bucket_blocks']} blocks / {manifest['pair_buckets']} pair buckets, "
+                f"not {self.bucket_blocks} / {self.pair_buckets} (PARTITION_BLOCKS / PARTITION_PAIR_BUCKETS)"
+            )
+        replaced = []
+        for entry in manifest['files']:
+            run_start, run_end = entry['run']
+            if run_end < self.start_block or run_start > self.end_block:
+                continue
+            if run_start >= self.start_block and run_end <= self.end_block:
+                replaced.append(entry)
+            else:
+                raise ValueError(
+                    f"{entry['path']} was written for blocks {run_start}-{run_end}, which partly overlaps "
+                    f"{self.start_block}-{self.end_block}; re-run a range that covers it entirely or does not touch it"
+                )
+        if replaced:
+            print(f"Replacing {len(replaced)} partition files of earlier runs inside blocks {self.start_block}-{self.end_block}")
+        # Dropped from the manifest and deleted in close(), once the new files are in place
+        self._replaced = replaced
+        return manifest
+
+    def _open_file(self, key: tuple) -> dict:
+        event_type, bucket, hashed = key
+        directory = f"event_type={event_type}/block_bucket={bucket}"
+        if hashed is not None:
+            directory += f"/pair_bucket={hashed}"
+        relpath = f"{directory}/part-{self.start_block}-{self.end_block}.{self.format}"
+        path = os.path.join(self.root, relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self.format == 'parquet':
+            part = _ParquetPartFile(path, event_type, self.fields[event_type], self.config)
+        else:
+            part = _CsvPartFile(path, [name for name, _ in self.fields[event_type]])
+        return {
+            'file': part, 'relpath': relpath,
+            'rows': 0, 'min_block': None, 'max_block': None, 'pairs': set(),
+        }
+
+    def write(self, events: EventBatch, start_block: int, end_block: int) -> None:
+        """
+        Route the events of blocks [start_block, end_block] to their partitions.
+
+        Partitions whose block bucket ends at or before end_block are finished
+        (renamed and added to the manifest).
+        """
+        if len(events):
+            blocks = events.array('block_number')
+            keys = [events.array('event_type'), blocks - blocks % self.bucket_blocks]
+            if self.pair_buckets:
+                addresses = events.column(self.pair_column)
+                hashed = {address: pair_bucket(address, self.pair_buckets) for address in set(addresses)}
+                keys.append(np.array([hashed[address] for address in addresses], dtype=np.int64))
+            groups, inverse = np.unique(np.stack(keys, axis=1), axis=0, return_inverse=True)
+            inverse = inverse.ravel()
+            event_types = events.categories('event_type')
+            for group, values in enumerate(groups.tolist()):
+                rows = events.take(inverse == group)
+                key = (event_types[values[0]], values[1], values[2] if self.pair_buckets else None)
+                state = self._open.get(key)
+                if state is None:
+                    state = self._open[key] = self._open_file(key)
+                state['file'].write(rows, start_block, end_block)
+                state['rows'] += len(rows)
+                group_blocks = rows.array('block_number')
+                low, high = int(group_blocks.min()), int(group_blocks.max())
+                state['min_block'] = low if state['min_block'] is None else min(state['min_block'], low)
+                state['max_block'] = high if state['max_block'] is None else max(state['max_block'], high)
+                state['pairs'].update(to_checksum_address(address) for address in set(rows.column(self.pair_column)))
+        self._finish(lambda bucket: bucket + self.bucket_blocks - 1 <= end_block)
+
+    def _finish(self, done: Callable[[int], bool]) -> None:
+        finished = [key for key in self._open if done(key[1])]
+        if not finished:
+            return
+        for key in finished:
+            state = self._open.pop(key)
+            state['file'].close()
+            # A replaced file at the same path (same run range) was just overwritten by the rename
+            self._drop_replaced(lambda entry: entry['path'] == state['relpath'])
+            event_type, bucket, hashed = key
+            self.manifest['files'].append({
+                'path': state['relpath'],
+                'format': self.format,
+                'event_type': event_type,
+                'block_bucket': bucket,
+                'pair_bucket': hashed,
+                'run': [self.start_block, self.end_block],
+                'min_block': state['min_block'],
+                'max_block': state['max_block'],
+                'rows': state['rows'],
+                'pairs': sorted(state['pairs']),
+                'written_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            })
+            self.rows[event_type] += state['rows']
+            self.files_written += 1
+        self.manifest['files'].sort(key=lambda entry: (entry['event_type'], entry['block_bucket'], entry['path']))
+        atomic_write_json(os.path.join(self.root, MANIFEST), self.manifest)
+
+    def _drop_replaced(self, match: Callable[[dict], bool]) -> List[dict]:
+        """Remove the replaced entries `match` selects from the manifest (not written yet) and return them."""
+        dropped = [entry for entry in self._replaced if match(entry)]
+        if dropped:
+            self._replaced = [entry for entry in self._replaced if not match(entry)]
+            ids = {id(entry) for entry in dropped}
+            self.manifest['files'] = [entry for entry in self.manifest['files'] if id(entry) not in ids]
+        return dropped
+
+    def close(self) -> None:
+        """Finish every open partition, then drop and delete the files of earlier runs this run replaced."""
+        self._finish(lambda bucket: True)
+        dropped = self._drop_replaced(lambda entry: True)
+        if not dropped:
+            return
+        atomic_write_json(os.path.join(self.root, MANIFEST), self.manifest)
+        current = {entry['path'] for entry in self.manifest['files']}
+        for entry in dropped:
+            path = os.path.join(self.root, entry['path'])
+            if entry['path'] not in current and os.path.isfile(path):
+                os.remove(path)
+
+
+def select_partitions(
+    root: str,
+    event_types: Optional[Sequence[str]] = None,
+    start_block: Optional[int] = None,
+    end_block: Optional[int] = None,
+    pairs: Optional[Sequence[str]] = None,
+) -> List[dict]:
+    """
+    Manifest entries of the files that can contain matching events.
+
+    Args:
+        root: Dataset directory
+        event_types: Event types to read (None = all)
+        start_block: First block of interest (None = unbounded)
+        end_block: Last block of interest (None = unbounded)
+        pairs: Pair/pool addresses of interest (None = all)
+
+    Returns:
+        List of manifest entries, ordered by event type and block bucket
+    """
+    manifest = load_manifest(root)
+    if manifest is None:
+        return []
+    wanted = {to_checksum_address(pair) for pair in pairs} if pairs is not None else None
+    buckets = (
+        {pair_bucket(pair, manifest['pair_buckets']) for pair in wanted}
+        if wanted is not None and manifest['pair_buckets'] else None
+    )
+    selected = []
+    for entry in manifest['files']:
+        if event_types is not None and entry['event_type'] not in event_types:
+            continue
+        if start_block is not None and entry['max_block'] < start_block:
+            continue
+        if end_block is not None and entry['min_block'] > end_block:
+            continue
+        if buckets is not None and entry['pair_bucket'] not in buckets:
+            continue
+        if wanted is not None and wanted.isdisjoint(entry['pairs']):
+            continue
+        selected.append(entry)
+    return selected
+
+
+def _read_file(root: str, entry: dict, pair_column: str, start_block, end_block, wanted, columns) -> pd.DataFrame:
+    path = os.path.join(root, entry['path'])
+    if entry['format'] == 'parquet':
+        from src.core.parquet_sink import import_pyarrow
+
+        pa, pq = import_pyarrow()
+        import pyarrow.dataset as ds
+
+        condition = None
+        if start_block is not None:
+            condition = ds.field('block_number') >= start_block
+        if end_block is not None:
+            bound = ds.field('block_number') <= end_block
+            condition = bound if condition is None else condition & bound
+        if wanted is not None:
+            match = ds.field(pair_column).isin(pa.array([to_address_bytes(p) for p in wanted], pa.binary(20)))
+            condition = match if condition is None else condition & match
+        return ds.dataset(path, format='parquet').to_table(columns=columns, filter=condition).to_pandas()
+
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    for column in ('block_number', 'log_index'):
+        df[column] = df[column].astype('int64')
+    if start_block is not None:
+        df = df[df['block_number'] >= start_block]
+    if end_block is not None:
+        df = df[df['block_number'] <= end_block]
+    if wanted is not None:
+        df = df[df[pair_column].isin(wanted)]
+    return df[columns] if columns is not None else df
+
+
+def read_events(
+    root: str,
+    event_type: str,
+    start_block: Optional[int] = None,
+    end_block: Optional[int] = None,
+    pairs: Optional[Sequence[str]] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Events of one type from a partitioned dataset, opening only the files the query needs.
+
+    CSV partitions are returned as strings (block_number/log_index as int64),
+    Parquet partitions with their typed columns (addresses and hashes as bytes).
+
+    Args:
+        root: Dataset directory (e.g. data/uniswap_v2/events)
+        event_type: Event type (e.g. 'swap')
+        start_block: First block (inclusive, None = unbounded)
+        end_block: Last block (inclusive, None = unbounded)
+        pairs: Only events of these pair/pool addresses (None = all)
+        columns: Columns to return (None = all)
+
+    Returns:
+        pd.DataFrame: Matching events ordered by (block_number, log_index)
+    """
+    manifest = load_manifest(root)
+    entries = select_partitions(root, [event_type], start_block, end_block, pairs)
+    if not entries:
+        empty = columns if columns is not None else (manifest or {}).get('columns', {}).get(event_type, [])
+        return pd.DataFrame(columns=list(empty))
+    wanted = [to_checksum_address(pair) for pair in pairs] if pairs is not None else None
+    read_columns = None
+    if columns is not None:
+        read_columns = list(dict.fromkeys(list(columns) + ['block_number', 'log_index']))
+    frames = [
+        _read_file(root, entry, manifest['pair_column'], start_block, end_block, wanted, read_columns)
+        for entry in entries
+    ]
+    df = pd.concat(frames, ignore_index=True).sort_values(['block_number', 'log_index'], kind='stable')
+    df = df.reset_index(drop=True)
+    return df[list(columns)] if columns is not None else df
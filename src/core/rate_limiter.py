@@ -0,0 +1,133 @@
+"""Shared token-bucket rate limiter for all RPC calls (threads and asyncio)."""
+
+import asyncio
+import threading
+import time
+from typing import Iterable
+
+
+# Provider compute units per call (Alchemy pricing); used when the limit is in CU/s
+METHOD_COMPUTE_UNITS = {
+    'eth_blockNumber': 10,
+    'eth_chainId': 0,
+    'net_version': 0,
+    'eth_getLogs': 75,
+    'eth_getBlockByNumber': 16,
+    'eth_getBlockReceipts': 500,
+    'eth_getTransactionByHash': 17,
+    'eth_getTransactionReceipt': 15,
+}
+DEFAULT_COMPUTE_UNITS = 20
+
+RATE_LIMIT_UNITS = ('rps', 'cu')
+
+
+class TokenBucket:
+    """
+    Token bucket with per-method costs.
+
+    Callers reserve tokens up front: the bucket may go negative and each caller
+    waits until its own reservation is covered, so concurrent callers queue up
+    fairly without holding the lock while sleeping. The same instance can be
+    used from worker threads (acquire) and from asyncio tasks (acquire_async).
+
+    Args:
+        rate: Tokens added per second (requests/s or compute units/s)
+        capacity: Maximum burst size in tokens (default: one second worth of tokens)
+        costs: Cost per JSON-RPC method; methods not listed cost `default_cost`
+        default_cost: Cost of a method missing from `costs`
+    """
+
+    def __init__(self, rate: float, capacity: float = None, costs: dict = None, default_cost: float = 1.0):
+        if rate <= 0:
+            raise ValueError(f"Rate limit must be positive, got: {rate}")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else self.rate
+        self.costs = costs or {}
+        self.default_cost = default_cost
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def cost(self, method: str) -> float:
+        """Token cost of one call of `method`."""
+        return self.costs.get(method, self.default_cost)
+
+    def _reserve(self, tokens: float) -> float:
+        """Take `tokens` from the bucket and return how long the caller must wait for them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self, method: str) -> None:
+        """Block the calling thread until one call of `method` is allowed."""
+        wait = self._reserve(self.cost(method))
+        if wait > 0:
+            time.sleep(wait)
+
+    def acquire_many(self, methods: Iterable[str]) -> None:
+        """Block until a JSON-RPC batch containing `methods` is allowed."""
+        wait = self._reserve(sum(self.cost(method) for method in methods))
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, method: str) -> None:
+        """Suspend the calling task until one call of `method` is allowed."""
+        wait = self._reserve(self.cost(method))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_limiter = None
+
+
+def configure_rate_limiter(rate: float, unit: str = 'rps', burst: float = None) -> TokenBucket:
+    """
+    Install the process-wide limiter used by every RPC call.
+
+    Args:
+        rate: Requests per second ('rps') or compute units per second ('cu'); 0 disables limiting
+        unit: 'rps' (every call costs 1) or 'cu' (per-method compute units)
+        burst: Bucket capacity in the same unit (default: one second worth)
+
+    Returns:
+        TokenBucket or None if limiting is disabled
+    """
+    global _limiter
+    if unit not in RATE_LIMIT_UNITS:
+        raise ValueError(f"Rate limit unit must be one of {RATE_LIMIT_UNITS}, got: {unit}")
+    if not rate or rate <= 0:
+        _limiter = None
+    elif unit == 'cu':
+        _limiter = TokenBucket(rate, burst, METHOD_COMPUTE_UNITS, DEFAULT_COMPUTE_UNITS)
+    else:
+        _limiter = TokenBucket(rate, burst)
+    return _limiter
+
+
+def get_rate_limiter() -> TokenBucket:
+    """The process-wide limiter, or None if RPC calls are not limited."""
+    return _limiter
+
+
+def rate_limit_middleware(make_request, w3):
+    """Web3 middleware: take tokens from the shared limiter before every request."""
+    def middleware(method, params):
+        limiter = _limiter
+        if limiter is not None:
+            limiter.acquire(method)
+        return make_request(method, params)
+    return middleware
+
+
+async def async_rate_limit_middleware(make_request, async_w3):
+    """AsyncWeb3 middleware: take tokens from the shared limiter before every request."""
+    async def middleware(method, params):
+        limiter = _limiter
+        if limiter is not None:
+            await limiter.acquire_async(method)
+        return await make_request(method, params)
+    return middleware
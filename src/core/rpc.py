@@ -0,0 +1,387 @@
+"""RPC connection utilities for Web3 (sync and asyncio transports)."""
+
+import asyncio
+import re
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Tuple
+
+import aiohttp
+import requests
+from tqdm import tqdm
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
+
+from src.core.endpoint_pool import AsyncMultiEndpointProvider, MultiEndpointProvider, split_rpc_urls
+from src.core.rate_limiter import async_rate_limit_middleware, get_rate_limiter, rate_limit_middleware
+from src.core.rpc_cache import async_rpc_cache_middleware, get_rpc_cache, rpc_cache_middleware
+from src.core.rpc_recorder import async_rpc_record_middleware, get_rpc_recorder, rpc_record_middleware
+
+
+# Errors worth retrying with backoff (rate limits, transient provider failures)
+_RETRYABLE_MARKERS = ('429', 'Too Many Requests', '-32603', 'temporarily unavailable')
+_RETRYABLE_EXCEPTIONS = (
+    asyncio.TimeoutError,
+    TimeoutError,
+    ConnectionError,
+    aiohttp.ClientConnectionError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+# eth_getLogs responses that are too large for the provider (split the range and retry)
+_TOO_MANY_RESULTS_MARKERS = ('-32005', 'Log response size exceeded', 'query returned more than')
+
+# "... this block range should work: [0x1, 0x2]" (Alchemy-style -32005 message)
+_SUGGESTED_RANGE_RE = re.compile(r'\[(0x[0-9a-fA-F]+),\s*(0x[0-9a-fA-F]+)\]')
+
+# One requests.Session per thread for JSON-RPC batch arrays (keep-alive, thread-safe)
+_thread_local = threading.local()
+
+
+def get_web3(rpc_url: str) -> Web3:
+    """
+    Create and return a Web3 instance connected to the specified RPC URL.
+
+    Several comma-separated URLs (RPC_URLS) give a Web3 instance backed by a
+    health-weighted endpoint pool with failover (see src.core.endpoint_pool).
+
+    Args:
+        rpc_url: The RPC endpoint URL to connect to, or a comma-separated list of URLs
+
+    Returns:
+        Web3: Connected Web3 instance
+
+    Raises:
+        ConnectionError: If unable to connect to the RPC endpoint
+    """
+    urls = split_rpc_urls(rpc_url)
+    provider = MultiEndpointProvider(urls) if len(urls) > 1 else Web3.HTTPProvider(urls[0] if urls else rpc_url)
+    w3 = Web3(provider)
+    # Innermost layers (outer to inner): the recorder sees every raw response,
+    # cache hits are answered before the limiter, and every request that
+    # reaches the provider is charged to the shared limiter
+    w3.middleware_onion.inject(rpc_record_middleware, 'rpc_record', layer=0)
+    w3.middleware_onion.inject(rpc_cache_middleware, 'rpc_cache', layer=0)
+    w3.middleware_onion.inject(rate_limit_middleware, 'rate_limit', layer=0)
+
+    # Some RPC providers may return False for is_connected() but still work
+    # Try an actual RPC call to verify connection
+    if not w3.is_connected():
+        try:
+            # Verify with actual RPC call
+            w3.eth.block_number
+        except Exception:
+            raise ConnectionError(f"Failed to connect to RPC endpoint: {rpc_url}")
+
+    return w3
+
+
+def get_latest_block(w3: Web3) -> int:
+    """
+    Get the latest block number from the blockchain.
+
+    Args:
+        w3: Connected Web3 instance
+
+    Returns:
+        int: The latest block number
+    """
+    return w3.eth.block_number
+
+
+def is_retryable_error(e: Exception) -> bool:
+    """True for rate-limit and transient provider errors that should be retried with backoff."""
+    if isinstance(e, _RETRYABLE_EXCEPTIONS):
+        return True
+    error_str = str(e)
+    return any(marker in error_str for marker in _RETRYABLE_MARKERS)
+
+
+def get_rpc_error(e: Exception) -> dict:
+    """JSON-RPC error object ({'code', 'message', 'data'}) carried by a Web3 exception, or {}."""
+    return e.args[0] if e.args and isinstance(e.args[0], dict) else {}
+
+
+def is_too_many_results_error(e: Exception) -> bool:
+    """True for -32005 / 'response size exceeded' eth_getLogs errors (too many results for the range)."""
+    error_str = str(e)
+    return get_rpc_error(e).get('code') == -32005 or any(marker in error_str for marker in _TOO_MANY_RESULTS_MARKERS)
+
+
+def get_suggested_range(e: Exception):
+    """
+    Block range the provider suggests in a -32005 error, if any.
+
+    Handles both the structured form (error.data = {'from': ..., 'to': ...}) and
+    the textual one ("... this block range should work: [0x..., 0x...]").
+
+    Returns:
+        tuple (from_block, to_block) or None
+    """
+    data = get_rpc_error(e).get('data')
+    if isinstance(data, dict) and 'from' in data and 'to' in data:
+        suggested = [data['from'], data['to']]
+    else:
+        match = _SUGGESTED_RANGE_RE.search(str(e))
+        if not match:
+            return None
+        suggested = [match.group(1), match.group(2)]
+    try:
+        return tuple(int(value, 16) if isinstance(value, str) else int(value) for value in suggested)
+    except (TypeError, ValueError):
+        return None
+
+
+def _http_session() -> requests.Session:
+    """Per-thread keep-alive session used for batch requests."""
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = _thread_local.session = requests.Session()
+    return session
+
+
+def _post_batch(url: str, payload: list, timeout: float):
+    """POST a JSON-RPC batch array to one endpoint and return the decoded body."""
+    response = _http_session().post(url, json=payload, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def make_batch_request(w3: Web3, calls: List[Tuple[str, list]], timeout: float = 60.0) -> List[dict]:
+    """
+    Send several JSON-RPC calls as a single batch array to the provider of `w3`.
+
+    Calls answered by the RPC cache are not sent; the rest of the batch is
+    charged to the shared rate limiter (sum of per-method costs) and its final
+    results are stored in the cache. With an endpoint pool, a batch rejected by one endpoint (429/5xx, connection
+    error) is resent to another one.
+
+    Args:
+        w3: Web3 instance with an HTTP provider
+        calls: (method, params) pairs
+        timeout: HTTP timeout in seconds
+
+    Returns:
+        List[dict]: Raw JSON-RPC response objects ('result' or 'error'), in the order of `calls`
+
+    Raises:
+        requests.HTTPError: If the whole batch was rejected (e.g. HTTP 429)
+        ValueError: If the provider answered the batch with a single error object
+    """
+    cached = {}
+    cache = get_rpc_cache()
+    if cache is not None:
+        if cache.needs_head():
+            cache.set_head(w3.eth.block_number)
+        for request_id, (method, params) in enumerate(calls):
+            if cache.is_final_request(method, params):
+                found, result = cache.get(method, params)
+                if found:
+                    cached[request_id] = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+        if len(cached) == len(calls):
+            return [cached[request_id] for request_id in range(len(calls))]
+
+    payload = [
+        {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}
+        for request_id, (method, params) in enumerate(calls)
+        if request_id not in cached
+    ]
+    limiter = get_rate_limiter()
+    if limiter is not None:
+        limiter.acquire_many(item['method'] for item in payload)
+    pool = getattr(w3.provider, 'endpoint_pool', None)
+    if pool is not None:
+        body = pool.call_with_failover(lambda url: _post_batch(url, payload, timeout))
+    else:
+        body = _post_batch(w3.provider.endpoint_uri, payload, timeout)
+    if not isinstance(body, list):
+        # Batch-level failure (batching unsupported, rate limited, ...)
+        raise ValueError(body.get('error', body) if isinstance(body, dict) else body)
+
+    by_id = {item.get('id'): item for item in body if isinstance(item, dict)}
+    if cache is not None:
+        for item in payload:
+            response = by_id.get(item['id'])
+            if response is not None and 'error' not in response:
+                cache.put(item['method'], item['params'], response.get('result'))
+    by_id.update(cached)
+    recorder = get_rpc_recorder()
+    if recorder is not None:
+        for request_id, (method, params) in enumerate(calls):
+            recorder.record(method, params, by_id.get(request_id))
+    missing = {'error': {'code': -32603, 'message': 'No response for request in batch'}}
+    return [by_id.get(request_id, missing) for request_id in range(len(calls))]
+
+
+def batch_call(
+    w3: Web3,
+    calls: List[Tuple[str, list]],
+    batch_size: int = 50,
+    max_retries: int = 5,
+    desc: str = "Batched RPC calls",
+) -> list:
+    """
+    Execute many JSON-RPC calls as batch arrays of `batch_size`, retrying per element.
+
+    Elements that fail with a retryable error (rate limit, transient provider
+    error) are resent in the next round with exponential backoff; the rest of
+    the batch keeps its results. Elements that fail permanently are reported and
+    left as None.
+
+    Args:
+        w3: Web3 instance with an HTTP provider
+        calls: (method, params) pairs
+        batch_size: Number of calls per batch array
+        max_retries: Maximum attempts per element
+        desc: tqdm progress bar label
+
+    Returns:
+        list: Raw `result` of each call (None on failure), in the order of `calls`
+    """
+    results = [None] * len(calls)
+    batch_size = max(1, batch_size)
+
+    with tqdm(total=len(calls), desc=desc, unit="call") as pbar:
+        for offset in range(0, len(calls), batch_size):
+            pending = list(range(offset, min(offset + batch_size, len(calls))))
+
+            for attempt in range(max_retries):
+                last_attempt = attempt + 1 >= max_retries
+                try:
+                    responses = make_batch_request(w3, [calls[i] for i in pending])
+                except Exception as e:
+                    if last_attempt or not is_retryable_error(e):
+                        print(f"\nBatch of {len(pending)} {calls[pending[0]][0]} calls failed: {e}")
+                        pbar.update(len(pending))
+                        break
+                    wait = 2 ** (attempt + 1)
+                    print(f"\nRetryable batch error, waiting {wait}s before retry {attempt + 1}/{max_retries}")
+                    time.sleep(wait)
+                    continue
+
+                retry = []
+                for i, response in zip(pending, responses):
+                    error = response.get('error')
+                    if error is None:
+                        results[i] = response.get('result')
+                        pbar.update(1)
+                    elif not last_attempt and any(marker in str(error) for marker in _RETRYABLE_MARKERS):
+                        retry.append(i)
+                    else:
+                        method, params = calls[i]
+                        print(f"\nError in batched {method} {params}: {error}")
+                        pbar.update(1)
+
+                pending = retry
+                if not pending:
+                    break
+                wait = 2 ** (attempt + 1)
+                print(f"\n{len(pending)} batched calls rate limited, waiting {wait}s before retry {attempt + 1}/{max_retries}")
+                time.sleep(wait)
+
+    return results
+
+
+@asynccontextmanager
+async def open_async_web3(
+    rpc_url: str,
+    max_connections: int = 100,
+    keepalive_timeout: float = 30.0,
+    request_timeout: float = 60.0,
+) -> AsyncIterator[AsyncWeb3]:
+    """
+    Open an AsyncWeb3 instance backed by a pooled keep-alive aiohttp session.
+
+    The session is bounded to `max_connections` sockets and is closed on exit,
+    so the instance must only be used inside the `async with` block (and on the
+    event loop that opened it).
+
+    Args:
+        rpc_url: The RPC endpoint URL to connect to, or a comma-separated list of URLs
+        max_connections: Maximum number of simultaneous connections in the pool
+        keepalive_timeout: Seconds an idle connection is kept open for reuse
+        request_timeout: Total timeout for a single request in seconds
+
+    Yields:
+        AsyncWeb3: Instance whose provider reuses the pooled session
+    """
+    connector = aiohttp.TCPConnector(limit=max_connections, keepalive_timeout=keepalive_timeout)
+    timeout = aiohttp.ClientTimeout(total=request_timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        urls = split_rpc_urls(rpc_url)
+        provider = AsyncMultiEndpointProvider(urls) if len(urls) > 1 else AsyncHTTPProvider(urls[0] if urls else rpc_url)
+        await provider.cache_async_session(session)
+        w3 = AsyncWeb3(provider)
+        w3.middleware_onion.inject(async_rpc_record_middleware, 'rpc_record', layer=0)
+        w3.middleware_onion.inject(async_rpc_cache_middleware, 'rpc_cache', layer=0)
+        w3.middleware_onion.inject(async_rate_limit_middleware, 'rate_limit', layer=0)
+        yield w3
+
+
+async def _call_with_retry_async(call, description: str, max_retries: int):
+    """Await `call()` retrying retryable errors with exponential backoff; re-raise anything else."""
+    for attempt in range(max_retries):
+        try:
+            return await call()
+        except Exception as e:
+            if not is_retryable_error(e) or attempt + 1 >= max_retries:
+                raise
+            wait = 2 ** (attempt + 1)
+            print(f"\nRetryable error for {description}, waiting {wait}s before retry {attempt + 1}/{max_retries}")
+            await asyncio.sleep(wait)
+
+
+async def async_get_logs(w3: AsyncWeb3, filter_params: dict, max_retries: int = 3) -> list:
+    """
+    Async eth_getLogs with retry on rate limits and transient errors.
+
+    Args:
+        w3: AsyncWeb3 instance (see open_async_web3)
+        filter_params: eth_getLogs filter (fromBlock, toBlock, address, topics)
+        max_retries: Maximum attempts for retryable errors
+
+    Returns:
+        list: Raw log dictionaries
+    """
+    description = f"blocks {filter_params.get('fromBlock')}-{filter_params.get('toBlock')}"
+    return await _call_with_retry_async(lambda: w3.eth.get_logs(filter_params), description, max_retries)
+
+
+async def async_get_block(w3: AsyncWeb3, block_number: int, full_transactions: bool = False, max_retries: int = 5) -> dict:
+    """
+    Async eth_getBlockByNumber with retry on rate limits and transient errors.
+
+    Args:
+        w3: AsyncWeb3 instance (see open_async_web3)
+        block_number: Block number to fetch
+        full_transactions: Return full transaction objects instead of hashes
+        max_retries: Maximum attempts for retryable errors
+
+    Returns:
+        dict: Block data
+    """
+    return await _call_with_retry_async(
+        lambda: w3.eth.get_block(block_number, full_transactions),
+        f"block {block_number}",
+        max_retries,
+    )
+
+
+async def async_get_transaction(w3: AsyncWeb3, tx_hash: str, max_retries: int = 5) -> dict:
+    """
+    Async eth_getTransactionByHash with retry on rate limits and transient errors.
+
+    Args:
+        w3: AsyncWeb3 instance (see open_async_web3)
+        tx_hash: Transaction hash (hex string)
+        max_retries: Maximum attempts for retryable errors
+
+    Returns:
+        dict: Transaction data
+    """
+    return await _call_with_retry_async(
+        lambda: w3.eth.get_transaction(tx_hash),
+        f"tx {tx_hash[:18]}...",
+        max_retries,
+    )
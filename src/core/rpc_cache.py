@@ -0,0 +1,279 @@
+"""Persistent on-disk cache of RPC responses for finalized chain data."""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+# Methods whose responses are cached; finality is checked per method (see RPCCache.is_final_request)
+CACHEABLE_METHODS = (
+    'eth_getLogs',
+    'eth_getBlockByNumber',
+    'eth_getBlockReceipts',
+    'eth_getTransactionByHash',
+    'eth_getTransactionReceipt',
+)
+# Methods whose finality can only be judged from the response (blockNumber of the transaction)
+_RESPONSE_FINALITY_METHODS = ('eth_getTransactionByHash', 'eth_getTransactionReceipt')
+
+# How often the chain head is re-read to move the finality boundary (seconds)
+_HEAD_REFRESH_SECONDS = 60.0
+
+
+def json_default(value):
+    """Serialize HexBytes / bytes params as 0x-hex strings."""
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    if hasattr(value, 'hex'):
+        return value.hex()
+    return str(value)
+
+
+def _block_number(value):
+    """Block number from an int / hex string param, or None for tags ('latest', 'safe', ...)."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.startswith('0x'):
+        return int(value, 16)
+    return None
+
+
+def cache_key(method: str, params) -> str:
+    """Content address of a request: sha256 of the method and canonical JSON params."""
+    payload = json.dumps([method, params], sort_keys=True, separators=(',', ':'), default=json_default)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class RPCCache:
+    """
+    SQLite-backed cache of JSON-RPC results, keyed by sha256(method, params).
+
+    Only responses about blocks at least `finality_depth` blocks below the chain
+    head are stored, so cached data never goes stale. The file is capped at
+    `max_bytes` of stored results; least recently used entries are evicted.
+    Safe to share between worker threads and asyncio tasks.
+
+    Args:
+        path: SQLite database file (created with its directory if missing)
+        max_bytes: Size cap for stored results
+        finality_depth: Blocks below the head considered final
+    """
+
+    def __init__(self, path: str, max_bytes: int, finality_depth: int = 64):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.finality_depth = finality_depth
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._safe_block = None
+        self._head_checked = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY, method TEXT NOT NULL, result BLOB NOT NULL,'
+            ' size INTEGER NOT NULL, last_used REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)')
+        self._conn.commit()
+        self._size = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    # --- finality -------------------------------------------------------
+
+    def needs_head(self) -> bool:
+        """True if the chain head should be (re)read before judging finality."""
+        return self._safe_block is None or time.monotonic() - self._head_checked > _HEAD_REFRESH_SECONDS
+
+    def set_head(self, latest_block: int) -> None:
+        """Move the finality boundary to `latest_block - finality_depth`."""
+        with self._lock:
+            self._safe_block = latest_block - self.finality_depth
+            self._head_checked = time.monotonic()
+
+    def is_final_request(self, method: str, params) -> bool:
+        """True if the request refers only to final blocks (decidable before sending it)."""
+        if method not in CACHEABLE_METHODS or self._safe_block is None:
+            return False
+        if method in _RESPONSE_FINALITY_METHODS:
+            return True  # decided from the response in is_final_result
+        if not params:
+            return False
+        if method == 'eth_getLogs':
+            log_filter = params[0] if isinstance(params[0], dict) else {}
+            if 'blockHash' in log_filter:
+                return False
+            to_block = _block_number(log_filter.get('toBlock', 'latest'))
+            return to_block is not None and to_block <= self._safe_block
+        block = _block_number(params[0])
+        return block is not None and block <= self._safe_block
+
+    def is_final_result(self, method: str, result) -> bool:
+        """True if a successful result may be stored (non-empty and, for transactions, mined in a final block)."""
+        if result is None:
+            return False
+        if method in _RESPONSE_FINALITY_METHODS:
+            block = _block_number(result.get('blockNumber')) if isinstance(result, dict) else None
+            return block is not None and self._safe_block is not None and block <= self._safe_block
+        return True
+
+    # --- storage --------------------------------------------------------
+
+    def get(self, method: str, params):
+        """
+        Cached result for a request (counted as a hit or a miss).
+
+        Returns:
+            tuple (found, result)
+        """
+        if method not in CACHEABLE_METHODS:
+            return False, None
+        key = cache_key(method, params)
+        with self._lock:
+            row = self._conn.execute('SELECT result FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._conn.execute('UPDATE responses SET last_used = ? WHERE key = ?', (time.time(), key))
+        return True, json.loads(row[0])
+
+    def put(self, method: str, params, result) -> None:
+        """Store a result if the request and the result are final; evict LRU entries over the size cap."""
+        if not self.is_final_request(method, params) or not self.is_final_result(method, result):
+            return
+        blob = json.dumps(result, separators=(',', ':'), default=json_default).encode()
+        if len(blob) > self.max_bytes:
+            return
+        key = cache_key(method, params)
+        with self._lock:
+            previous = self._conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, method, result, size, last_used) VALUES (?, ?, ?, ?, ?)',
+                (key, method, blob, len(blob), time.time()),
+            )
+            self._size += len(blob) - (previous[0] if previous else 0)
+            self.stores += 1
+            if self._size > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is at 90% of its cap (lock held)."""
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute('SELECT key, size FROM responses ORDER BY last_used').fetchall()
+        evicted = []
+        for key, size in rows:
+            if self._size <= target:
+                break
+            evicted.append((key,))
+            self._size -= size
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', evicted)
+        self.evictions += len(evicted)
+
+    def summary(self) -> str:
+        """One-line hit/miss statistics."""
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return (
+            f"RPC cache: {self.hits} hits, {self.misses} misses ({hit_rate:.1%} hit rate), "
+            f"{self.stores} stored, {self.evictions} evicted, {self._size / 1024 / 1024:.1f} MB in {self.path}"
+        )
+
+    def close(self) -> None:
+        """Flush LRU timestamps and close the database (idempotent)."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+
+_cache = None
+
+
+def configure_rpc_cache(cache_dir: str, max_mb: float, finality_depth: int = 64, enabled: bool = True) -> RPCCache:
+    """
+    Install the process-wide RPC response cache.
+
+    Args:
+        cache_dir: Directory of the cache database (rpc_cache.sqlite)
+        max_mb: Size cap in megabytes
+        finality_depth: Blocks below the head whose data is considered final
+        enabled: False removes the cache
+
+    Returns:
+        RPCCache or None if caching is disabled
+    """
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+    if enabled and max_mb > 0:
+        path = os.path.join(cache_dir, 'rpc_cache.sqlite')
+        _cache = RPCCache(path, int(max_mb * 1024 * 1024), finality_depth)
+        atexit.register(_cache.close)
+    return _cache
+
+
+def get_rpc_cache() -> RPCCache:
+    """The process-wide RPC cache, or None if caching is disabled."""
+    return _cache
+
+
+def _head_from_response(response: dict):
+    result = response.get('result') if isinstance(response, dict) else None
+    return _block_number(result)
+
+
+def rpc_cache_middleware(make_request, w3):
+    """Web3 middleware: answer final-block requests from the cache and store new final responses."""
+    def middleware(method, params):
+        cache = _cache
+        if cache is None or method not in CACHEABLE_METHODS:
+            return make_request(method, params)
+        if cache.needs_head():
+            head = _head_from_response(make_request('eth_blockNumber', []))
+            if head is not None:
+                cache.set_head(head)
+        if not cache.is_final_request(method, params):
+            return make_request(method, params)
+        found, result = cache.get(method, params)
+        if found:
+            return {'jsonrpc': '2.0', 'id': 0, 'result': result}
+        response = make_request(method, params)
+        if 'error' not in response:
+            cache.put(method, params, response.get('result'))
+        return response
+    return middleware
+
+
+async def async_rpc_cache_middleware(make_request, async_w3):
+    """AsyncWeb3 middleware: answer final-block requests from the cache and store new final responses."""
+    async def middleware(method, params):
+        cache = _cache
+        if cache is None or method not in CACHEABLE_METHODS:
+            return await make_request(method, params)
+        if cache.needs_head():
+            head = _head_from_response(await make_request('eth_blockNumber', []))
+            if head is not None:
+                cache.set_head(head)
+        if not cache.is_final_request(method, params):
+            return await make_request(method, params)
+        found, result = cache.get(method, params)
+        if found:
+            return {'jsonrpc': '2.0', 'id': 0, 'result': result}
+        response = await make_request(method, params)
+        if 'error' not in response:
+            cache.put(method, params, response.get('result'))
+        return response
+    return middleware
@@ -0,0 +1,112 @@
+"""Recording of live RPC traffic into replayable JSONL fixtures."""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+from src.core.rpc_cache import json_default
+
+
+# Methods captured into fixtures (what the indexers call)
+RECORDED_METHODS = (
+    'eth_blockNumber',
+    'eth_chainId',
+    'eth_getLogs',
+    'eth_getBlockByNumber',
+    'eth_getBlockReceipts',
+    'eth_getTransactionByHash',
+    'eth_getTransactionReceipt',
+)
+
+
+class RPCRecorder:
+    """
+    Appends successful JSON-RPC exchanges to a JSONL fixture file.
+
+    Each line is {"method": ..., "params": [...], "result": ...}; the file can be
+    replayed by the local stub server (python -m src.core.stub_server).
+
+    Args:
+        record_dir: Directory for fixture files (one file per run)
+    """
+
+    def __init__(self, record_dir: str):
+        os.makedirs(record_dir, exist_ok=True)
+        self.path = os.path.join(record_dir, f"rpc_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.jsonl")
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def record(self, method: str, params, response: dict) -> None:
+        """Write one exchange if it is a successful call of a recorded method."""
+        if method not in RECORDED_METHODS or not isinstance(response, dict) or 'error' in response:
+            return
+        line = json.dumps(
+            {'method': method, 'params': params, 'result': response.get('result')},
+            separators=(',', ':'),
+            default=json_default,
+        )
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + '\n')
+            self.recorded += 1
+
+    def close(self) -> None:
+        """Flush and close the fixture file (idempotent)."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_recorder = None
+
+
+def configure_rpc_recorder(record_dir: str) -> RPCRecorder:
+    """
+    Install the process-wide recorder.
+
+    Args:
+        record_dir: Fixture directory; empty disables recording
+
+    Returns:
+        RPCRecorder or None if recording is disabled
+    """
+    global _recorder
+    if _recorder is not None:
+        _recorder.close()
+    _recorder = None
+    if record_dir:
+        _recorder = RPCRecorder(record_dir)
+        atexit.register(_recorder.close)
+    return _recorder
+
+
+def get_rpc_recorder() -> RPCRecorder:
+    """The process-wide recorder, or None if recording is disabled."""
+    return _recorder
+
+
+def rpc_record_middleware(make_request, w3):
+    """Web3 middleware: write every successful response to the fixture file."""
+    def middleware(method, params):
+        response = make_request(method, params)
+        recorder = _recorder
+        if recorder is not None:
+            recorder.record(method, params, response)
+        return response
+    return middleware
+
+
+async def async_rpc_record_middleware(make_request, async_w3):
+    """AsyncWeb3 middleware: write every successful response to the fixture file."""
+    async def middleware(method, params):
+        response = await make_request(method, params)
+        recorder = _recorder
+        if recorder is not None:
+            recorder.record(method, params, response)
+        return response
+    return middleware
@@ -0,0 +1,206 @@
+"""
+Embedded SQLite store of decoded events (--format sqlite).
+
+One table per dataset holds every event type (the same columns as the CSV
+output). Addresses and transaction hashes are stored as BLOBs (20/32 bytes),
+wide integers as decimal TEXT, block numbers and log indexes as INTEGER.
+
+Rows are inserted in batches, one transaction per streamed chunk, with the
+database in WAL mode. A UNIQUE index on (transaction_hash, log_index) makes
+INSERT OR IGNORE skip events that are already stored, so overlapping runs are
+idempotent. The lookup indexes ((pair_address, block_number, log_index),
+(block_number), (event_type, block_number)) are only created once the first
+bulk load is finished, and are maintained incrementally after that.
+
+The last fully written block of every command is committed in the same
+transaction as the rows, so --resume continues exactly where a run stopped.
+"""
+
+import os
+import sqlite3
+import time
+from typing import Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.core.addresses import to_address_bytes, to_checksum_address
+from src.core.event_batch import _HASH_PREFIX, ADDRESS, AMOUNT, HASH, TEXT, EventBatch
+
+
+def _sql_type(kind: str) -> str:
+    if kind in (ADDRESS, HASH):
+        return 'BLOB'
+    if kind in (AMOUNT, TEXT):
+        return 'TEXT'
+    return 'INTEGER'
+
+
+def _hash_bytes(value) -> bytes:
+    if isinstance(value, bytes):
+        return bytes(value)
+    return bytes.fromhex(value[2:] if value[:2] in ('0x', '0X') else value)
+
+
+class SQLiteEventStore:
+    """
+    Events table in a SQLite database.
+
+    Args:
+        path: Database file
+        table: Table name (e.g. 'pair_events')
+        columns: [(column, kind)] in table order (kinds of src.core.event_batch)
+        pair_column: Address column of the lookup index ('pair_address' / 'pool_address')
+    """
+
+    def __init__(self, path: str, table: str, columns: Sequence[Tuple[str, str]], pair_column: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.table = table
+        self.columns = list(columns)
+        self.pair_column = pair_column
+        self._names = [name for name, _ in self.columns]
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA cache_size=-262144')  # 256 MiB page cache for bulk loads
+        column_sql = ', '.join(f'"{name}" {_sql_type(kind)}' for name, kind in self.columns)
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({column_sql})')
+        self._conn.execute(
+            f'CREATE UNIQUE INDEX IF NOT EXISTS "{table}_key" ON "{table}" (transaction_hash, log_index)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS progress (command TEXT PRIMARY KEY, start_block INTEGER, '
+            'end_block INTEGER, updated_at TEXT)'
+        )
+        placeholders = ', '.join('?' for _ in self._names)
+        self._quoted = ', '.join(f'"{name}"' for name in self._names)
+        self._insert_sql = f'INSERT OR IGNORE INTO "{table}" ({self._quoted}) VALUES ({placeholders})'
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _values(self, events: EventBatch, name: str, kind: str) -> list:
+        """Column values as stored: bytes for addresses/hashes, decimal text for amounts, None for empty cells."""
+        if name not in events.kinds:
+            return [None] * len(events)
+        values = events.column(name)
+        if kind == AMOUNT:
+            return [str(value) if value is not None else None for value in values]
+        return values
+
+    def progress(self, command: str) -> Optional[Tuple[int, int]]:
+        """(start_block, end_block) fully written by `command`, or None."""
+        row = self._conn.execute(
+            'SELECT start_block, end_block FROM progress WHERE command = ?', (command,)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def start(self, command: str, start_block: int) -> None:
+        """Record that `command` starts a run at start_block (nothing written yet)."""
+        self._conn.execute(
+            'INSERT OR REPLACE INTO progress VALUES (?, ?, ?, ?)',
+            (command, start_block, start_block - 1, time.strftime('%Y-%m-%dT%H:%M:%S')),
+        )
+
+    def insert(self, events, command: Optional[str] = None, end_block: Optional[int] = None) -> int:
+        """
+        Insert events in one transaction; events already stored (same transaction_hash, log_index) are skipped.
+
+        Args:
+            events: EventBatch, or decoded event dicts (raw or checksummed addresses)
+            command: Command whose progress is advanced to end_block in the same transaction
+            end_block: Last block of the chunk
+
+        Returns:
+            int: Rows inserted
+        """
+        if not isinstance(events, EventBatch):
+            events = EventBatch.from_events(self.columns, events)
+        rows = zip(*[self._values(events, name, kind) for name, kind in self.columns])
+        before = self._conn.total_changes
+        self._conn.execute('BEGIN')
+        try:
+            self._conn.executemany(self._insert_sql, rows)
+            inserted = self._conn.total_changes - before
+            if command is not None:
+                self._conn.execute(
+                    'UPDATE progress SET end_block = ?, updated_at = ? WHERE command = ?',
+                    (end_block, time.strftime('%Y-%m-%dT%H:%M:%S'), command),
+                )
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        return inserted
+
+    def create_indexes(self) -> None:
+        """Create the lookup indexes (no-op when they exist; run after a bulk load)."""
+        table = self.table
+        self._conn.execute(
+            f'CREATE INDEX IF NOT EXISTS "{table}_pair_block" ON "{table}" ("{self.pair_column}", block_number, log_index)'
+        )
+        self._conn.execute(f'CREATE INDEX IF NOT EXISTS "{table}_block" ON "{table}" (block_number, log_index)')
+        self._conn.execute(f'CREATE INDEX IF NOT EXISTS "{table}_type_block" ON "{table}" (event_type, block_number)')
+        self._conn.execute('ANALYZE')
+
+    def count(self) -> int:
+        return self._conn.execute(f'SELECT COUNT(*) FROM "{self.table}"').fetchone()[0]
+
+    def query(
+        self,
+        pair: Optional[str] = None,
+        start_block: Optional[int] = None,
+        end_block: Optional[int] = None,
+        event_type: Optional[str] = None,
+        transaction_hash: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Events matching all given filters, ordered by (block_number, log_index).
+
+        Addresses are returned checksummed and transaction hashes as hex, like the CSV output;
+        integer columns that are empty for some event types are nullable Int64.
+
+        Args:
+            pair: Pair/pool address
+            start_block: First block (inclusive)
+            end_block: Last block (inclusive)
+            event_type: Event type (e.g. 'swap')
+            transaction_hash: Transaction hash
+            limit: Maximum number of rows
+
+        Returns:
+            pd.DataFrame
+        """
+        conditions, params = [], []
+        if pair is not None:
+            conditions.append(f'"{self.pair_column}" = ?')
+            params.append(to_address_bytes(pair))
+        if start_block is not None:
+            conditions.append('block_number >= ?')
+            params.append(start_block)
+        if end_block is not None:
+            conditions.append('block_number <= ?')
+            params.append(end_block)
+        if event_type is not None:
+            conditions.append('event_type = ?')
+            params.append(event_type)
+        if transaction_hash is not None:
+            conditions.append('transaction_hash = ?')
+            params.append(_hash_bytes(transaction_hash))
+        sql = f'SELECT {self._quoted} FROM "{self.table}"'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY block_number, log_index'
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        rows = self._conn.execute(sql, params).fetchall()
+        df = pd.DataFrame(rows, columns=self._names)
+        for name, kind in self.columns:
+            if kind == ADDRESS:
+                df[name] = df[name].map(lambda value: to_checksum_address(value) if value is not None else None)
+            elif kind == HASH:
+                df[name] = df[name].map(lambda value: _HASH_PREFIX + value.hex() if value is not None else None)
+            elif _sql_type(kind) == 'INTEGER':
+                df[name] = df[name].astype('Int64')  # keeps integers when the column has NULLs
+        return df
@@ -0,0 +1,105 @@
+"""
+Building blocks for the bounded-memory fetch -> enrich -> decode -> write pipeline.
+
+Logs flow through the pipeline in block order as (start_block, end_block, logs)
+windows. A background producer keeps fetching while the consumer decodes and
+writes, but only up to a fixed number of windows ahead (backpressure), and
+windows are grouped into chunks of at most STREAM_BUFFER_EVENTS logs that are
+written out before the next chunk is built. Peak memory is therefore set by
+the buffer size, not by the length of the block range.
+"""
+
+import queue
+import threading
+from typing import Iterable, Iterator, List, Tuple
+
+
+_DONE = object()
+
+
+class _ProducerError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def background_iter(iterable: Iterable, max_ahead: int) -> Iterator:
+    """
+    Iterate over `iterable` in a background thread, at most `max_ahead` items ahead of the consumer.
+
+    Exceptions raised by the producer are re-raised in the consumer. If the
+    consumer stops early, the producer is stopped at its next item.
+
+    Args:
+        iterable: Source (e.g. a generator of fetched windows)
+        max_ahead: Bounded queue size; the producer blocks when it is full
+    """
+    items = queue.Queue(maxsize=max(1, max_ahead))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_ProducerError(e))
+            return
+        put(_DONE)
+
+    thread = threading.Thread(target=produce, name='pipeline-producer', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+
+
+def chunk_windows(
+    windows: Iterable[Tuple[int, int, List[dict]]],
+    max_logs: int,
+    max_blocks: int = 0,
+) -> Iterator[Tuple[int, int, List[dict]]]:
+    """
+    Group consecutive (start_block, end_block, logs) windows into chunks of about `max_logs` logs.
+
+    A chunk is emitted as soon as it holds at least `max_logs` logs (or spans
+    at least `max_blocks` blocks), so it always ends on a window (block)
+    boundary and never splits a transaction.
+
+    Args:
+        windows: Windows in block order
+        max_logs: Logs per chunk (a single larger window is emitted as is)
+        max_blocks: Blocks per chunk, so sparse ranges are still written (and
+            checkpointed) regularly; 0 disables the limit
+
+    Yields:
+        (start_block, end_block, logs) covering consecutive windows
+    """
+    chunk_start = None
+    chunk_end = None
+    chunk = []
+    for start_block, end_block, logs in windows:
+        if chunk_start is None:
+            chunk_start = start_block
+        chunk_end = end_block
+        chunk.extend(logs)
+        if len(chunk) >= max_logs or (max_blocks and chunk_end - chunk_start + 1 >= max_blocks):
+            yield chunk_start, chunk_end, chunk
+            chunk_start, chunk = None, []
+    if chunk_start is not None:
+        yield chunk_start, chunk_end, chunk
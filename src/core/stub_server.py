@@ -0,0 +1,300 @@
+"""
+Local JSON-RPC stub server that replays recorded fixtures.
+
+Serves the JSONL files written with RPC_RECORD_DIR so the indexers can run
+offline. eth_getLogs is answered for any block range from the recorded logs,
+and the server can inject latency, HTTP 429 responses and -32005 "too many
+results" errors to mimic a hosted provider.
+
+Usage:
+    python -m src.core.stub_server --fixtures data/fixtures --port 8545 \\
+        --latency-ms 40 --rate-limit-prob 0.02 --max-logs 10000
+
+    RPC_URL=http://127.0.0.1:8545 python -m src.main index-pair-events
+"""
+
+import argparse
+import bisect
+import glob
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.core.rpc_cache import cache_key
+
+
+# Answers that do not depend on recorded data (connection checks)
+_STATIC_RESULTS = {'web3_clientVersion': 'rpc-stub/1.0', 'eth_chainId': '0x1', 'net_version': '1'}
+
+
+def _to_int(value):
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.startswith('0x'):
+        return int(value, 16)
+    return None
+
+
+class FixtureStore:
+    """
+    Recorded responses indexed for replay.
+
+    Exact (method, params) matches are served as recorded; eth_getLogs is
+    served from a block-ordered index of every recorded log so that any
+    window size can be replayed.
+
+    Args:
+        fixture_dir: Directory with *.jsonl fixture files
+    """
+
+    def __init__(self, fixture_dir: str):
+        self.responses = {}
+        self.head = None
+        logs = {}
+        paths = sorted(glob.glob(os.path.join(fixture_dir, '*.jsonl')))
+        if not paths:
+            raise FileNotFoundError(f"No *.jsonl fixtures found in {fixture_dir}")
+
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    method, params, result = entry['method'], entry['params'], entry['result']
+                    self.responses[cache_key(method, params)] = result
+                    if method == 'eth_blockNumber':
+                        self.head = max(self.head or 0, _to_int(result) or 0)
+                    elif method == 'eth_getLogs':
+                        for log in result or []:
+                            logs[(_to_int(log['blockNumber']), _to_int(log['logIndex']))] = log
+
+        self._log_keys = sorted(logs)
+        self._logs = [logs[key] for key in self._log_keys]
+        self._log_blocks = [block for block, _ in self._log_keys]
+        if self.head is None:
+            self.head = (self._log_blocks[-1] if self._log_blocks else 0) + 1000
+        print(f"Loaded {len(self.responses)} recorded responses and {len(self._logs)} logs from {len(paths)} fixture files")
+
+    def lookup(self, method: str, params):
+        """Recorded result for an exact request: (found, result)."""
+        key = cache_key(method, params)
+        if key in self.responses:
+            return True, self.responses[key]
+        return False, None
+
+    def logs_in_range(self, from_block: int, to_block: int) -> tuple:
+        """Index bounds (start, end) of recorded logs with from_block <= blockNumber <= to_block."""
+        start = bisect.bisect_left(self._log_blocks, from_block)
+        end = bisect.bisect_right(self._log_blocks, to_block)
+        return start, end
+
+    def filter_logs(self, log_filter: dict, start: int, end: int) -> list:
+        """Logs in [start, end) that match the filter's address and topics."""
+        addresses = log_filter.get('address')
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = {a.lower() for a in addresses} if addresses else None
+        topics = log_filter.get('topics') or []
+
+        matched = []
+        for log in self._logs[start:end]:
+            if addresses is not None and log['address'].lower() not in addresses:
+                continue
+            log_topics = log.get('topics', [])
+            ok = True
+            for i, wanted in enumerate(topics):
+                if wanted is None:
+                    continue
+                options = wanted if isinstance(wanted, list) else [wanted]
+                if i >= len(log_topics) or log_topics[i].lower() not in {t.lower() for t in options}:
+                    ok = False
+                    break
+            if ok:
+                matched.append(log)
+        return matched
+
+    def log_addresses(self) -> list:
+        """Distinct emitting contract addresses of the recorded logs."""
+        return sorted({log['address'].lower() for log in self._logs})
+
+    def log_block_range(self) -> tuple:
+        """(first, last) block with recorded logs, or None if there are none."""
+        return (self._log_blocks[0], self._log_blocks[-1]) if self._log_blocks else None
+
+
+class StubBehaviour:
+    """
+    Provider behaviour to emulate.
+
+    Args:
+        latency_ms: Mean response latency
+        jitter_ms: Uniform +/- jitter added to the latency
+        rate_limit_prob: Probability of answering a request with HTTP 429
+        max_logs: eth_getLogs results above this count fail with -32005 (0 disables)
+        max_block_range: eth_getLogs ranges wider than this fail with -32005 (0 disables)
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, rate_limit_prob: float = 0.0,
+                 max_logs: int = 10_000, max_block_range: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_prob = rate_limit_prob
+        self.max_logs = max_logs
+        self.max_block_range = max_block_range
+
+
+class StubRPCServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering JSON-RPC (single and batch) from a FixtureStore."""
+
+    daemon_threads = True
+
+    def __init__(self, address, store: FixtureStore, behaviour: StubBehaviour):
+        super().__init__(address, _RPCHandler)
+        self.store = store
+        self.behaviour = behaviour
+        self.stats = {'requests': 0, 'calls': 0, 'rate_limited': 0, 'too_many_results': 0, 'not_recorded': 0}
+        self._stats_lock = threading.Lock()
+
+    def count(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def answer(self, call: dict) -> dict:
+        """JSON-RPC response object for one call."""
+        method, params = call.get('method'), call.get('params') or []
+        response = {'jsonrpc': '2.0', 'id': call.get('id')}
+        self.count('calls')
+
+        if method == 'eth_blockNumber':
+            response['result'] = hex(self.store.head)
+        elif method in _STATIC_RESULTS:
+            response['result'] = _STATIC_RESULTS[method]
+        elif method == 'eth_getLogs':
+            error, result = self._get_logs(params[0] if params else {})
+            response['error' if error else 'result'] = error or result
+        else:
+            found, result = self.store.lookup(method, params)
+            if found:
+                response['result'] = result
+            else:
+                self.count('not_recorded')
+                response['error'] = {'code': -32000, 'message': f"{method} {params} is not in the recorded fixtures"}
+        return response
+
+    def _get_logs(self, log_filter: dict):
+        from_block = _to_int(log_filter.get('fromBlock')) or 0
+        to_block = _to_int(log_filter.get('toBlock'))
+        if to_block is None:
+            to_block = self.store.head
+        behaviour = self.behaviour
+
+        if behaviour.max_block_range and to_block - from_block + 1 > behaviour.max_block_range:
+            self.count('too_many_results')
+            return self._too_many_results(from_block, from_block + behaviour.max_block_range - 1), None
+
+        start, end = self.store.logs_in_range(from_block, to_block)
+        logs = self.store.filter_logs(log_filter, start, end)
+        if behaviour.max_logs and len(logs) > behaviour.max_logs:
+            self.count('too_many_results')
+            # Suggest the range that ends just before the block of the first log over the cap
+            suggested_to = max(from_block, int(logs[behaviour.max_logs]['blockNumber'], 16) - 1)
+            return self._too_many_results(from_block, suggested_to), None
+        return None, logs
+
+    def _too_many_results(self, from_block: int, to_block: int) -> dict:
+        return {
+            'code': -32005,
+            'message': (
+                f"Log response size exceeded. You can make eth_getLogs requests with up to a "
+                f"{self.behaviour.max_block_range or 'unlimited'} block range and no limit on the response size, "
+                f"or you can request any block range with a cap of {self.behaviour.max_logs} logs in the response. "
+                f"Based on your parameters, this block range should work: [{hex(from_block)}, {hex(to_block)}]"
+            ),
+        }
+
+
+class _RPCHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        server = self.server
+        behaviour = server.behaviour
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'null')
+        server.count('requests')
+
+        latency = behaviour.latency_ms + random.uniform(-behaviour.jitter_ms, behaviour.jitter_ms)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+        if random.random() < behaviour.rate_limit_prob:
+            server.count('rate_limited')
+            self._send(429, {'jsonrpc': '2.0', 'id': None, 'error': {'code': 429, 'message': 'Too Many Requests'}})
+            return
+
+        if isinstance(body, list):
+            self._send(200, [server.answer(call) for call in body])
+        elif isinstance(body, dict):
+            self._send(200, server.answer(body))
+        else:
+            self._send(400, {'jsonrpc': '2.0', 'id': None, 'error': {'code': -32600, 'message': 'Invalid request'}})
+
+
+def start_stub_server(fixture_dir: str, host: str = '127.0.0.1', port: int = 0, behaviour: StubBehaviour = None) -> StubRPCServer:
+    """
+    Start the stub server in a background thread (for benchmarks and scripts).
+
+    Args:
+        fixture_dir: Directory with *.jsonl fixture files
+        host: Interface to bind
+        port: Port to bind (0 picks a free one; see server.server_address)
+        behaviour: Latency / error injection settings
+
+    Returns:
+        StubRPCServer: Running server; call shutdown() to stop it
+    """
+    server = StubRPCServer((host, port), FixtureStore(fixture_dir), behaviour or StubBehaviour())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded RPC fixtures as a local JSON-RPC endpoint')
+    parser.add_argument('--fixtures', required=True, help='Directory with *.jsonl fixtures (RPC_RECORD_DIR)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8545)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Mean response latency')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Uniform +/- latency jitter')
+    parser.add_argument('--rate-limit-prob', type=float, default=0.0, help='Probability of an HTTP 429 answer')
+    parser.add_argument('--max-logs', type=int, default=10_000, help='eth_getLogs result cap before -32005 (0 = none)')
+    parser.add_argument('--max-block-range', type=int, default=0, help='eth_getLogs range cap before -32005 (0 = none)')
+    args = parser.parse_args()
+
+    behaviour = StubBehaviour(args.latency_ms, args.jitter_ms, args.rate_limit_prob, args.max_logs, args.max_block_range)
+    server = StubRPCServer((args.host, args.port), FixtureStore(args.fixtures), behaviour)
+    print(f"Serving JSON-RPC stub on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\nStub server stats: {server.stats}")
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
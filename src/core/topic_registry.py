@@ -0,0 +1,70 @@
+"""topic0 -> decoder dispatch tables for event logs."""
+
+from typing import Callable
+
+
+def _topic_to_bytes(topic0) -> bytes:
+    """32-byte topic from bytes/HexBytes or a hex string (with or without 0x, any case)."""
+    if isinstance(topic0, bytes):
+        raw = bytes(topic0)
+    elif isinstance(topic0, str):
+        raw = bytes.fromhex(topic0[2:] if topic0[:2] in ('0x', '0X') else topic0)
+    else:
+        raise ValueError(f"Unexpected topic type: {type(topic0)}")
+    if len(raw) != 32:
+        raise ValueError(f"topic0 must be 32 bytes, got {len(raw)}")
+    return raw
+
+
+class TopicRegistry:
+    """
+    Maps an event's topic0 to its decoder.
+
+    Built once at import time. Every topic is stored under its raw 32 bytes
+    (matches HexBytes topics from web3) and its lowercase 0x-hex string
+    (matches raw JSON logs), so a lookup is a single dict access without
+    normalizing the topic. Other spellings (uppercase, no 0x) fall back to
+    one normalization.
+
+    Args:
+        name: Event family shown in errors (e.g. 'Pair')
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._decoders = {}
+
+    def register(self, topic0, decoder: Callable[[dict], dict]) -> None:
+        """
+        Register `decoder` for logs whose topic0 is `topic0`.
+
+        Args:
+            topic0: Event signature hash (32 bytes or hex string)
+            decoder: Callable taking the raw log and returning the decoded event dict
+        """
+        raw = _topic_to_bytes(topic0)
+        self._decoders[raw] = decoder
+        self._decoders['0x' + raw.hex()] = decoder
+
+    def get(self, topic0):
+        """Decoder registered for `topic0`, or None."""
+        decoder = self._decoders.get(topic0)
+        if decoder is None:
+            try:
+                decoder = self._decoders.get(_topic_to_bytes(topic0))
+            except ValueError:
+                return None
+        return decoder
+
+    def decode(self, log: dict) -> dict:
+        """Decode `log` with the decoder registered for its topic0."""
+        topic0 = log['topics'][0]
+        decoder = self.get(topic0)
+        if decoder is None:
+            shown = topic0.hex() if isinstance(topic0, bytes) else topic0
+            raise ValueError(f"Unknown {self.name} event topic0: {shown}")
+        return decoder(log)
+
+    def topics(self) -> list:
+        """Registered topics as 0x-hex strings."""
+        return [key for key in self._decoders if isinstance(key, str)]
@@ -9,12 +9,16 @@ from pathlib import Path
 
 PROTOCOLS = ('uniswap_v2', 'uniswap_v3')
 
-COMMANDS = ('index-pairs', 'index-pair-events', 'index-pools', 'index-pool-events', 'help')
+COMMANDS = (
+    'index-pairs', 'index-pair-events', 'index-pools', 'index-pool-events', 'verify-coverage', 'backfill-gaps', 'help'
+)
 COMMAND_TO_MODULE = {
     'index-pairs': 'index_pairs',
     'index-pair-events': 'index_pair_events',
     'index-pools': 'index_pools',
     'index-pool-events': 'index_pool_events',
+    'verify-coverage': 'verify_coverage',
+    'backfill-gaps': 'backfill_gaps',
 }
 
 
@@ -33,6 +37,19 @@ def _available_protocols() -> list[str]:
     return [p for p in PROTOCOLS if _commands_dir(p).is_dir()]
 
 
+def _config_overrides(args: argparse.Namespace) -> dict:
+    """Config values set from CLI flags; they take precedence over .env."""
+    return {
+        'FETCH_CONCURRENCY': args.workers,
+        'RPC_TRANSPORT': args.transport,
+        'DECODE_WORKERS': args.decode_workers,
+        'RESUME': args.resume or None,
+        'APPEND': args.append or None,
+        'OUTPUT_FORMAT': args.format,
+        'OUTPUT_LAYOUT': args.layout,
+    }
+
+
 def main():
     """Main CLI dispatcher for commands."""
     parser = argparse.ArgumentParser(
@@ -53,6 +70,46 @@ def main():
         choices=COMMANDS,
         help='Command to execute (default: index-pairs)'
     )
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=None,
+        help='Number of eth_getLogs windows fetched in parallel (default: FETCH_CONCURRENCY from .env or 1)'
+    )
+    parser.add_argument(
+        '--decode-workers',
+        type=int,
+        default=None,
+        help='Processes decoding pair/pool events (default: DECODE_WORKERS from .env or available CPUs)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue from the last checkpoint and append to the existing output'
+    )
+    parser.add_argument(
+        '--append',
+        action='store_true',
+        help='Add the block range to the existing output, skipping rows already in it'
+    )
+    parser.add_argument(
+        '--format',
+        default=None,
+        choices=('csv', 'parquet', 'sqlite'),
+        help='Event output format (default: OUTPUT_FORMAT from .env or csv)'
+    )
+    parser.add_argument(
+        '--layout',
+        default=None,
+        choices=('single', 'partitioned'),
+        help='Event output layout (default: OUTPUT_LAYOUT from .env or single)'
+    )
+    parser.add_argument(
+        '--transport',
+        default=None,
+        choices=('sync', 'async'),
+        help='RPC transport (default: RPC_TRANSPORT from .env or sync)'
+    )
 
     args = parser.parse_args()
 
@@ -70,7 +127,7 @@ def main():
     module_name = COMMAND_TO_MODULE[args.command]
     import_path = f'src.protocols.{args.protocol}.commands.{module_name}'
     mod = importlib.import_module(import_path)
-    mod.run()
+    mod.run(_config_overrides(args))
 
 
 def print_help():
@@ -79,11 +136,20 @@ def print_help():
     print("Options:")
     print("  -p, --protocol NAME   Protocol to use (default: uniswap_v2)")
     print(f"                       Available: {', '.join(PROTOCOLS)}")
+    print("  -w, --workers N       Parallel eth_getLogs windows (default: FETCH_CONCURRENCY or 1)")
+    print("  --decode-workers N    Processes decoding events (default: DECODE_WORKERS or CPU count)")
+    print("  --transport MODE      RPC transport: sync or async (default: RPC_TRANSPORT or sync)")
+    print("  --format FORMAT       Event output: csv, parquet or sqlite (default: OUTPUT_FORMAT or csv)")
+    print("  --layout LAYOUT       Event output: single file or partitioned dataset (default: OUTPUT_LAYOUT or single)")
+    print("  --resume              Continue from the last checkpoint, appending to the output")
+    print("  --append              Add the block range to the existing output, skipping rows already in it")
     print("\nCommands:")
     print("  index-pairs           Index pairs from Factory contract (V2)")
     print("  index-pair-events     Index pair events (Swap, Mint, Burn) from pairs CSV (V2)")
     print("  index-pools           Index pools from Factory contract (V3)")
     print("  index-pool-events     Index pool events (Initialize, Mint, Burn, Collect, Swap, Flash) from pools CSV (V3)")
+    print("  verify-coverage       Report missing block intervals of the outputs (checkpoints + gaps ledger)")
+    print("  backfill-gaps         Re-fetch only the block ranges recorded in the gaps ledger")
     print("  help                  Show this help message")
     print("\nUsage:")
     print("  python -m src.main [-p PROTOCOL] [command]")
@@ -91,6 +157,11 @@ def print_help():
     print("  python -m src.main index-pairs")
     print("  python -m src.main --protocol uniswap_v2 index-pairs")
     print("  python -m src.main -p uniswap_v2 index-pair-events")
+    print("  python -m src.main -p uniswap_v3 --workers 8 index-pool-events")
+    print("  python -m src.main -p uniswap_v2 --resume index-pair-events")
+    print("  python -m src.main -p uniswap_v3 --format parquet index-pool-events")
+    print("  python -m src.main -p uniswap_v2 --layout partitioned --format parquet index-pair-events")
+    print("  START_BLOCK=19000000 python -m src.main -p uniswap_v2 --append index-pair-events")
 
 
 if __name__ == "__main__":
@@ -1,31 +1,238 @@
 """Command to index Uniswap V2 Pair events (Swap, Mint, Burn) from pairs CSV."""
 
+import os
+from collections import Counter
+
+from src.core.addresses import address_cache_summary, configure_address_cache
+from src.core.checkpoint import Checkpoint, start_or_resume
+from src.core.gaps import configure_gap_ledger, gap_command
+from src.core.parallel_decode import open_decode_pool
+from src.core.rate_limiter import configure_rate_limiter
+from src.core.rpc_cache import configure_rpc_cache
+from src.core.rpc_recorder import configure_rpc_recorder
 from src.protocols.uniswap_v2.core.rpc import get_web3
-from src.protocols.uniswap_v2.indexers.pairs_indexer import index_pair_events
+from src.protocols.uniswap_v2.indexers.pairs_indexer import stream_pair_events
 from src.protocols.uniswap_v2.core.config import load_config
-from src.protocols.uniswap_v2.storage.csv_storage import save_pair_events_to_csv
+from src.protocols.uniswap_v2.decoders.event_decoder import configure_decoder_crosscheck
+from src.protocols.uniswap_v2.storage.csv_storage import DATA_DIR, PAIR_EVENT_COLUMNS, create_pair_events_csv, open_pair_events_csv, save_pair_events_to_csv
+from src.protocols.uniswap_v2.storage.partitioned_storage import EVENTS_DIR, open_pair_events_partitioned
+from src.protocols.uniswap_v2.storage.parquet_storage import open_pair_events_parquet
+from src.protocols.uniswap_v2.storage.sqlite_storage import open_pair_events_store
+
+
+def _index_to_csv(w3, config: dict, decode_pool, ledger) -> None:
+    """Index into the pair events CSV, checkpointing every chunk (--resume / --append, gaps ledger)."""
+    filename = "uniswap_v2_pair_events.csv"
+    filepath = os.path.join(DATA_DIR, filename)
+    end_block = config['START_BLOCK'] + config['BLOCK_RANGE'] - 1
+    checkpoint = Checkpoint(config['CHECKPOINT_DIR'], 'uniswap_v2', 'index-pair-events')
+    try:
+        first_block = start_or_resume(
+            checkpoint, config['START_BLOCK'], end_block, config['RESUME'], filepath,
+            lambda: create_pair_events_csv(filename), config['APPEND'], PAIR_EVENT_COLUMNS,
+        )
+    except ValueError as e:
+        print(f"Cannot use the existing output: {e}")
+        return
+    # Gaps in the part of the output that is (re)written now are obsolete
+    if config['APPEND']:
+        ledger.resolve(ledger.command, first_block, end_block)
+    else:
+        ledger.clear(ledger.command, first_block if first_block > config['START_BLOCK'] else 0)
+    rows_before = checkpoint.rows
+    counts = Counter()
+
+    def write_chunk(events, start_block, end_block):
+        # Rows already in the output (same transaction_hash, log_index) are skipped
+        checkpoint.commit(end_block, save_pair_events_to_csv(events, filename, append=True))
+        counts.update(events.counts())
+
+    total = 0
+    if first_block <= end_block:
+        run_config = dict(config, START_BLOCK=first_block, BLOCK_RANGE=end_block - first_block + 1)
+        total = stream_pair_events(w3, run_config, write_chunk, csv_path="data/uniswap_v2/uniswap_v2_pairs.csv", executor=decode_pool)
+    else:
+        print(f"Blocks up to {end_block} are already indexed")
+
+    if total:
+        saved = checkpoint.rows - rows_before
+        print(f"Saved {saved} pair events to {filepath}")
+        if saved < total:
+            print(f"Skipped {total - saved} pair events already in the output")
+        print(f"\nSummary: {counts['swap']} Swap, {counts['mint']} Mint, {counts['burn']} Burn")
+    else:
+        print("\nNo Pair events found in the specified block range")
+
+
+def _index_to_compressed_csv(w3, config: dict, decode_pool, ledger) -> None:
+    """Index into a CSV compressed on the fly (CSV_COMPRESSION gzip / zstd), written in one pass."""
+    if config['RESUME'] or config['APPEND']:
+        print("--resume and --append are only supported for uncompressed CSV output")
+        return
+    writer = open_pair_events_csv("uniswap_v2_pair_events.csv", config['CSV_COMPRESSION'])
+    # The output is rewritten, so gaps of earlier runs are obsolete
+    ledger.clear(ledger.command)
+    counts = Counter()
+
+    def write_chunk(events, start_block, end_block):
+        writer.write(events)
+        counts.update(events.counts())
+
+    try:
+        total = stream_pair_events(w3, config, write_chunk, csv_path="data/uniswap_v2/uniswap_v2_pairs.csv", executor=decode_pool)
+    finally:
+        writer.close()
+    if total:
+        print(f"Saved {writer.rows} pair events to {writer.path}")
+        print(f"\nSummary: {counts['swap']} Swap, {counts['mint']} Mint, {counts['burn']} Burn")
+    else:
+        print("\nNo Pair events found in the specified block range")
 
 
-def run():
-    """Execute the pair events indexing command."""
+def _index_to_parquet(w3, config: dict, decode_pool, ledger) -> None:
+    """Index into one typed Parquet file per event type (--format parquet)."""
+    if config['RESUME'] or config['APPEND']:
+        print("--resume and --append are only supported for CSV output")
+        return
+    writer = open_pair_events_parquet(config)
+    # The output is rewritten, so gaps of earlier runs are obsolete
+    ledger.clear(ledger.command)
+    print(f"Output: Parquet ({config['PARQUET_COMPRESSION']}, row groups of {config['PARQUET_ROW_GROUP_BLOCKS']} blocks)")
+    total = stream_pair_events(w3, config, writer.write, csv_path="data/uniswap_v2/uniswap_v2_pairs.csv", executor=decode_pool)
+    paths = writer.close()
+    for event_type, path in paths.items():
+        print(f"Saved {writer.rows[event_type]} {event_type} events to {path}")
+    if not total:
+        print("\nNo Pair events found in the specified block range")
+
+
+def _index_to_partitions(w3, config: dict, decode_pool, ledger) -> None:
+    """Index into the partitioned dataset under {EVENTS_DIR} (--layout partitioned, CSV or Parquet files)."""
+    if config['RESUME'] or config['APPEND']:
+        print("--resume and --append are only supported for single-file CSV output")
+        return
+    end_block = config['START_BLOCK'] + config['BLOCK_RANGE'] - 1
+    try:
+        writer = open_pair_events_partitioned(config, config['START_BLOCK'], end_block)
+    except ValueError as e:
+        print(f"Cannot write the partitioned dataset: {e}")
+        return
+    # Files of the range are replaced, so its gaps from earlier runs are obsolete
+    ledger.resolve(ledger.command, config['START_BLOCK'], end_block)
+    print(f"Output: {EVENTS_DIR} ({config['OUTPUT_FORMAT']}, buckets of {config['PARTITION_BLOCKS']} blocks, "
+          f"{config['PARTITION_PAIR_BUCKETS'] or 'no'} pair hash buckets)")
+    total = stream_pair_events(w3, config, writer.write, csv_path="data/uniswap_v2/uniswap_v2_pairs.csv", executor=decode_pool)
+    writer.close()
+    for event_type, rows in writer.rows.items():
+        if rows:
+            print(f"Saved {rows} {event_type} events")
+    print(f"Wrote {writer.files_written} partition files; manifest {EVENTS_DIR}/_manifest.json")
+    if not total:
+        print("\nNo Pair events found in the specified block range")
+
+
+def _index_to_sqlite(w3, config: dict, decode_pool, ledger) -> None:
+    """Index into the SQLite database (--format sqlite); progress for --resume is kept in the database."""
+    end_block = config['START_BLOCK'] + config['BLOCK_RANGE'] - 1
+    store = open_pair_events_store()
+    print(f"Output: {store.path} (table pair_events)")
+    try:
+        first_block = config['START_BLOCK']
+        progress = store.progress('index-pair-events')
+        if config['RESUME'] and progress is not None:
+            if progress[0] != config['START_BLOCK']:
+                print(f"Cannot resume: progress starts at block {progress[0]}, but START_BLOCK is {config['START_BLOCK']}")
+                return
+            first_block = min(progress[1], end_block) + 1
+            print(f"Resuming from block {first_block}")
+        else:
+            store.start('index-pair-events', first_block)
+        # Events already stored are kept; only gaps inside the range fetched now are obsolete
+        ledger.resolve(ledger.command, first_block, end_block)
+        saved = 0
+        counts = Counter()
+
+        def write_chunk(events, start_block, end_block):
+            nonlocal saved
+            # Events already in the database (same transaction_hash, log_index) are skipped
+            saved += store.insert(events, 'index-pair-events', end_block)
+            counts.update(events.counts())
+
+        total = 0
+        if first_block <= end_block:
+            run_config = dict(config, START_BLOCK=first_block, BLOCK_RANGE=end_block - first_block + 1)
+            total = stream_pair_events(w3, run_config, write_chunk, csv_path="data/uniswap_v2/uniswap_v2_pairs.csv", executor=decode_pool)
+        else:
+            print(f"Blocks up to {end_block} are already indexed")
+        print("Creating indexes...")
+        store.create_indexes()
+    finally:
+        store.close()
+
+    if total:
+        print(f"Saved {saved} pair events to {store.path}")
+        if saved < total:
+            print(f"Skipped {total - saved} pair events already in the database")
+        print(f"\nSummary: {counts['swap']} Swap, {counts['mint']} Mint, {counts['burn']} Burn")
+    else:
+        print("\nNo Pair events found in the specified block range")
+
+
+def run(overrides: dict = None):
+    """
+    Execute the pair events indexing command.
+
+    Args:
+        overrides: Config values set from CLI flags (see load_config)
+    """
     print("=== Uniswap V2 Pair Events Indexer ===\n")
 
     print("Loading configuration...")
-    config = load_config()
+    config = load_config(overrides)
+    configure_rate_limiter(config['RPC_RATE_LIMIT'], config['RPC_RATE_LIMIT_UNIT'], config['RPC_RATE_BURST'])
+    rpc_cache = configure_rpc_cache(
+        config['RPC_CACHE_DIR'], config['RPC_CACHE_MAX_MB'], config['FINALITY_DEPTH'], config['RPC_CACHE']
+    )
+    recorder = configure_rpc_recorder(config['RPC_RECORD_DIR'])
+    crosscheck = configure_decoder_crosscheck(config['DECODER_CROSSCHECK'])
+    configure_address_cache(config['ADDRESS_CACHE_SIZE'])
     print(f"Block Range: {config['START_BLOCK']} to {config['START_BLOCK'] + config['BLOCK_RANGE'] - 1}")
-    print(f"Batch Size: {config['BATCH_SIZE']}\n")
+    print(f"Batch Size: {config['BATCH_SIZE']}")
+    print(f"RPC Rate Limit: {config['RPC_RATE_LIMIT'] or 'unlimited'} {config['RPC_RATE_LIMIT_UNIT']}/s")
+    print(f"RPC Cache: {rpc_cache.path if rpc_cache else 'disabled'}")
+    print(f"Fetch Workers: {config['FETCH_CONCURRENCY']}")
+    print(f"Decode Workers: {config['DECODE_WORKERS']}\n")
 
     print(f"Connecting to RPC: {config['RPC_URL']}")
     w3 = get_web3(config['RPC_URL'])
     print("Successfully connected to RPC\n")
 
-    events = index_pair_events(w3, config, csv_path="data/uniswap_v2/uniswap_v2_pairs.csv")
+    ledger = configure_gap_ledger(config['CHECKPOINT_DIR'], 'uniswap_v2', gap_command('index-pair-events', config))
+    # One decode worker pool for the whole run (see open_decode_pool)
+    decode_pool = open_decode_pool(config['DECODE_WORKERS'], configure_decoder_crosscheck, (config['DECODER_CROSSCHECK'],))
+    try:
+        if config['OUTPUT_LAYOUT'] == 'partitioned':
+            _index_to_partitions(w3, config, decode_pool, ledger)
+        elif config['OUTPUT_FORMAT'] == 'parquet':
+            _index_to_parquet(w3, config, decode_pool, ledger)
+        elif config['OUTPUT_FORMAT'] == 'sqlite':
+            _index_to_sqlite(w3, config, decode_pool, ledger)
+        elif config['CSV_COMPRESSION'] != 'none':
+            _index_to_compressed_csv(w3, config, decode_pool, ledger)
+        else:
+            _index_to_csv(w3, config, decode_pool, ledger)
+    finally:
+        if decode_pool is not None:
+            decode_pool.shutdown()
 
-    if events:
-        save_pair_events_to_csv(events, "uniswap_v2_pair_events.csv")
-        swap_count = sum(1 for e in events if e.get("event_type") == "swap")
-        mint_count = sum(1 for e in events if e.get("event_type") == "mint")
-        burn_count = sum(1 for e in events if e.get("event_type") == "burn")
-        print(f"\nSummary: {swap_count} Swap, {mint_count} Mint, {burn_count} Burn")
-    else:
-        print("\nNo Pair events found in the specified block range")
+    if ledger.recorded:
+        # backfill-gaps only fills the plain CSV output
+        next_step = 'run backfill-gaps' if ledger.command == 'index-pair-events' else 're-index those blocks'
+        print(f"{len(ledger.recorded)} block ranges could not be fetched; recorded in {ledger.path} ({next_step})")
+    if crosscheck.rate:
+        print(crosscheck.summary())
+    print(address_cache_summary())
+    if rpc_cache:
+        print(rpc_cache.summary())
+    if recorder:
+        print(f"Recorded {recorder.recorded} RPC responses to {recorder.path}")
@@ -1,34 +1,98 @@
 """Command to index Uniswap V2 pairs from Factory contract."""
 
+import os
+
+from src.core.addresses import address_cache_summary, configure_address_cache
+from src.core.checkpoint import Checkpoint, start_or_resume
+from src.core.gaps import configure_gap_ledger
+from src.core.rate_limiter import configure_rate_limiter
+from src.core.rpc_cache import configure_rpc_cache
+from src.core.rpc_recorder import configure_rpc_recorder
 from src.protocols.uniswap_v2.core.config import load_config
+from src.protocols.uniswap_v2.decoders.event_decoder import configure_decoder_crosscheck
 from src.protocols.uniswap_v2.core.rpc import get_web3
-from src.protocols.uniswap_v2.indexers.factory_indexer import index_pairs
-from src.protocols.uniswap_v2.storage.csv_storage import save_pairs_to_csv
+from src.protocols.uniswap_v2.indexers.factory_indexer import stream_pairs
+from src.protocols.uniswap_v2.storage.csv_storage import DATA_DIR, PAIR_COLUMNS, create_pairs_csv, save_pairs_to_csv
+
 
+def run(overrides: dict = None):
+    """
+    Execute the pair indexing command.
 
-def run():
-    """Execute the pair indexing command."""
+    Args:
+        overrides: Config values set from CLI flags (see load_config)
+    """
     print("=== Uniswap V2 Pair Indexer ===\n")
     
     # Load configuration
     print("Loading configuration...")
-    config = load_config()
+    config = load_config(overrides)
+    configure_rate_limiter(config['RPC_RATE_LIMIT'], config['RPC_RATE_LIMIT_UNIT'], config['RPC_RATE_BURST'])
+    rpc_cache = configure_rpc_cache(
+        config['RPC_CACHE_DIR'], config['RPC_CACHE_MAX_MB'], config['FINALITY_DEPTH'], config['RPC_CACHE']
+    )
+    recorder = configure_rpc_recorder(config['RPC_RECORD_DIR'])
+    crosscheck = configure_decoder_crosscheck(config['DECODER_CROSSCHECK'])
+    configure_address_cache(config['ADDRESS_CACHE_SIZE'])
     print(f"Factory Address: {config['FACTORY_ADDRESS']}")
     print(f"Block Range: {config['START_BLOCK']} to {config['START_BLOCK'] + config['BLOCK_RANGE'] - 1}")
-    print(f"Batch Size: {config['BATCH_SIZE']}\n")
+    print(f"Batch Size: {config['BATCH_SIZE']}")
+    print(f"RPC Rate Limit: {config['RPC_RATE_LIMIT'] or 'unlimited'} {config['RPC_RATE_LIMIT_UNIT']}/s")
+    print(f"RPC Cache: {rpc_cache.path if rpc_cache else 'disabled'}\n")
     
     # Connect to RPC
     print(f"Connecting to RPC: {config['RPC_URL']}")
     w3 = get_web3(config['RPC_URL'])
     print("Successfully connected to RPC\n")
     
-    # Index pairs
-    pairs = index_pairs(w3, config)
+    # Start a fresh output or continue the checkpointed one (--resume)
+    output_filename = 'uniswap_v2_pairs.csv'
+    filepath = os.path.join(DATA_DIR, output_filename)
+    end_block = config['START_BLOCK'] + config['BLOCK_RANGE'] - 1
+    checkpoint = Checkpoint(config['CHECKPOINT_DIR'], 'uniswap_v2', 'index-pairs')
+    ledger = configure_gap_ledger(config['CHECKPOINT_DIR'], 'uniswap_v2', 'index-pairs')
+    try:
+        first_block = start_or_resume(
+            checkpoint, config['START_BLOCK'], end_block, config['RESUME'], filepath,
+            lambda: create_pairs_csv(output_filename), config['APPEND'], PAIR_COLUMNS,
+        )
+    except ValueError as e:
+        print(f"Cannot use the existing output: {e}")
+        return
+    # Gaps in the part of the output that is (re)written now are obsolete
+    if config['APPEND']:
+        ledger.resolve('index-pairs', first_block, end_block)
+    else:
+        ledger.clear('index-pairs', first_block if first_block > config['START_BLOCK'] else 0)
+    rows_before = checkpoint.rows
+    
+    # Index pairs, appending every chunk to the CSV and checkpointing it
+    def write_chunk(pairs, start_block, end_block):
+        # Rows already in the output (same transaction_hash, log_index) are skipped
+        checkpoint.commit(end_block, save_pairs_to_csv(pairs, output_filename, append=True))
     
-    # Save to CSV
-    if pairs:
-        output_filename = 'uniswap_v2_pairs.csv'
-        save_pairs_to_csv(pairs, output_filename)
-        print(f"\nIndexing complete! Found {len(pairs)} pairs")
+    total = 0
+    if first_block <= end_block:
+        run_config = dict(config, START_BLOCK=first_block, BLOCK_RANGE=end_block - first_block + 1)
+        total = stream_pairs(w3, run_config, write_chunk)
+    else:
+        print(f"Blocks up to {end_block} are already indexed")
+    
+    if total:
+        saved = checkpoint.rows - rows_before
+        print(f"Saved {saved} pairs to {filepath}")
+        if saved < total:
+            print(f"Skipped {total - saved} pairs already in the output")
+        print(f"\nIndexing complete! Found {total} pairs")
     else:
         print("\nNo pairs found in the specified block range")
+
+    if ledger.recorded:
+        print(f"{len(ledger.recorded)} block ranges could not be fetched; recorded in {ledger.path} (run backfill-gaps)")
+    if crosscheck.rate:
+        print(crosscheck.summary())
+    print(address_cache_summary())
+    if rpc_cache:
+        print(rpc_cache.summary())
+    if recorder:
+        print(f"Recorded {recorder.recorded} RPC responses to {recorder.path}")
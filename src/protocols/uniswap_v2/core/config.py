@@ -3,32 +3,132 @@
 import os
 from dotenv import load_dotenv
 
+from src.core.csv_writer import import_zstandard
+from src.core.parallel_decode import available_cpus
 
-def load_config() -> dict:
+
+def load_config(overrides: dict = None) -> dict:
     """
     Load configuration from .env file.
     
+    Args:
+        overrides: Optional values (e.g. from CLI flags) that take precedence over .env
+    
     Returns:
         dict: Configuration dictionary with keys:
-            - RPC_URL: Ethereum RPC endpoint URL
+            - RPC_URL: Ethereum RPC endpoint URL (comma-separated list when RPC_URLS is set)
+            - RPC_URLS: List of RPC endpoint URLs load-balanced with failover (from RPC_URLS, or just RPC_URL)
             - FACTORY_ADDRESS: Uniswap V2 Factory contract address (from UNISWAP_V2_FACTORY_ADDRESS env var)
             - START_BLOCK: Starting block number for indexing
             - BLOCK_RANGE: Number of blocks to index
             - BATCH_SIZE: Batch size for log requests
+            - FETCH_CONCURRENCY: Number of eth_getLogs windows fetched in parallel
+            - DECODE_WORKERS: Processes decoding large event sets (default: available CPUs, 1 = in-process)
+            - STREAM_BUFFER_EVENTS: Events fetched, decoded and written per chunk (bounds memory use)
+            - CHECKPOINT_DIR: Directory of per-command checkpoints (last fully written block range)
+            - CHECKPOINT_BLOCKS: Write and checkpoint at least every this many blocks (0 = only by STREAM_BUFFER_EVENTS)
+            - RESUME: Continue from the checkpoint and append to the existing output (--resume)
+            - APPEND: Add this block range to the existing output, skipping rows already in it (--append)
+            - OUTPUT_FORMAT: Event output format, 'csv', 'parquet' or 'sqlite' (--format)
+            - CSV_COMPRESSION: Compress the single-file events CSV on the fly: 'none', 'gzip' (.csv.gz) or 'zstd' (.csv.zst)
+            - PARQUET_COMPRESSION: Parquet codec ('zstd', 'snappy', 'gzip', 'brotli', 'lz4', 'none')
+            - PARQUET_ROW_GROUP_BLOCKS: Blocks covered by one Parquet row group
+            - PARQUET_AMOUNTS: Wide integers as 'decimal' (decimal256(76, 0)) or 'binary' (32-byte two's complement)
+            - OUTPUT_LAYOUT: 'single' (one output file) or 'partitioned' (event_type / block bucket [/ pair bucket] + manifest) (--layout)
+            - PARTITION_BLOCKS: Blocks per block bucket of the partitioned layout
+            - PARTITION_PAIR_BUCKETS: Hash buckets by pair/pool address inside each block bucket (0 = none)
+            - RPC_TRANSPORT: 'sync' (Web3.HTTPProvider) or 'async' (pooled AsyncWeb3 session)
+            - RPC_MAX_CONNECTIONS: Connection pool size / in-flight requests for the async transport
+            - RPC_BATCH_SIZE: Calls per JSON-RPC batch for timestamps / tx senders (0 disables batching)
+            - TX_FROM_MODE: 'tx' (per-transaction lookups), 'block' (one call per block) or 'auto'
+            - TX_FROM_BLOCK_RATIO: 'auto' switches to per-block resolution when the per-transaction lookups cost this many times more (in rate limiter units)
+            - ADAPTIVE_BATCH_SIZE: Adapt the eth_getLogs window (starting at BATCH_SIZE) to provider feedback
+            - MIN_BATCH_SIZE / MAX_BATCH_SIZE: Bounds for the adaptive window
+            - TARGET_LOGS_PER_BATCH / TARGET_BATCH_SECONDS: Response size / latency the window is tuned towards
+            - RPC_RATE_LIMIT: Shared RPC budget per second (0 = unlimited, the default)
+            - RPC_RATE_LIMIT_UNIT: 'rps' (requests/s) or 'cu' (provider compute units/s)
+            - RPC_RATE_BURST: Token bucket capacity in the same unit (0 = one second worth)
+            - RPC_CACHE: Keep finalized RPC responses in an on-disk cache (re-runs are served locally)
+            - RPC_CACHE_DIR: Directory of the cache database
+            - RPC_CACHE_MAX_MB: Cache size cap in megabytes (least recently used entries are evicted)
+            - FINALITY_DEPTH: Blocks below the chain head considered final (only those are cached)
+            - RPC_RECORD_DIR: Record RPC responses as replay fixtures into this directory (empty = off)
+            - DECODER_CROSSCHECK: Share of events (0-1) whose fast-path decoding is validated against eth_abi
+            - ADDRESS_CACHE_SIZE: Memoized checksum addresses (LRU, 0 disables the memo)
     """
     load_dotenv()
     
     config = {
-        'RPC_URL': os.getenv('RPC_URL'),
+        'RPC_URL': os.getenv('RPC_URLS') or os.getenv('RPC_URL'),
         'FACTORY_ADDRESS': os.getenv('UNISWAP_V2_FACTORY_ADDRESS', '0x5C69bEe701ef814a2B6a3EDD4B1652CB9cc5aA6f'),
         'START_BLOCK': int(os.getenv('UNISWAP_V2_START_BLOCK', os.getenv('START_BLOCK', '10000835'))),  # Default: ~May 2020 (can be set to Factory deployment block)
         'BLOCK_RANGE': int(os.getenv('BLOCK_RANGE', '50000')),
-        'BATCH_SIZE': int(os.getenv('BATCH_SIZE', '2000'))
+        'BATCH_SIZE': int(os.getenv('BATCH_SIZE', '2000')),
+        'FETCH_CONCURRENCY': int(os.getenv('FETCH_CONCURRENCY', '1')),
+        'DECODE_WORKERS': int(os.getenv('DECODE_WORKERS') or available_cpus()),
+        'STREAM_BUFFER_EVENTS': int(os.getenv('STREAM_BUFFER_EVENTS', '100000')),
+        'CHECKPOINT_DIR': os.getenv('CHECKPOINT_DIR', 'data/checkpoints'),
+        'CHECKPOINT_BLOCKS': int(os.getenv('CHECKPOINT_BLOCKS', '10000')),
+        'RESUME': False,
+        'APPEND': False,
+        'OUTPUT_FORMAT': os.getenv('OUTPUT_FORMAT', 'csv'),
+        'CSV_COMPRESSION': os.getenv('CSV_COMPRESSION', 'none'),
+        'PARQUET_COMPRESSION': os.getenv('PARQUET_COMPRESSION', 'zstd'),
+        'PARQUET_ROW_GROUP_BLOCKS': int(os.getenv('PARQUET_ROW_GROUP_BLOCKS', '10000')),
+        'PARQUET_AMOUNTS': os.getenv('PARQUET_AMOUNTS', 'decimal'),
+        'OUTPUT_LAYOUT': os.getenv('OUTPUT_LAYOUT', 'single'),
+        'PARTITION_BLOCKS': int(os.getenv('PARTITION_BLOCKS', '100000')),
+        'PARTITION_PAIR_BUCKETS': int(os.getenv('PARTITION_PAIR_BUCKETS', '0')),
+        'RPC_TRANSPORT': os.getenv('RPC_TRANSPORT', 'sync'),
+        'RPC_MAX_CONNECTIONS': int(os.getenv('RPC_MAX_CONNECTIONS', '100')),
+        'RPC_BATCH_SIZE': int(os.getenv('RPC_BATCH_SIZE', '50')),
+        'TX_FROM_MODE': os.getenv('TX_FROM_MODE', 'auto'),
+        'TX_FROM_BLOCK_RATIO': float(os.getenv('TX_FROM_BLOCK_RATIO', '3.0')),
+        'ADAPTIVE_BATCH_SIZE': os.getenv('ADAPTIVE_BATCH_SIZE', 'true').lower() in ('1', 'true', 'yes'),
+        'MIN_BATCH_SIZE': int(os.getenv('MIN_BATCH_SIZE', '10')),
+        'MAX_BATCH_SIZE': int(os.getenv('MAX_BATCH_SIZE', '100000')),
+        'TARGET_LOGS_PER_BATCH': int(os.getenv('TARGET_LOGS_PER_BATCH', '5000')),
+        'TARGET_BATCH_SECONDS': float(os.getenv('TARGET_BATCH_SECONDS', '3.0')),
+        'RPC_RATE_LIMIT': float(os.getenv('RPC_RATE_LIMIT', '0')),
+        'RPC_RATE_LIMIT_UNIT': os.getenv('RPC_RATE_LIMIT_UNIT', 'rps'),
+        'RPC_RATE_BURST': float(os.getenv('RPC_RATE_BURST', '0')),
+        'RPC_CACHE': os.getenv('RPC_CACHE', 'true').lower() in ('1', 'true', 'yes'),
+        'RPC_CACHE_DIR': os.getenv('RPC_CACHE_DIR', 'data/cache'),
+        'RPC_CACHE_MAX_MB': float(os.getenv('RPC_CACHE_MAX_MB', '2048')),
+        'FINALITY_DEPTH': int(os.getenv('FINALITY_DEPTH', '64')),
+        'RPC_RECORD_DIR': os.getenv('RPC_RECORD_DIR', ''),
+        'DECODER_CROSSCHECK': float(os.getenv('DECODER_CROSSCHECK', '0')),
+        'ADDRESS_CACHE_SIZE': int(os.getenv('ADDRESS_CACHE_SIZE', '100000')),
     }
+    if overrides:
+        config.update({k: v for k, v in overrides.items() if v is not None})
+    config['RPC_URLS'] = [url.strip() for url in (config['RPC_URL'] or '').split(',') if url.strip()]
+    config['RPC_URL'] = ','.join(config['RPC_URLS'])
     
     # Validate required fields
+    if config['RPC_TRANSPORT'] not in ('sync', 'async'):
+        raise ValueError(f"RPC_TRANSPORT must be 'sync' or 'async', got: {config['RPC_TRANSPORT']}")
+    if config['TX_FROM_MODE'] not in ('auto', 'tx', 'block'):
+        raise ValueError(f"TX_FROM_MODE must be 'auto', 'tx' or 'block', got: {config['TX_FROM_MODE']}")
+    if config['OUTPUT_FORMAT'] not in ('csv', 'parquet', 'sqlite'):
+        raise ValueError(f"OUTPUT_FORMAT must be 'csv', 'parquet' or 'sqlite', got: {config['OUTPUT_FORMAT']}")
+    if config['CSV_COMPRESSION'] not in ('none', 'gzip', 'zstd'):
+        raise ValueError(f"CSV_COMPRESSION must be 'none', 'gzip' or 'zstd', got: {config['CSV_COMPRESSION']}")
+    if config['CSV_COMPRESSION'] == 'zstd':
+        try:
+            import_zstandard()
+        except ImportError as e:
+            raise ValueError(f"CSV_COMPRESSION=zstd: {e}") from e
+    if config['PARQUET_AMOUNTS'] not in ('decimal', 'binary'):
+        raise ValueError(f"PARQUET_AMOUNTS must be 'decimal' or 'binary', got: {config['PARQUET_AMOUNTS']}")
+    if config['OUTPUT_LAYOUT'] not in ('single', 'partitioned'):
+        raise ValueError(f"OUTPUT_LAYOUT must be 'single' or 'partitioned', got: {config['OUTPUT_LAYOUT']}")
+    if config['OUTPUT_LAYOUT'] == 'partitioned' and config['OUTPUT_FORMAT'] == 'sqlite':
+        raise ValueError("The partitioned layout writes csv or parquet files, not sqlite")
+    if config['OUTPUT_LAYOUT'] == 'partitioned' and config['OUTPUT_FORMAT'] == 'csv' and config['CSV_COMPRESSION'] != 'none':
+        raise ValueError("CSV_COMPRESSION only applies to the single-file CSV output")
     if not config['RPC_URL']:
-        raise ValueError("RPC_URL is not set in .env file")
+        raise ValueError("RPC_URL (or RPC_URLS) is not set in .env file")
     if not config['FACTORY_ADDRESS']:
         raise ValueError("UNISWAP_V2_FACTORY_ADDRESS is not set in .env file")
     
@@ -1,14 +1,39 @@
 """Decoder for Uniswap V2 Factory PairCreated and Pair (Swap, Mint, Burn) events."""
 
+from typing import List, Tuple
+
 from web3 import Web3
 from eth_abi import decode
 
+from src.core.addresses import to_address_bytes
+from src.core.batch_decoder import EventLayout, decode_batches, decode_event_batch
+from src.core.decoder_check import DecoderCrossCheck
+from src.core.event_batch import ADDRESS, AMOUNT, HASH, INT64, TEXT, EventBatch
+from src.core.topic_registry import TopicRegistry
+
 
 # Pair event signatures (topic0) - keccak256 of event signature
 _SWAP_TOPIC = Web3.keccak(text='Swap(address,uint256,uint256,uint256,uint256,address)').hex()
 _MINT_TOPIC = Web3.keccak(text='Mint(address,uint256,uint256)').hex()
 _BURN_TOPIC = Web3.keccak(text='Burn(address,uint256,uint256,address)').hex()
 
+# Samples fast-path results against the eth_abi decoders (DECODER_CROSSCHECK)
+_crosscheck = DecoderCrossCheck('Uniswap V2')
+
+
+def configure_decoder_crosscheck(rate: float) -> DecoderCrossCheck:
+    """
+    Set the share of events whose fast-path decoding is validated against eth_abi.
+
+    Args:
+        rate: 0.0 (off) to 1.0 (every event)
+
+    Returns:
+        DecoderCrossCheck: Checker holding the statistics
+    """
+    _crosscheck.configure(rate)
+    return _crosscheck
+
 
 def get_paircreated_event_signature() -> str:
     """
@@ -22,9 +47,9 @@ def get_paircreated_event_signature() -> str:
     return '0x0d3648bd0f6ba80134a33ba9275ac585d9d315f0ad8355cddefde31afa28d0e9'
 
 
-def decode_paircreated_event(log: dict) -> dict:
+def decode_paircreated_event_abi(log: dict) -> dict:
     """
-    Decode a PairCreated event log.
+    Decode a PairCreated event log with eth_abi (reference implementation).
     
     Event structure:
         - topic0: event signature hash
@@ -43,6 +68,7 @@ def decode_paircreated_event(log: dict) -> dict:
             - pair_index: Sequential index of the pair
             - block_number: Block number where pair was created
             - transaction_hash: Transaction hash that created the pair
+            - log_index: Log index of the event
     """
     try:
         # Extract indexed parameters from topics
@@ -80,7 +106,8 @@ def decode_paircreated_event(log: dict) -> dict:
             'token1': token1,
             'pair_index': pair_index,
             'block_number': log['blockNumber'],
-            'transaction_hash': log['transactionHash'].hex() if isinstance(log['transactionHash'], bytes) else log['transactionHash']
+            'transaction_hash': log['transactionHash'].hex() if isinstance(log['transactionHash'], bytes) else log['transactionHash'],
+            'log_index': log['logIndex'],
         }
         
     except Exception as e:
@@ -140,9 +167,9 @@ def _tx_hash_hex(tx_hash) -> str:
     return tx_hash
 
 
-def decode_swap_event(log: dict) -> dict:
+def decode_swap_event_abi(log: dict) -> dict:
     """
-    Decode a Pair Swap event log.
+    Decode a Pair Swap event log with eth_abi (reference implementation).
 
     Event: Swap(address indexed sender, uint amount0In, uint amount1In, uint amount0Out, uint amount1Out, address indexed to)
     topic1=sender, topic2=to, data=amount0In, amount1In, amount0Out, amount1Out
@@ -181,9 +208,9 @@ def decode_swap_event(log: dict) -> dict:
         raise ValueError(f"Failed to decode Swap event: {e}") from e
 
 
-def decode_mint_event(log: dict) -> dict:
+def decode_mint_event_abi(log: dict) -> dict:
     """
-    Decode a Pair Mint event log.
+    Decode a Pair Mint event log with eth_abi (reference implementation).
 
     Event: Mint(address indexed sender, uint amount0, uint amount1)
     topic1=sender, data=amount0, amount1
@@ -216,9 +243,9 @@ def decode_mint_event(log: dict) -> dict:
         raise ValueError(f"Failed to decode Mint event: {e}") from e
 
 
-def decode_burn_event(log: dict) -> dict:
+def decode_burn_event_abi(log: dict) -> dict:
     """
-    Decode a Pair Burn event log.
+    Decode a Pair Burn event log with eth_abi (reference implementation).
 
     Event: Burn(address indexed sender, uint amount0, uint amount1, address indexed to)
     topic1=sender, topic2=to, data=amount0, amount1
@@ -253,6 +280,172 @@ def decode_burn_event(log: dict) -> dict:
         raise ValueError(f"Failed to decode Burn event: {e}") from e
 
 
+# Fast path: the events have fixed layouts, so 32-byte words are sliced out of
+# topics/data directly instead of going through eth_abi and hex strings.
+# Addresses stay raw 20-byte values and are checksummed only at the output
+# boundary (src.core.addresses.format_addresses).
+
+def _word_to_int(data: bytes, index: int) -> int:
+    """uint256 at word `index` of ABI-encoded data."""
+    return int.from_bytes(data[index * 32:(index + 1) * 32], 'big')
+
+
+def _word_to_address(word: bytes) -> bytes:
+    """Raw address from the low 20 bytes of a 32-byte word (checksummed at output, see src.core.addresses)."""
+    return bytes(word[-20:])
+
+
+def _topic_bytes(topic) -> bytes:
+    """Topic as bytes (HexBytes from web3 or a hex string from raw JSON)."""
+    return topic if isinstance(topic, bytes) else _hex_to_bytes(topic)
+
+
+def _check_layout(topics: list, num_topics: int, data: bytes, num_words: int, event: str) -> None:
+    if len(topics) < num_topics:
+        raise ValueError(f"Invalid number of topics for {event}: {len(topics)}")
+    if len(data) < num_words * 32:
+        raise ValueError(f"Data too short for {event}: {len(data)} bytes, expected {num_words * 32}")
+
+
+def decode_paircreated_event(log: dict) -> dict:
+    """
+    Decode a PairCreated event log (fast path; same fields as decode_paircreated_event_abi, addresses as raw 20 bytes).
+
+    Args:
+        log: Raw log dictionary from eth_getLogs
+
+    Returns:
+        dict: pair_address, token0, token1, pair_index, block_number, transaction_hash, log_index
+    """
+    try:
+        topics = log['topics']
+        data = _hex_to_bytes(log['data'])
+        _check_layout(topics, 3, data, 2, 'PairCreated')
+        event = {
+            'pair_address': _word_to_address(data[0:32]),
+            'token0': _word_to_address(_topic_bytes(topics[1])),
+            'token1': _word_to_address(_topic_bytes(topics[2])),
+            'pair_index': _word_to_int(data, 1),
+            'block_number': log['blockNumber'],
+            'transaction_hash': _tx_hash_hex(log['transactionHash']),
+            'log_index': log['logIndex'],
+        }
+    except Exception as e:
+        raise ValueError(f"Failed to decode PairCreated event: {e}") from e
+    return _crosscheck.check(event, decode_paircreated_event_abi, log)
+
+
+def decode_swap_event(log: dict) -> dict:
+    """
+    Decode a Pair Swap event log (fast path; same fields as decode_swap_event_abi, addresses as raw 20 bytes).
+
+    Args:
+        log: Raw log dictionary from eth_getLogs
+
+    Returns:
+        dict: pair_address, sender, amount0In, amount1In, amount0Out, amount1Out, to, block_number, transaction_hash, log_index
+    """
+    try:
+        topics = log['topics']
+        data = _hex_to_bytes(log['data'])
+        _check_layout(topics, 3, data, 4, 'Swap')
+        event = {
+            'event_type': 'swap',
+            'pair_address': to_address_bytes(log['address']),
+            'sender': _word_to_address(_topic_bytes(topics[1])),
+            'amount0In': _word_to_int(data, 0),
+            'amount1In': _word_to_int(data, 1),
+            'amount0Out': _word_to_int(data, 2),
+            'amount1Out': _word_to_int(data, 3),
+            'to': _word_to_address(_topic_bytes(topics[2])),
+            'block_number': log['blockNumber'],
+            'transaction_hash': _tx_hash_hex(log['transactionHash']),
+            'log_index': log['logIndex'],
+        }
+    except Exception as e:
+        raise ValueError(f"Failed to decode Swap event: {e}") from e
+    return _crosscheck.check(event, decode_swap_event_abi, log)
+
+
+def decode_mint_event(log: dict) -> dict:
+    """
+    Decode a Pair Mint event log (fast path; same fields as decode_mint_event_abi, addresses as raw 20 bytes).
+
+    Args:
+        log: Raw log dictionary from eth_getLogs
+
+    Returns:
+        dict: pair_address, sender, amount0, amount1, block_number, transaction_hash, log_index
+    """
+    try:
+        topics = log['topics']
+        data = _hex_to_bytes(log['data'])
+        _check_layout(topics, 2, data, 2, 'Mint')
+        event = {
+            'event_type': 'mint',
+            'pair_address': to_address_bytes(log['address']),
+            'sender': _word_to_address(_topic_bytes(topics[1])),
+            'amount0': _word_to_int(data, 0),
+            'amount1': _word_to_int(data, 1),
+            'block_number': log['blockNumber'],
+            'transaction_hash': _tx_hash_hex(log['transactionHash']),
+            'log_index': log['logIndex'],
+        }
+    except Exception as e:
+        raise ValueError(f"Failed to decode Mint event: {e}") from e
+    return _crosscheck.check(event, decode_mint_event_abi, log)
+
+
+def decode_burn_event(log: dict) -> dict:
+    """
+    Decode a Pair Burn event log (fast path; same fields as decode_burn_event_abi, addresses as raw 20 bytes).
+
+    Args:
+        log: Raw log dictionary from eth_getLogs
+
+    Returns:
+        dict: pair_address, sender, amount0, amount1, to, block_number, transaction_hash, log_index
+    """
+    try:
+        topics = log['topics']
+        data = _hex_to_bytes(log['data'])
+        _check_layout(topics, 3, data, 2, 'Burn')
+        event = {
+            'event_type': 'burn',
+            'pair_address': to_address_bytes(log['address']),
+            'sender': _word_to_address(_topic_bytes(topics[1])),
+            'amount0': _word_to_int(data, 0),
+            'amount1': _word_to_int(data, 1),
+            'to': _word_to_address(_topic_bytes(topics[2])),
+            'block_number': log['blockNumber'],
+            'transaction_hash': _tx_hash_hex(log['transactionHash']),
+            'log_index': log['logIndex'],
+        }
+    except Exception as e:
+        raise ValueError(f"Failed to decode Burn event: {e}") from e
+    return _crosscheck.check(event, decode_burn_event_abi, log)
+
+
+# topic0 -> decoder for events emitted by pair contracts, built once at import
+_pair_event_decoders = TopicRegistry('Pair')
+
+
+def register_pair_event_decoder(topic0, decoder) -> None:
+    """
+    Register a decoder for an additional Pair event type used by decode_pair_event.
+
+    Args:
+        topic0: Event signature hash (32 bytes or hex string)
+        decoder: Callable taking the raw log and returning the decoded event dict
+    """
+    _pair_event_decoders.register(topic0, decoder)
+
+
+register_pair_event_decoder(_SWAP_TOPIC, decode_swap_event)
+register_pair_event_decoder(_MINT_TOPIC, decode_mint_event)
+register_pair_event_decoder(_BURN_TOPIC, decode_burn_event)
+
+
 def decode_pair_event(log: dict) -> dict:
     """
     Determine Pair event type (swap, mint, burn) and decode using the appropriate decoder.
@@ -263,15 +456,74 @@ def decode_pair_event(log: dict) -> dict:
     Returns:
         dict: Decoded event with event_type and type-specific fields
     """
-    raw = log['topics'][0]
-    topic0 = (raw.hex() if isinstance(raw, bytes) else raw).lower().replace('0x', '')
-    swap = _SWAP_TOPIC.lower().replace('0x', '')
-    mint = _MINT_TOPIC.lower().replace('0x', '')
-    burn = _BURN_TOPIC.lower().replace('0x', '')
-    if topic0 == swap:
-        return decode_swap_event(log)
-    if topic0 == mint:
-        return decode_mint_event(log)
-    if topic0 == burn:
-        return decode_burn_event(log)
-    raise ValueError(f"Unknown Pair event topic0: {topic0}")
+    return _pair_event_decoders.decode(log)
+
+
+# Layouts for vectorized batch decoding (src.core.batch_decoder)
+_pair_event_layouts = TopicRegistry('Pair')
+_pair_event_layouts.register(_SWAP_TOPIC, EventLayout('swap', 'pair_address', 3, 4, [
+    ('sender', 'topic', 1, 'address'),
+    ('amount0In', 'data', 0, 'uint256'),
+    ('amount1In', 'data', 1, 'uint256'),
+    ('amount0Out', 'data', 2, 'uint256'),
+    ('amount1Out', 'data', 3, 'uint256'),
+    ('to', 'topic', 2, 'address'),
+]))
+_pair_event_layouts.register(_MINT_TOPIC, EventLayout('mint', 'pair_address', 2, 2, [
+    ('sender', 'topic', 1, 'address'),
+    ('amount0', 'data', 0, 'uint256'),
+    ('amount1', 'data', 1, 'uint256'),
+]))
+_pair_event_layouts.register(_BURN_TOPIC, EventLayout('burn', 'pair_address', 3, 2, [
+    ('sender', 'topic', 1, 'address'),
+    ('amount0', 'data', 0, 'uint256'),
+    ('amount1', 'data', 1, 'uint256'),
+    ('to', 'topic', 2, 'address'),
+]))
+
+
+def decode_pair_events_batch(logs: List[dict]) -> dict:
+    """
+    Decode many Pair events (swap, mint, burn) at once into columns.
+
+    Args:
+        logs: Raw log dictionaries from eth_getLogs
+
+    Returns:
+        dict: event_type -> {field: column}; amounts are uint64 arrays (object arrays
+            of Python ints when a value exceeds 64 bits), addresses raw 20 bytes.
+            src.core.batch_decoder.columns_to_events turns a group back into rows.
+    """
+    return decode_batches(logs, _pair_event_layouts)
+
+
+# Columns of a batch of decoded Pair events, in CSV output order (see src.core.event_batch)
+PAIR_EVENT_BATCH_FIELDS = [
+    ('event_type', TEXT), ('pair_address', ADDRESS), ('sender', ADDRESS), ('tx_from', ADDRESS),
+    ('amount0', AMOUNT), ('amount1', AMOUNT),
+    ('amount0In', AMOUNT), ('amount1In', AMOUNT), ('amount0Out', AMOUNT), ('amount1Out', AMOUNT),
+    ('to', ADDRESS), ('block_number', INT64), ('transaction_hash', HASH), ('log_index', INT64),
+]
+
+# Reference decoders the cross-check compares batch-decoded rows with
+_pair_event_references = TopicRegistry('Pair')
+_pair_event_references.register(_SWAP_TOPIC, decode_swap_event_abi)
+_pair_event_references.register(_MINT_TOPIC, decode_mint_event_abi)
+_pair_event_references.register(_BURN_TOPIC, decode_burn_event_abi)
+
+
+def decode_pair_logs(logs: List[dict]) -> Tuple[EventBatch, List[int], List[Tuple[int, str]]]:
+    """
+    Decode Pair logs (swap, mint, burn and registered extra types) into one EventBatch.
+
+    Args:
+        logs: Raw log dictionaries from eth_getLogs
+
+    Returns:
+        (batch, positions, errors): events in log order (tx_from still empty), the index
+            in `logs` of every row, and (index, error message) for logs that could not be decoded
+    """
+    return decode_event_batch(
+        logs, _pair_event_layouts, _pair_event_decoders, PAIR_EVENT_BATCH_FIELDS,
+        _crosscheck, _pair_event_references,
+    )
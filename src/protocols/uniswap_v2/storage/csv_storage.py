@@ -1,11 +1,47 @@
 """Storage utilities for saving indexed pair data."""
 
 import os
-import pandas as pd
 from typing import List
 
+from src.core.addresses import format_addresses
+from src.core.csv_append import append_csv_rows, create_csv, reset_key_index
+from src.core.csv_writer import CsvWriter, compressed_path
+from src.core.event_batch import EventBatch
+from src.protocols.uniswap_v2.decoders.event_decoder import PAIR_EVENT_BATCH_FIELDS
 
-def save_pairs_to_csv(pairs: List[dict], filename: str) -> None:
+
+DATA_DIR = 'data/uniswap_v2'
+
+
+PAIR_COLUMNS = [
+    'pair_address',
+    'token0',
+    'token1',
+    'pair_index',
+    'block_number',
+    'timestamp',
+    'transaction_hash',
+    'log_index',
+]
+
+
+def create_pairs_csv(filename: str) -> str:
+    """
+    Create (or truncate) a pairs CSV with only the header row, for chunked appends.
+
+    Args:
+        filename: Output CSV filename (will be saved in data/ directory)
+
+    Returns:
+        str: Path of the created file
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    filepath = os.path.join(DATA_DIR, filename)
+    create_csv(filepath, PAIR_COLUMNS)
+    return filepath
+
+
+def save_pairs_to_csv(pairs: List[dict], filename: str, append: bool = False) -> int:
     """
     Save list of pairs to CSV file in data/ directory.
     
@@ -18,65 +54,113 @@ def save_pairs_to_csv(pairs: List[dict], filename: str) -> None:
             - block_number: Block number where pair was created
             - timestamp: Unix timestamp of the block
             - transaction_hash: Transaction hash that created the pair
+            - log_index: Log index of the PairCreated event
         filename: Output CSV filename (will be saved in data/ directory)
+        append: Append only rows whose (transaction_hash, log_index) is not in the file yet
+            (see src.core.csv_append); the file is created with its header if missing
+
+    Returns:
+        int: Rows written
     """
     if not pairs:
-        print("No pairs to save")
-        return
+        if not append:
+            print("No pairs to save")
+        return 0
     
     # Ensure data directory exists
-    data_dir = 'data/uniswap_v2'
-    os.makedirs(data_dir, exist_ok=True)
+    os.makedirs(DATA_DIR, exist_ok=True)
     
     # Create full path
-    filepath = os.path.join(data_dir, filename)
-    
-    # Create DataFrame with specified column order
-    df = pd.DataFrame(pairs, columns=[
-        'pair_address',
-        'token0',
-        'token1',
-        'pair_index',
-        'block_number',
-        'timestamp',
-        'transaction_hash'
-    ])
+    filepath = os.path.join(DATA_DIR, filename)
     
+    rows = [format_addresses(pair) for pair in pairs]
+    if append:
+        return append_csv_rows(filepath, rows, PAIR_COLUMNS)
+
     # Save to CSV in UTF-8 without BOM to avoid encoding issues
-    df.to_csv(filepath, index=False, encoding='utf-8')
+    reset_key_index(filepath)
+    writer = CsvWriter(filepath, PAIR_COLUMNS)
+    writer.write(rows)
+    writer.close()
     print(f"Saved {len(pairs)} pairs to {filepath}")
+    return len(pairs)
+
 
+PAIR_EVENT_COLUMNS = [
+    'event_type', 'pair_address', 'sender', 'tx_from',
+    'amount0', 'amount1', 'amount0In', 'amount1In', 'amount0Out', 'amount1Out',
+    'to', 'block_number', 'transaction_hash', 'log_index'
+]
 
-def save_pair_events_to_csv(events: List[dict], filename: str) -> None:
+
+def create_pair_events_csv(filename: str) -> str:
+    """
+    Create (or truncate) a Pair events CSV with only the header row, for chunked appends.
+
+    Args:
+        filename: Output CSV filename (will be saved in data/ directory)
+
+    Returns:
+        str: Path of the created file
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    filepath = os.path.join(DATA_DIR, filename)
+    create_csv(filepath, PAIR_EVENT_COLUMNS)
+    return filepath
+
+
+def save_pair_events_to_csv(events, filename: str, append: bool = False, compression: str = 'none') -> int:
     """
     Save list of Pair events (Swap, Mint, Burn) to CSV file in data/ directory.
 
     Args:
-        events: List of event dicts with at least:
+        events: EventBatch of decoded events (src.core.event_batch), or a list of event dicts with at least:
             - event_type: 'swap' | 'mint' | 'burn'
             - pair_address, sender, tx_from, block_number, transaction_hash, log_index
             - swap: amount0In, amount1In, amount0Out, amount1Out, to
             - mint/burn: amount0, amount1; burn also has to
         filename: Output CSV filename (will be saved in data/ directory)
+        append: Append only rows whose (transaction_hash, log_index) is not in the file yet
+            (see src.core.csv_append); the file is created with its header if missing
+        compression: 'none', 'gzip' or 'zstd' (adds .gz / .zst to filename; not with append)
+
+    Returns:
+        int: Rows written
     """
     if not events:
-        print("No pair events to save")
-        return
-
-    data_dir = 'data/uniswap_v2'
-    os.makedirs(data_dir, exist_ok=True)
-    filepath = os.path.join(data_dir, filename)
-
-    columns = [
-        'event_type', 'pair_address', 'sender', 'tx_from',
-        'amount0', 'amount1', 'amount0In', 'amount1In', 'amount0Out', 'amount1Out',
-        'to', 'block_number', 'transaction_hash', 'log_index'
-    ]
-    rows = []
-    for e in events:
-        row = {k: e.get(k, '') for k in columns}
-        rows.append(row)
-
-    df = pd.DataFrame(rows, columns=columns)
-    df.to_csv(filepath, index=False, encoding='utf-8')
+        if not append:
+            print("No pair events to save")
+        return 0
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    filepath = os.path.join(DATA_DIR, filename)
+
+    if not isinstance(events, EventBatch):
+        events = EventBatch.from_events(PAIR_EVENT_BATCH_FIELDS, events)
+
+    if append:
+        data = {column: events.formatted_column(column) for column in PAIR_EVENT_COLUMNS}
+        return append_csv_rows(filepath, data, PAIR_EVENT_COLUMNS)
+    reset_key_index(filepath)
+    filepath = compressed_path(filepath, compression)
+    writer = CsvWriter(filepath, PAIR_EVENT_COLUMNS, compression)
+    writer.write(events)
+    writer.close()
     print(f"Saved {len(events)} pair events to {filepath}")
+    return len(events)
+
+
+def open_pair_events_csv(filename: str, compression: str) -> CsvWriter:
+    """
+    Streaming writer of a Pair events CSV compressed on the fly (CSV_COMPRESSION).
+
+    Args:
+        filename: Output CSV filename (will be saved in data/ directory; .gz / .zst is added)
+        compression: 'gzip' or 'zstd'
+
+    Returns:
+        CsvWriter: write(events) per chunk, close() at the end
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    filepath = compressed_path(os.path.join(DATA_DIR, filename), compression)
+    return CsvWriter(filepath, PAIR_EVENT_COLUMNS, compression)
@@ -0,0 +1,59 @@
+"""Typed Parquet storage for Uniswap V2 Pair events (--format parquet)."""
+
+import os
+from typing import Dict
+
+from src.core.event_batch import ADDRESS, AMOUNT, HASH, INT32, INT64
+from src.core.parquet_sink import ParquetEventWriter
+from src.protocols.uniswap_v2.storage.csv_storage import DATA_DIR
+
+
+_COMMON_FIELDS = [
+    ('block_number', INT64),
+    ('transaction_hash', HASH),
+    ('log_index', INT32),
+]
+
+# Columns of every Pair event type, in output order (see src.core.event_batch for the kinds)
+PAIR_EVENT_FIELDS = {
+    'swap': [
+        ('pair_address', ADDRESS), ('sender', ADDRESS), ('tx_from', ADDRESS),
+        ('amount0In', AMOUNT), ('amount1In', AMOUNT), ('amount0Out', AMOUNT), ('amount1Out', AMOUNT),
+        ('to', ADDRESS),
+    ] + _COMMON_FIELDS,
+    'mint': [
+        ('pair_address', ADDRESS), ('sender', ADDRESS), ('tx_from', ADDRESS),
+        ('amount0', AMOUNT), ('amount1', AMOUNT),
+    ] + _COMMON_FIELDS,
+    'burn': [
+        ('pair_address', ADDRESS), ('sender', ADDRESS), ('tx_from', ADDRESS),
+        ('amount0', AMOUNT), ('amount1', AMOUNT), ('to', ADDRESS),
+    ] + _COMMON_FIELDS,
+}
+
+
+def pair_events_parquet_paths() -> Dict[str, str]:
+    """Output file of every Pair event type: data/uniswap_v2/uniswap_v2_{event_type}_events.parquet."""
+    return {
+        event_type: os.path.join(DATA_DIR, f"uniswap_v2_{event_type}_events.parquet")
+        for event_type in PAIR_EVENT_FIELDS
+    }
+
+
+def open_pair_events_parquet(config: dict) -> ParquetEventWriter:
+    """
+    Parquet writer for Pair events, one file per event type.
+
+    Args:
+        config: Configuration (PARQUET_COMPRESSION, PARQUET_ROW_GROUP_BLOCKS, PARQUET_AMOUNTS)
+
+    Returns:
+        ParquetEventWriter: write(events, start_block, end_block) per chunk, close() at the end
+    """
+    return ParquetEventWriter(
+        pair_events_parquet_paths(),
+        PAIR_EVENT_FIELDS,
+        compression=config['PARQUET_COMPRESSION'],
+        row_group_blocks=config['PARQUET_ROW_GROUP_BLOCKS'],
+        amounts=config['PARQUET_AMOUNTS'],
+    )
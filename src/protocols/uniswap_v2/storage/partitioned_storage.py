@@ -0,0 +1,51 @@
+"""Partitioned Uniswap V2 Pair events dataset (--layout partitioned)."""
+
+import os
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from src.core.partitions import PartitionedEventWriter, read_events
+from src.protocols.uniswap_v2.storage.csv_storage import DATA_DIR
+from src.protocols.uniswap_v2.storage.parquet_storage import PAIR_EVENT_FIELDS
+
+
+EVENTS_DIR = os.path.join(DATA_DIR, 'events')
+
+
+def open_pair_events_partitioned(config: dict, start_block: int, end_block: int) -> PartitionedEventWriter:
+    """
+    Partitioned writer for Pair events of blocks [start_block, end_block] (see src.core.partitions).
+
+    Args:
+        config: Configuration (OUTPUT_FORMAT, PARTITION_BLOCKS, PARTITION_PAIR_BUCKETS, PARQUET_*)
+        start_block: First block of the run
+        end_block: Last block of the run
+
+    Returns:
+        PartitionedEventWriter: write(events, start_block, end_block) per chunk, close() at the end
+    """
+    return PartitionedEventWriter(EVENTS_DIR, PAIR_EVENT_FIELDS, 'pair_address', start_block, end_block, config)
+
+
+def read_pair_events(
+    event_type: str,
+    start_block: Optional[int] = None,
+    end_block: Optional[int] = None,
+    pairs: Optional[Sequence[str]] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Pair events of one type from data/uniswap_v2/events, opening only the partitions the query needs.
+
+    Args:
+        event_type: Event type (e.g. 'swap')
+        start_block: First block (inclusive, None = unbounded)
+        end_block: Last block (inclusive, None = unbounded)
+        pairs: Only events of these pair addresses (None = all)
+        columns: Columns to return (None = all)
+
+    Returns:
+        pd.DataFrame: Matching events ordered by (block_number, log_index)
+    """
+    return read_events(EVENTS_DIR, event_type, start_block, end_block, pairs, columns)
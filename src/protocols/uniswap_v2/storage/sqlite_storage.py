@@ -0,0 +1,73 @@
+"""SQLite storage for Uniswap V2 Pair events (--format sqlite)."""
+
+import os
+from typing import Optional
+
+import pandas as pd
+
+from src.core.sqlite_sink import SQLiteEventStore
+from src.protocols.uniswap_v2.decoders.event_decoder import PAIR_EVENT_BATCH_FIELDS
+from src.protocols.uniswap_v2.storage.csv_storage import DATA_DIR
+
+
+DB_PATH = os.path.join(DATA_DIR, 'uniswap_v2.sqlite')
+
+# Same columns as the CSV output, typed (see src.core.sqlite_sink)
+PAIR_EVENT_SQL_COLUMNS = PAIR_EVENT_BATCH_FIELDS
+
+
+def open_pair_events_store(path: str = DB_PATH) -> SQLiteEventStore:
+    """Pair events table (pair_events) of the SQLite database at `path`."""
+    return SQLiteEventStore(path, 'pair_events', PAIR_EVENT_SQL_COLUMNS, 'pair_address')
+
+
+def save_pair_events_to_sqlite(events, path: str = DB_PATH) -> int:
+    """
+    Insert Pair events (Swap, Mint, Burn) into the SQLite database, skipping events already stored.
+
+    Args:
+        events: EventBatch or decoded event dicts (see save_pair_events_to_csv)
+        path: Database file (default data/uniswap_v2/uniswap_v2.sqlite)
+
+    Returns:
+        int: Rows inserted
+    """
+    store = open_pair_events_store(path)
+    try:
+        inserted = store.insert(events)
+        store.create_indexes()
+    finally:
+        store.close()
+    print(f"Saved {inserted} pair events to {path}")
+    return inserted
+
+
+def query_pair_events(
+    pair: Optional[str] = None,
+    start_block: Optional[int] = None,
+    end_block: Optional[int] = None,
+    event_type: Optional[str] = None,
+    transaction_hash: Optional[str] = None,
+    limit: Optional[int] = None,
+    path: str = DB_PATH,
+) -> pd.DataFrame:
+    """
+    Pair events from the SQLite database, e.g. all swaps of one pair between two blocks.
+
+    Args:
+        pair: Pair address
+        start_block: First block (inclusive)
+        end_block: Last block (inclusive)
+        event_type: Event type (e.g. 'swap')
+        transaction_hash: Transaction hash
+        limit: Maximum number of rows
+        path: Database file
+
+    Returns:
+        pd.DataFrame: Matching events ordered by (block_number, log_index)
+    """
+    store = open_pair_events_store(path)
+    try:
+        return store.query(pair, start_block, end_block, event_type, transaction_hash, limit)
+    finally:
+        store.close()
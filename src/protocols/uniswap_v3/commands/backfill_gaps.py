@@ -0,0 +1,98 @@
+"""Command to re-fetch the block ranges of the Uniswap V3 gaps ledger."""
+
+import os
+
+from src.core.addresses import address_cache_summary, configure_address_cache
+from src.core.checkpoint import Checkpoint
+from src.core.gaps import GapLedger, configure_gap_ledger, gap_command, output_kind
+from src.core.parallel_decode import open_decode_pool
+from src.core.rate_limiter import configure_rate_limiter
+from src.core.rpc_cache import configure_rpc_cache
+from src.core.rpc_recorder import configure_rpc_recorder
+from src.protocols.uniswap_v3.core.config import load_config
+from src.protocols.uniswap_v3.core.rpc import get_web3
+from src.protocols.uniswap_v3.decoders.event_decoder import configure_decoder_crosscheck
+from src.protocols.uniswap_v3.indexers.factory_indexer import backfill_pools
+from src.protocols.uniswap_v3.indexers.pools_indexer import backfill_pool_events
+from src.protocols.uniswap_v3.storage.csv_storage import DATA_DIR, save_pool_events_to_csv, save_pools_to_csv
+
+
+def _backfill(w3, config: dict, command: str, filename: str, save, decode_pool) -> None:
+    """Fill the open gaps of one command, appending to its output and checkpoint."""
+    ledger = configure_gap_ledger(config['CHECKPOINT_DIR'], 'uniswap_v3', command)
+    intervals = ledger.intervals(command)
+    print(f"\n[{command}] {len(intervals)} gaps, {sum(end - start + 1 for start, end in intervals)} blocks")
+    if not intervals:
+        return
+    checkpoint = Checkpoint(config['CHECKPOINT_DIR'], 'uniswap_v3', command)
+    filepath = os.path.join(DATA_DIR, filename)
+    if checkpoint.load() is None or not os.path.isfile(filepath):
+        print(f"No checkpointed output {filepath} to backfill into; run {command} first")
+        return
+    # Drop rows written after the last checkpoint before appending
+    checkpoint.resume(checkpoint.state['start_block'], checkpoint.state['end_block'], filepath)
+
+    def write_piece(rows, start_block, end_block):
+        checkpoint.commit(checkpoint.state['end_block'], save(rows, filename, append=True))
+        ledger.resolve(command, start_block, end_block)
+
+    if command == 'index-pools':
+        # pair_index continues after the pools already written
+        total = backfill_pools(w3, config, intervals, write_piece, first_pair_index=checkpoint.rows)
+    else:
+        total = backfill_pool_events(w3, config, intervals, write_piece, csv_path="data/uniswap_v3/uniswap_v3_pools.csv", executor=decode_pool)
+    still_open = ledger.intervals(command)
+    print(f"Backfilled {total} rows into {filepath}; {len(still_open)} gaps still open")
+
+
+def run(overrides: dict = None):
+    """
+    Execute the backfill of every open gap of the CSV outputs (index-pools and index-pool-events).
+
+    Args:
+        overrides: Config values set from CLI flags (see load_config)
+    """
+    print("=== Uniswap V3 Gap Backfill ===\n")
+
+    print("Loading configuration...")
+    config = load_config(overrides)
+    if output_kind(config) != 'csv':
+        command = gap_command('index-pool-events', config)
+        gaps = GapLedger(config['CHECKPOINT_DIR'], 'uniswap_v3').intervals(command)
+        print(f"backfill-gaps only fills the plain CSV outputs, not {output_kind(config)}; "
+              f"re-index the {len(gaps)} gaps of [{command}] with START_BLOCK / BLOCK_RANGE instead")
+        for start, end in gaps:
+            print(f"  Gap: {start}-{end} ({end - start + 1} blocks)")
+        return
+    configure_rate_limiter(config['RPC_RATE_LIMIT'], config['RPC_RATE_LIMIT_UNIT'], config['RPC_RATE_BURST'])
+    rpc_cache = configure_rpc_cache(
+        config['RPC_CACHE_DIR'], config['RPC_CACHE_MAX_MB'], config['FINALITY_DEPTH'], config['RPC_CACHE']
+    )
+    recorder = configure_rpc_recorder(config['RPC_RECORD_DIR'])
+    crosscheck = configure_decoder_crosscheck(config['DECODER_CROSSCHECK'])
+    configure_address_cache(config['ADDRESS_CACHE_SIZE'])
+    print(f"Batch Size: {config['BATCH_SIZE']}")
+    print(f"Fetch Workers: {config['FETCH_CONCURRENCY']}\n")
+
+    print(f"Connecting to RPC: {config['RPC_URL']}")
+    w3 = get_web3(config['RPC_URL'])
+    print("Successfully connected to RPC")
+
+    decode_pool = open_decode_pool(config['DECODE_WORKERS'], configure_decoder_crosscheck, (config['DECODER_CROSSCHECK'],))
+    try:
+        _backfill(w3, config, 'index-pools', 'uniswap_v3_pools.csv', save_pools_to_csv, decode_pool)
+        _backfill(w3, config, 'index-pool-events', 'uniswap_v3_pool_events.csv', save_pool_events_to_csv, decode_pool)
+    finally:
+        if decode_pool is not None:
+            decode_pool.shutdown()
+    for command in GapLedger(config['CHECKPOINT_DIR'], 'uniswap_v3').commands():
+        if command not in ('index-pools', 'index-pool-events'):
+            print(f"\n[{command}] gaps left open: backfill-gaps only fills the plain CSV outputs")
+
+    if crosscheck.rate:
+        print(crosscheck.summary())
+    print(address_cache_summary())
+    if rpc_cache:
+        print(rpc_cache.summary())
+    if recorder:
+        print(f"Recorded {recorder.recorded} RPC responses to {recorder.path}")
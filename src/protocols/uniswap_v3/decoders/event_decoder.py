@@ -1,8 +1,16 @@
 """Decoder for Uniswap V3 Factory PoolCreated and Pool (Initialize, Mint, Burn, Collect, Swap, Flash) events."""
 
+from typing import List, Tuple
+
 from web3 import Web3
 from eth_abi import decode
 
+from src.core.addresses import to_address_bytes
+from src.core.batch_decoder import EventLayout, decode_batches, decode_event_batch
+from src.core.decoder_check import DecoderCrossCheck
+from src.core.event_batch import ADDRESS, AMOUNT, HASH, INT32, INT64, TEXT, EventBatch
+from src.core.topic_registry import TopicRegistry
+
 
 # Pool event signatures (topic0) - keccak256 of event signature
 _INITIALIZE_TOPIC = Web3.keccak(text='Initialize(uint160,int24)').hex()
@@ -12,6 +20,27 @@ _COLLECT_TOPIC = Web3.keccak(text='Collect(address,address,int24,int24,uint128,u
 _SWAP_TOPIC = Web3.keccak(text='Swap(address,address,int256,int256,uint160,uint128,int24)').hex()
 _FLASH_TOPIC = Web3.keccak(text='Flash(address,address,uint256,uint256,uint256,uint256)').hex()
 
+# Samples fast-path results against the eth_abi decoders (DECODER_CROSSCHECK)
+_crosscheck = DecoderCrossCheck('Uniswap V3')
+
+_INT24_MIN, _INT24_MAX = -(1 << 23), (1 << 23) - 1
+_UINT128_LIMIT = 1 << 128
+_UINT160_LIMIT = 1 << 160
+
+
+def configure_decoder_crosscheck(rate: float) -> DecoderCrossCheck:
+    """
+    Set the share of events whose fast-path decoding is validated against eth_abi.
+
+    Args:
+        rate: 0.0 (off) to 1.0 (every event)
+
+    Returns:
+        DecoderCrossCheck: Checker holding the statistics
+    """
+    _crosscheck.configure(rate)
+    return _crosscheck
+
 
 def get_poolcreated_event_signature() -> str:
     """
@@ -25,9 +54,9 @@ def get_poolcreated_event_signature() -> str:
     return '0x783cca1c0412dd0d695e784568c96da2e9c22ff989357a2e8b1d9b2b4e6b7118'
 
 
-def decode_poolcreated_event(log: dict) -> dict:
+def decode_poolcreated_event_abi(log: dict) -> dict:
     """
-    Decode a PoolCreated event log.
+    Decode a PoolCreated event log with eth_abi (reference implementation).
     
     Event structure:
         - topic0: event signature hash
@@ -48,6 +77,7 @@ def decode_poolcreated_event(log: dict) -> dict:
             - tick_spacing: Tick spacing for the pool (int24)
             - block_number: Block number where pool was created
             - transaction_hash: Transaction hash that created the pool
+            - log_index: Log index of the event
     """
     try:
         topics = log['topics']
@@ -89,7 +119,8 @@ def decode_poolcreated_event(log: dict) -> dict:
             'fee': fee,
             'tick_spacing': tick_spacing,
             'block_number': log['blockNumber'],
-            'transaction_hash': log['transactionHash'].hex() if isinstance(log['transactionHash'], bytes) else log['transactionHash']
+            'transaction_hash': log['transactionHash'].hex() if isinstance(log['transactionHash'], bytes) else log['transactionHash'],
+            'log_index': log['logIndex'],
         }
         
     except Exception as e:
@@ -185,9 +216,9 @@ def _tx_hash_hex(tx_hash) -> str:
     return tx_hash
 
 
-def decode_initialize_event(log: dict) -> dict:
+def decode_initialize_event_abi(log: dict) -> dict:
     """
-    Decode a Pool Initialize event log.
+    Decode a Pool Initialize event log with eth_abi (reference implementation).
     
     Event: Initialize(uint160 sqrtPriceX96, int24 tick)
     No indexed parameters, all data in data field.
@@ -215,9 +246,9 @@ def decode_initialize_event(log: dict) -> dict:
         raise ValueError(f"Failed to decode Initialize event: {e}") from e
 
 
-def decode_mint_event(log: dict) -> dict:
+def decode_mint_event_abi(log: dict) -> dict:
     """
-    Decode a Pool Mint event log.
+    Decode a Pool Mint event log with eth_abi (reference implementation).
     
     Event: Mint(address sender, address indexed owner, int24 indexed tickLower, int24 indexed tickUpper, uint128 amount, uint256 amount0, uint256 amount1)
     topic1=owner, topic2=tickLower, topic3=tickUpper
@@ -260,9 +291,9 @@ def decode_mint_event(log: dict) -> dict:
         raise ValueError(f"Failed to decode Mint event: {e}") from e
 
 
-def decode_burn_event(log: dict) -> dict:
+def decode_burn_event_abi(log: dict) -> dict:
     """
-    Decode a Pool Burn event log.
+    Decode a Pool Burn event log with eth_abi (reference implementation).
     
     Event: Burn(address indexed owner, int24 indexed tickLower, int24 indexed tickUpper, uint128 amount, uint256 amount0, uint256 amount1)
     topic1=owner, topic2=tickLower, topic3=tickUpper
@@ -303,9 +334,9 @@ def decode_burn_event(log: dict) -> dict:
         raise ValueError(f"Failed to decode Burn event: {e}") from e
 
 
-def decode_collect_event(log: dict) -> dict:
+def decode_collect_event_abi(log: dict) -> dict:
     """
-    Decode a Pool Collect event log.
+    Decode a Pool Collect event log with eth_abi (reference implementation).
     
     Event: Collect(address indexed owner, address recipient, int24 indexed tickLower, int24 indexed tickUpper, uint128 amount0, uint128 amount1)
     topic1=owner, topic2=tickLower, topic3=tickUpper
@@ -347,9 +378,9 @@ def decode_collect_event(log: dict) -> dict:
         raise ValueError(f"Failed to decode Collect event: {e}") from e
 
 
-def decode_swap_event(log: dict) -> dict:
+def decode_swap_event_abi(log: dict) -> dict:
     """
-    Decode a Pool Swap event log.
+    Decode a Pool Swap event log with eth_abi (reference implementation).
     
     Event: Swap(address indexed sender, address indexed recipient, int256 amount0, int256 amount1, uint160 sqrtPriceX96, uint128 liquidity, int24 tick)
     topic1=sender, topic2=recipient, data=amount0, amount1, sqrtPriceX96, liquidity, tick
@@ -389,9 +420,9 @@ def decode_swap_event(log: dict) -> dict:
         raise ValueError(f"Failed to decode Swap event: {e}") from e
 
 
-def decode_flash_event(log: dict) -> dict:
+def decode_flash_event_abi(log: dict) -> dict:
     """
-    Decode a Pool Flash event log.
+    Decode a Pool Flash event log with eth_abi (reference implementation).
     
     Event: Flash(address indexed sender, address indexed recipient, uint256 amount0, uint256 amount1, uint256 paid0, uint256 paid1)
     topic1=sender, topic2=recipient, data=amount0, amount1, paid0, paid1
@@ -430,6 +461,287 @@ def decode_flash_event(log: dict) -> dict:
         raise ValueError(f"Failed to decode Flash event: {e}") from e
 
 
+# Fast path: the events have fixed layouts, so 32-byte words are sliced out of
+# topics/data directly instead of going through eth_abi. Signed values are read
+# as two's complement; int24 / uint128 / uint160 words are range-checked the
+# way eth_abi validates their padding.
+# Addresses stay raw 20-byte values and are checksummed only at the output
+# boundary (src.core.addresses.format_addresses).
+
+def _word_to_address(word: bytes) -> bytes:
+    """Raw address from the low 20 bytes of a 32-byte word (checksummed at output, see src.core.addresses)."""
+    return bytes(word[-20:])
+
+
+def _topic_bytes(topic) -> bytes:
+    """Topic as bytes (HexBytes from web3 or a hex string from raw JSON)."""
+    return topic if isinstance(topic, bytes) else _hex_to_bytes(topic)
+
+
+def _int24(word: bytes) -> int:
+    value = int.from_bytes(word, 'big', signed=True)
+    if not _INT24_MIN <= value <= _INT24_MAX:
+        raise ValueError(f"int24 value out of range: {value}")
+    return value
+
+
+def _uint(word: bytes, limit: int, type_name: str) -> int:
+    value = int.from_bytes(word, 'big')
+    if value >= limit:
+        raise ValueError(f"{type_name} value out of range: {value}")
+    return value
+
+
+def _check_layout(topics: list, num_topics: int, data: bytes, num_words: int, event: str) -> None:
+    if len(topics) < num_topics:
+        raise ValueError(f"Invalid number of topics for {event}: {len(topics)}")
+    if len(data) < num_words * 32:
+        raise ValueError(f"Data too short for {event}: {len(data)} bytes, expected {num_words * 32}")
+
+
+def decode_poolcreated_event(log: dict) -> dict:
+    """
+    Decode a PoolCreated event log (fast path; same fields as decode_poolcreated_event_abi, addresses as raw 20 bytes).
+
+    Args:
+        log: Raw log dictionary from eth_getLogs
+
+    Returns:
+        dict: pool_address, token0, token1, fee, tick_spacing, block_number, transaction_hash, log_index
+    """
+    try:
+        topics = log['topics']
+        data = _hex_to_bytes(log['data'])
+        _check_layout(topics, 4, data, 2, 'PoolCreated')
+        event = {
+            'pool_address': _word_to_address(data[32:64]),
+            'token0': _word_to_address(_topic_bytes(topics[1])),
+            'token1': _word_to_address(_topic_bytes(topics[2])),
+            'fee': int.from_bytes(_topic_bytes(topics[3])[-3:], 'big'),
+            'tick_spacing': _int24(data[0:32]),
+            'block_number': log['blockNumber'],
+            'transaction_hash': _tx_hash_hex(log['transactionHash']),
+            'log_index': log['logIndex'],
+        }
+    except Exception as e:
+        raise ValueError(f"Failed to decode PoolCreated event: {e}") from e
+    return _crosscheck.check(event, decode_poolcreated_event_abi, log)
+
+
+def decode_initialize_event(log: dict) -> dict:
+    """
+    Decode a Pool Initialize event log (fast path; same fields as decode_initialize_event_abi, addresses as raw 20 bytes).
+
+    Args:
+        log: Raw log dictionary from eth_getLogs
+
+    Returns:
+        dict: pool_address, sqrtPriceX96, tick, block_number, transaction_hash, log_index
+    """
+    try:
+        data = _hex_to_bytes(log['data'])
+        _check_layout([], 0, data, 2, 'Initialize')
+        event = {
+            'event_type': 'initialize',
+            'pool_address': to_address_bytes(log['address']),
+            'sqrtPriceX96': _uint(data[0:32], _UINT160_LIMIT, 'uint160'),
+            'tick': _int24(data[32:64]),
+            'block_number': log['blockNumber'],
+            'transaction_hash': _tx_hash_hex(log['transactionHash']),
+            'log_index': log['logIndex'],
+        }
+    except Exception as e:
+        raise ValueError(f"Failed to decode Initialize event: {e}") from e
+    return _crosscheck.check(event, decode_initialize_event_abi, log)
+
+
+def decode_mint_event(log: dict) -> dict:
+    """
+    Decode a Pool Mint event log (fast path; same fields as decode_mint_event_abi, addresses as raw 20 bytes).
+
+    Args:
+        log: Raw log dictionary from eth_getLogs
+
+    Returns:
+        dict: pool_address, sender, owner, tickLower, tickUpper, amount, amount0, amount1, block_number, transaction_hash, log_index
+    """
+    try:
+        topics = log['topics']
+        data = _hex_to_bytes(log['data'])
+        _check_layout(topics, 4, data, 4, 'Mint')
+        event = {
+            'event_type': 'mint',
+            'pool_address': to_address_bytes(log['address']),
+            'sender': _word_to_address(data[0:32]),
+            'owner': _word_to_address(_topic_bytes(topics[1])),
+            'tickLower': int.from_bytes(_topic_bytes(topics[2]), 'big', signed=True),
+            'tickUpper': int.from_bytes(_topic_bytes(topics[3]), 'big', signed=True),
+            'amount': _uint(data[32:64], _UINT128_LIMIT, 'uint128'),
+            'amount0': int.from_bytes(data[64:96], 'big'),
+            'amount1': int.from_bytes(data[96:128], 'big'),
+            'block_number': log['blockNumber'],
+            'transaction_hash': _tx_hash_hex(log['transactionHash']),
+            'log_index': log['logIndex'],
+        }
+    except Exception as e:
+        raise ValueError(f"Failed to decode Mint event: {e}") from e
+    return _crosscheck.check(event, decode_mint_event_abi, log)
+
+
+def decode_burn_event(log: dict) -> dict:
+    """
+    Decode a Pool Burn event log (fast path; same fields as decode_burn_event_abi, addresses as raw 20 bytes).
+
+    Args:
+        log: Raw log dictionary from eth_getLogs
+
+    Returns:
+        dict: pool_address, owner, tickLower, tickUpper, amount, amount0, amount1, block_number, transaction_hash, log_index
+    """
+    try:
+        topics = log['topics']
+        data = _hex_to_bytes(log['data'])
+        _check_layout(topics, 4, data, 3, 'Burn')
+        event = {
+            'event_type': 'burn',
+            'pool_address': to_address_bytes(log['address']),
+            'owner': _word_to_address(_topic_bytes(topics[1])),
+            'tickLower': int.from_bytes(_topic_bytes(topics[2]), 'big', signed=True),
+            'tickUpper': int.from_bytes(_topic_bytes(topics[3]), 'big', signed=True),
+            'amount': _uint(data[0:32], _UINT128_LIMIT, 'uint128'),
+            'amount0': int.from_bytes(data[32:64], 'big'),
+            'amount1': int.from_bytes(data[64:96], 'big'),
+            'block_number': log['blockNumber'],
+            'transaction_hash': _tx_hash_hex(log['transactionHash']),
+            'log_index': log['logIndex'],
+        }
+    except Exception as e:
+        raise ValueError(f"Failed to decode Burn event: {e}") from e
+    return _crosscheck.check(event, decode_burn_event_abi, log)
+
+
+def decode_collect_event(log: dict) -> dict:
+    """
+    Decode a Pool Collect event log (fast path; same fields as decode_collect_event_abi, addresses as raw 20 bytes).
+
+    Args:
+        log: Raw log dictionary from eth_getLogs
+
+    Returns:
+        dict: pool_address, owner, recipient, tickLower, tickUpper, amount0, amount1, block_number, transaction_hash, log_index
+    """
+    try:
+        topics = log['topics']
+        data = _hex_to_bytes(log['data'])
+        _check_layout(topics, 4, data, 3, 'Collect')
+        event = {
+            'event_type': 'collect',
+            'pool_address': to_address_bytes(log['address']),
+            'owner': _word_to_address(_topic_bytes(topics[1])),
+            'recipient': _word_to_address(data[0:32]),
+            'tickLower': int.from_bytes(_topic_bytes(topics[2]), 'big', signed=True),
+            'tickUpper': int.from_bytes(_topic_bytes(topics[3]), 'big', signed=True),
+            'amount0': _uint(data[32:64], _UINT128_LIMIT, 'uint128'),
+            'amount1': _uint(data[64:96], _UINT128_LIMIT, 'uint128'),
+            'block_number': log['blockNumber'],
+            'transaction_hash': _tx_hash_hex(log['transactionHash']),
+            'log_index': log['logIndex'],
+        }
+    except Exception as e:
+        raise ValueError(f"Failed to decode Collect event: {e}") from e
+    return _crosscheck.check(event, decode_collect_event_abi, log)
+
+
+def decode_swap_event(log: dict) -> dict:
+    """
+    Decode a Pool Swap event log (fast path; same fields as decode_swap_event_abi, addresses as raw 20 bytes).
+
+    amount0/amount1 are two's-complement int256 (negative = tokens leaving the pool).
+
+    Args:
+        log: Raw log dictionary from eth_getLogs
+
+    Returns:
+        dict: pool_address, sender, recipient, amount0, amount1, sqrtPriceX96, liquidity, tick, block_number, transaction_hash, log_index
+    """
+    try:
+        topics = log['topics']
+        data = _hex_to_bytes(log['data'])
+        _check_layout(topics, 3, data, 5, 'Swap')
+        event = {
+            'event_type': 'swap',
+            'pool_address': to_address_bytes(log['address']),
+            'sender': _word_to_address(_topic_bytes(topics[1])),
+            'recipient': _word_to_address(_topic_bytes(topics[2])),
+            'amount0': int.from_bytes(data[0:32], 'big', signed=True),
+            'amount1': int.from_bytes(data[32:64], 'big', signed=True),
+            'sqrtPriceX96': _uint(data[64:96], _UINT160_LIMIT, 'uint160'),
+            'liquidity': _uint(data[96:128], _UINT128_LIMIT, 'uint128'),
+            'tick': _int24(data[128:160]),
+            'block_number': log['blockNumber'],
+            'transaction_hash': _tx_hash_hex(log['transactionHash']),
+            'log_index': log['logIndex'],
+        }
+    except Exception as e:
+        raise ValueError(f"Failed to decode Swap event: {e}") from e
+    return _crosscheck.check(event, decode_swap_event_abi, log)
+
+
+def decode_flash_event(log: dict) -> dict:
+    """
+    Decode a Pool Flash event log (fast path; same fields as decode_flash_event_abi, addresses as raw 20 bytes).
+
+    Args:
+        log: Raw log dictionary from eth_getLogs
+
+    Returns:
+        dict: pool_address, sender, recipient, amount0, amount1, paid0, paid1, block_number, transaction_hash, log_index
+    """
+    try:
+        topics = log['topics']
+        data = _hex_to_bytes(log['data'])
+        _check_layout(topics, 3, data, 4, 'Flash')
+        event = {
+            'event_type': 'flash',
+            'pool_address': to_address_bytes(log['address']),
+            'sender': _word_to_address(_topic_bytes(topics[1])),
+            'recipient': _word_to_address(_topic_bytes(topics[2])),
+            'amount0': int.from_bytes(data[0:32], 'big'),
+            'amount1': int.from_bytes(data[32:64], 'big'),
+            'paid0': int.from_bytes(data[64:96], 'big'),
+            'paid1': int.from_bytes(data[96:128], 'big'),
+            'block_number': log['blockNumber'],
+            'transaction_hash': _tx_hash_hex(log['transactionHash']),
+            'log_index': log['logIndex'],
+        }
+    except Exception as e:
+        raise ValueError(f"Failed to decode Flash event: {e}") from e
+    return _crosscheck.check(event, decode_flash_event_abi, log)
+
+
+# topic0 -> decoder for events emitted by pool contracts, built once at import
+_pool_event_decoders = TopicRegistry('Pool')
+
+
+def register_pool_event_decoder(topic0, decoder) -> None:
+    """
+    Register a decoder for an additional Pool event type used by decode_pool_event.
+
+    Args:
+        topic0: Event signature hash (32 bytes or hex string)
+        decoder: Callable taking the raw log and returning the decoded event dict
+    """
+    _pool_event_decoders.register(topic0, decoder)
+
+
+register_pool_event_decoder(_INITIALIZE_TOPIC, decode_initialize_event)
+register_pool_event_decoder(_MINT_TOPIC, decode_mint_event)
+register_pool_event_decoder(_BURN_TOPIC, decode_burn_event)
+register_pool_event_decoder(_COLLECT_TOPIC, decode_collect_event)
+register_pool_event_decoder(_SWAP_TOPIC, decode_swap_event)
+register_pool_event_decoder(_FLASH_TOPIC, decode_flash_event)
+
+
 def decode_pool_event(log: dict) -> dict:
     """
     Determine Pool event type (initialize, mint, burn, collect, swap, flash) and decode using the appropriate decoder.
@@ -440,27 +752,107 @@ def decode_pool_event(log: dict) -> dict:
     Returns:
         dict: Decoded event with event_type and type-specific fields
     """
-    raw = log['topics'][0]
-    topic0 = (raw.hex() if isinstance(raw, bytes) else raw).lower().replace('0x', '')
-    
-    initialize = _INITIALIZE_TOPIC.lower().replace('0x', '')
-    mint = _MINT_TOPIC.lower().replace('0x', '')
-    burn = _BURN_TOPIC.lower().replace('0x', '')
-    collect = _COLLECT_TOPIC.lower().replace('0x', '')
-    swap = _SWAP_TOPIC.lower().replace('0x', '')
-    flash = _FLASH_TOPIC.lower().replace('0x', '')
-    
-    if topic0 == initialize:
-        return decode_initialize_event(log)
-    if topic0 == mint:
-        return decode_mint_event(log)
-    if topic0 == burn:
-        return decode_burn_event(log)
-    if topic0 == collect:
-        return decode_collect_event(log)
-    if topic0 == swap:
-        return decode_swap_event(log)
-    if topic0 == flash:
-        return decode_flash_event(log)
-    
-    raise ValueError(f"Unknown Pool event topic0: {topic0}")
+    return _pool_event_decoders.decode(log)
+
+
+# Layouts for vectorized batch decoding (src.core.batch_decoder)
+_pool_event_layouts = TopicRegistry('Pool')
+_pool_event_layouts.register(_INITIALIZE_TOPIC, EventLayout('initialize', 'pool_address', 1, 2, [
+    ('sqrtPriceX96', 'data', 0, 'uint160'),
+    ('tick', 'data', 1, 'int24'),
+]))
+_pool_event_layouts.register(_MINT_TOPIC, EventLayout('mint', 'pool_address', 4, 4, [
+    ('sender', 'data', 0, 'address'),
+    ('owner', 'topic', 1, 'address'),
+    ('tickLower', 'topic', 2, 'int24'),
+    ('tickUpper', 'topic', 3, 'int24'),
+    ('amount', 'data', 1, 'uint128'),
+    ('amount0', 'data', 2, 'uint256'),
+    ('amount1', 'data', 3, 'uint256'),
+]))
+_pool_event_layouts.register(_BURN_TOPIC, EventLayout('burn', 'pool_address', 4, 3, [
+    ('owner', 'topic', 1, 'address'),
+    ('tickLower', 'topic', 2, 'int24'),
+    ('tickUpper', 'topic', 3, 'int24'),
+    ('amount', 'data', 0, 'uint128'),
+    ('amount0', 'data', 1, 'uint256'),
+    ('amount1', 'data', 2, 'uint256'),
+]))
+_pool_event_layouts.register(_COLLECT_TOPIC, EventLayout('collect', 'pool_address', 4, 3, [
+    ('owner', 'topic', 1, 'address'),
+    ('recipient', 'data', 0, 'address'),
+    ('tickLower', 'topic', 2, 'int24'),
+    ('tickUpper', 'topic', 3, 'int24'),
+    ('amount0', 'data', 1, 'uint128'),
+    ('amount1', 'data', 2, 'uint128'),
+]))
+_pool_event_layouts.register(_SWAP_TOPIC, EventLayout('swap', 'pool_address', 3, 5, [
+    ('sender', 'topic', 1, 'address'),
+    ('recipient', 'topic', 2, 'address'),
+    ('amount0', 'data', 0, 'int256'),
+    ('amount1', 'data', 1, 'int256'),
+    ('sqrtPriceX96', 'data', 2, 'uint160'),
+    ('liquidity', 'data', 3, 'uint128'),
+    ('tick', 'data', 4, 'int24'),
+]))
+_pool_event_layouts.register(_FLASH_TOPIC, EventLayout('flash', 'pool_address', 3, 4, [
+    ('sender', 'topic', 1, 'address'),
+    ('recipient', 'topic', 2, 'address'),
+    ('amount0', 'data', 0, 'uint256'),
+    ('amount1', 'data', 1, 'uint256'),
+    ('paid0', 'data', 2, 'uint256'),
+    ('paid1', 'data', 3, 'uint256'),
+]))
+
+
+def decode_pool_events_batch(logs: List[dict]) -> dict:
+    """
+    Decode many Pool events (initialize, mint, burn, collect, swap, flash) at once into columns.
+
+    Args:
+        logs: Raw log dictionaries from eth_getLogs
+
+    Returns:
+        dict: event_type -> {field: column}; integers are int64/uint64 arrays (object arrays
+            of Python ints when a value exceeds 64 bits), addresses raw 20 bytes.
+            src.core.batch_decoder.columns_to_events turns a group back into rows.
+    """
+    return decode_batches(logs, _pool_event_layouts)
+
+
+# Columns of a batch of decoded Pool events, in CSV output order (see src.core.event_batch)
+POOL_EVENT_BATCH_FIELDS = [
+    ('event_type', TEXT), ('pool_address', ADDRESS), ('tx_from', ADDRESS),
+    ('sqrtPriceX96', AMOUNT), ('tick', INT32),
+    ('sender', ADDRESS), ('owner', ADDRESS), ('tickLower', INT32), ('tickUpper', INT32),
+    ('amount', AMOUNT), ('amount0', AMOUNT), ('amount1', AMOUNT),
+    ('recipient', ADDRESS), ('liquidity', AMOUNT),
+    ('paid0', AMOUNT), ('paid1', AMOUNT),
+    ('block_number', INT64), ('transaction_hash', HASH), ('log_index', INT64),
+]
+
+# Reference decoders the cross-check compares batch-decoded rows with
+_pool_event_references = TopicRegistry('Pool')
+_pool_event_references.register(_INITIALIZE_TOPIC, decode_initialize_event_abi)
+_pool_event_references.register(_MINT_TOPIC, decode_mint_event_abi)
+_pool_event_references.register(_BURN_TOPIC, decode_burn_event_abi)
+_pool_event_references.register(_COLLECT_TOPIC, decode_collect_event_abi)
+_pool_event_references.register(_SWAP_TOPIC, decode_swap_event_abi)
+_pool_event_references.register(_FLASH_TOPIC, decode_flash_event_abi)
+
+
+def decode_pool_logs(logs: List[dict]) -> Tuple[EventBatch, List[int], List[Tuple[int, str]]]:
+    """
+    Decode Pool logs (initialize, mint, burn, collect, swap, flash and registered extra types) into one EventBatch.
+
+    Args:
+        logs: Raw log dictionaries from eth_getLogs
+
+    Returns:
+        (batch, positions, errors): events in log order (tx_from still empty), the index
+            in `logs` of every row, and (index, error message) for logs that could not be decoded
+    """
+    return decode_event_batch(
+        logs, _pool_event_layouts, _pool_event_decoders, POOL_EVENT_BATCH_FIELDS,
+        _crosscheck, _pool_event_references,
+    )
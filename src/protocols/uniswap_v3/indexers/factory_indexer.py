@@ -1,22 +1,69 @@
 """Indexer for Uniswap V3 Factory PoolCreated events."""
 
+import asyncio
 import time
-from typing import List, Dict
-from web3 import Web3
+from typing import Callable, Dict, Iterator, List, Tuple
+from web3 import AsyncWeb3, Web3
 from tqdm import tqdm
 
+from src.core.gaps import fetch_intervals, record_gap
+from src.core.streaming import chunk_windows
+from src.protocols.uniswap_v3.core.rpc import async_get_block, batch_call, open_async_web3
 from src.protocols.uniswap_v3.decoders.event_decoder import get_poolcreated_event_signature, decode_poolcreated_event
 
 
-def fetch_logs_in_batches(
+def fetch_batch_with_retry(
+    w3: Web3,
+    factory_address: str,
+    batch_start: int,
+    batch_end: int,
+    max_retries: int = 3
+) -> List[dict]:
+    """
+    Fetch PoolCreated event logs of one block range with retries and exponential backoff.
+    
+    Args:
+        w3: Connected Web3 instance
+        factory_address: Uniswap V3 Factory contract address
+        batch_start: Start block
+        batch_end: End block
+        max_retries: Maximum attempts
+        
+    Returns:
+        List[dict]: Raw logs ([] if the range could not be fetched; it is then recorded in the gaps ledger)
+    """
+    retry_count = 0
+    
+    while retry_count < max_retries:
+        try:
+            return w3.eth.get_logs({
+                'fromBlock': batch_start,
+                'toBlock': batch_end,
+                'address': Web3.to_checksum_address(factory_address),
+                'topics': [get_poolcreated_event_signature()]
+            })
+        except Exception as e:
+            retry_count += 1
+            if retry_count >= max_retries:
+                print(f"\nError fetching logs for blocks {batch_start}-{batch_end}: {e}")
+                print("Max retries reached, skipping this batch")
+                record_gap(batch_start, batch_end, e)
+                return []
+            print(f"\nRetry {retry_count}/{max_retries} for blocks {batch_start}-{batch_end}")
+            time.sleep(2 ** retry_count)  # Exponential backoff
+    
+    return []
+
+
+def iter_log_batches(
     w3: Web3,
     factory_address: str,
     start_block: int,
     end_block: int,
     batch_size: int
-) -> List[dict]:
+) -> Iterator[Tuple[int, int, List[dict]]]:
     """
-    Fetch PoolCreated event logs in batches to avoid RPC limits.
+    Fetch PoolCreated event logs batch by batch to avoid RPC limits.
     
     Args:
         w3: Connected Web3 instance
@@ -25,12 +72,10 @@ def fetch_logs_in_batches(
         end_block: Ending block number
         batch_size: Number of blocks per batch
         
-    Returns:
-        List[dict]: List of raw log dictionaries
+    Yields:
+        (batch_start, batch_end, logs) for consecutive batches covering the range
+        (a batch that still fails after retries yields no logs and is recorded in the gaps ledger)
     """
-    event_signature = get_poolcreated_event_signature()
-    all_logs = []
-    
     # Calculate number of batches
     total_blocks = end_block - start_block + 1
     num_batches = (total_blocks + batch_size - 1) // batch_size
@@ -42,59 +87,45 @@ def fetch_logs_in_batches(
     with tqdm(total=num_batches, desc="Fetching logs", unit="batch") as pbar:
         for batch_start in range(start_block, end_block + 1, batch_size):
             batch_end = min(batch_start + batch_size - 1, end_block)
-            
-            retry_count = 0
-            max_retries = 3
-            
-            while retry_count < max_retries:
-                try:
-                    # Fetch logs for this batch
-                    logs = w3.eth.get_logs({
-                        'fromBlock': batch_start,
-                        'toBlock': batch_end,
-                        'address': Web3.to_checksum_address(factory_address),
-                        'topics': [event_signature]
-                    })
-                    
-                    all_logs.extend(logs)
-                    pbar.update(1)
-                    break
-                    
-                except Exception as e:
-                    retry_count += 1
-                    if retry_count >= max_retries:
-                        print(f"\nError fetching logs for blocks {batch_start}-{batch_end}: {e}")
-                        print("Max retries reached, skipping this batch")
-                        pbar.update(1)
-                        break
-                    else:
-                        print(f"\nRetry {retry_count}/{max_retries} for blocks {batch_start}-{batch_end}")
-                        time.sleep(2 ** retry_count)  # Exponential backoff
-    
+            logs = fetch_batch_with_retry(w3, factory_address, batch_start, batch_end)
+            pbar.update(1)
+            yield batch_start, batch_end, logs
+
+
+def fetch_logs_in_batches(
+    w3: Web3,
+    factory_address: str,
+    start_block: int,
+    end_block: int,
+    batch_size: int
+) -> List[dict]:
+    """
+    Fetch PoolCreated event logs for the whole range into one list (see iter_log_batches).
+        
+    Returns:
+        List[dict]: List of raw log dictionaries
+    """
+    all_logs = []
+    for _, _, logs in iter_log_batches(w3, factory_address, start_block, end_block, batch_size):
+        all_logs.extend(logs)
     return all_logs
 
 
-def get_block_timestamp(w3: Web3, block_number: int, cache: dict, last_request_time: list = None) -> int:
+def get_block_timestamp(w3: Web3, block_number: int, cache: dict) -> int:
     """
-    Get timestamp for a block with caching and rate limiting.
+    Get timestamp for a block with caching and retry.
+
+    Request rate is governed by the shared RPC rate limiter (see src.core.rate_limiter).
     
     Args:
         w3: Connected Web3 instance
         block_number: Block number to get timestamp for
         cache: Dictionary to cache timestamps
-        last_request_time: List to track last request time for rate limiting
         
     Returns:
         int: Unix timestamp of the block
     """
     if block_number not in cache:
-        # Rate limiting: wait at least 0.1 seconds between requests
-        if last_request_time is not None:
-            elapsed = time.time() - last_request_time[0]
-            if elapsed < 0.1:
-                time.sleep(0.1 - elapsed)
-            last_request_time[0] = time.time()
-        
         retry_count = 0
         max_retries = 5
         
@@ -128,51 +159,95 @@ def get_block_timestamp(w3: Web3, block_number: int, cache: dict, last_request_t
     return cache[block_number]
 
 
-def index_pools(w3: Web3, config: dict) -> List[dict]:
+def get_block_timestamps_batched(w3: Web3, block_numbers: List[int], cache: dict, batch_size: int) -> None:
     """
-    Index Uniswap V3 pools from Factory contract events.
-    
+    Fetch timestamps for many blocks as JSON-RPC batch requests.
+
+    Fills `cache` (block_number -> timestamp, 0 on error) for every block not
+    already cached. Failed elements are retried individually by batch_call.
+
     Args:
         w3: Connected Web3 instance
-        config: Configuration dictionary with keys:
-            - FACTORY_ADDRESS: Factory contract address
-            - START_BLOCK: Starting block number
-            - BLOCK_RANGE: Number of blocks to index
-            - BATCH_SIZE: Batch size for log requests
-            
-    Returns:
-        List[dict]: List of decoded pool data with timestamps
+        block_numbers: Block numbers to get timestamps for
+        cache: Dictionary to cache timestamps
+        batch_size: Number of eth_getBlockByNumber calls per batch
+    """
+    pending = [block_number for block_number in block_numbers if block_number not in cache]
+    if not pending:
+        return
+    calls = [('eth_getBlockByNumber', [hex(block_number), False]) for block_number in pending]
+    results = batch_call(w3, calls, batch_size, desc="Fetching timestamps (batched)")
+    for block_number, block in zip(pending, results):
+        cache[block_number] = int(block['timestamp'], 16) if block else 0
+
+
+async def get_block_timestamps_async(
+    w3: AsyncWeb3,
+    block_numbers: List[int],
+    cache: dict,
+    concurrency: int,
+) -> None:
+    """
+    Fetch timestamps for many blocks concurrently over the async transport.
+
+    Fills `cache` (block_number -> timestamp, 0 on error) for every block not
+    already cached, keeping at most `concurrency` requests in flight.
+
+    Args:
+        w3: AsyncWeb3 instance (see open_async_web3)
+        block_numbers: Block numbers to get timestamps for
+        cache: Dictionary to cache timestamps
+        concurrency: Maximum number of simultaneous requests
+    """
+    pending = [block_number for block_number in block_numbers if block_number not in cache]
+    if not pending:
+        return
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(block_number: int) -> None:
+        async with semaphore:
+            try:
+                block = await async_get_block(w3, block_number)
+                cache[block_number] = block['timestamp']
+            except Exception as e:
+                print(f"\nError fetching block {block_number}: {e}")
+                cache[block_number] = 0
+        pbar.update(1)
+
+    with tqdm(total=len(pending), desc="Fetching timestamps", unit="block") as pbar:
+        await asyncio.gather(*(fetch(block_number) for block_number in pending))
+
+
+async def _fetch_block_timestamps_async(config: dict, block_numbers: List[int]) -> dict:
+    """Async transport path: resolve all block timestamps over one pooled session."""
+    timestamp_cache = {}
+    async with open_async_web3(config['RPC_URL'], config['RPC_MAX_CONNECTIONS']) as aw3:
+        await get_block_timestamps_async(aw3, block_numbers, timestamp_cache, config['RPC_MAX_CONNECTIONS'])
+    return timestamp_cache
+
+
+def _decode_pools(w3: Web3, config: dict, logs: List[dict], pair_index: int) -> List[dict]:
+    """
+    Decode PoolCreated logs and attach block timestamps; undecodable logs are reported and skipped.
+
+    Pools are numbered sequentially (pair_index) starting at `pair_index`.
     """
-    factory_address = config['FACTORY_ADDRESS']
-    start_block = config['START_BLOCK']
-    block_range = config['BLOCK_RANGE']
-    batch_size = config['BATCH_SIZE']
-    
-    end_block = start_block + block_range - 1
-    
-    # Fetch logs in batches
-    logs = fetch_logs_in_batches(w3, factory_address, start_block, end_block, batch_size)
-    
-    print(f"\nFound {len(logs)} PoolCreated events")
-    
-    if not logs:
-        return []
-    
-    # Decode events
     pools = []
     timestamp_cache = {}
-    pair_index = 0  # Sequential index for pools
-    last_request_time = [time.time()]  # Track last request time for rate limiting
+    block_numbers = list(dict.fromkeys(log['blockNumber'] for log in logs))
+    if config['RPC_TRANSPORT'] == 'async':
+        timestamp_cache = asyncio.run(_fetch_block_timestamps_async(config, block_numbers))
+    elif config['RPC_BATCH_SIZE'] > 0:
+        get_block_timestamps_batched(w3, block_numbers, timestamp_cache, config['RPC_BATCH_SIZE'])
     
-    print("Decoding events and fetching timestamps...")
-    with tqdm(total=len(logs), desc="Processing events", unit="event") as pbar:
+    with tqdm(total=len(logs), desc="Processing events", unit="event", leave=False) as pbar:
         for log in logs:
             try:
                 # Decode the event
                 pool_data = decode_poolcreated_event(log)
                 
-                # Add timestamp with rate limiting
-                timestamp = get_block_timestamp(w3, pool_data['block_number'], timestamp_cache, last_request_time)
+                # Add timestamp (cached, prefetched when batching or async is enabled)
+                timestamp = get_block_timestamp(w3, pool_data['block_number'], timestamp_cache)
                 pool_data['timestamp'] = timestamp
                 
                 # Add sequential pair_index
@@ -186,6 +261,102 @@ def index_pools(w3: Web3, config: dict) -> List[dict]:
             
             pbar.update(1)
     
-    print(f"\nSuccessfully decoded {len(pools)} pools")
+    return pools
+
+
+def stream_pools(
+    w3: Web3,
+    config: dict,
+    sink: Callable[[List[dict], int, int], None],
+    first_pair_index: int = 0,
+) -> int:
+    """
+    Index pools chunk by chunk: fetch -> decode -> timestamps -> sink.
+
+    Batches are grouped into chunks of about STREAM_BUFFER_EVENTS logs or
+    CHECKPOINT_BLOCKS blocks, whichever comes first.
+
+    Args:
+        w3: Connected Web3 instance
+        config: Configuration dictionary (see index_pools) with STREAM_BUFFER_EVENTS, CHECKPOINT_BLOCKS
+        sink: Called as sink(pools, chunk_start_block, chunk_end_block) for consecutive
+            chunks covering the whole range, in block order (pools may be empty)
+        first_pair_index: pair_index of the first pool (pools already written by a resumed run)
+
+    Returns:
+        int: Number of pools passed to `sink`
+    """
+    start_block = config['START_BLOCK']
+    end_block = start_block + config['BLOCK_RANGE'] - 1
+
+    batches = iter_log_batches(w3, config['FACTORY_ADDRESS'], start_block, end_block, config['BATCH_SIZE'])
+    total_logs = total_pools = 0
+    for chunk_start, chunk_end, logs in chunk_windows(batches, config['STREAM_BUFFER_EVENTS'], config['CHECKPOINT_BLOCKS']):
+        total_logs += len(logs)
+        pools = _decode_pools(w3, config, logs, first_pair_index + total_pools) if logs else []
+        total_pools += len(pools)
+        sink(pools, chunk_start, chunk_end)
+
+    print(f"\nFound {total_logs} PoolCreated events")
+    print(f"\nSuccessfully decoded {total_pools} pools")
+    return total_pools
+
+
+def backfill_pools(
+    w3: Web3,
+    config: dict,
+    intervals: List[Tuple[int, int]],
+    sink: Callable[[List[dict], int, int], None],
+    first_pair_index: int = 0,
+) -> int:
+    """
+    Re-fetch only the given block intervals (e.g. open gaps) and hand the decoded pools to `sink`.
+
+    Intervals are cut into BATCH_SIZE pieces fetched FETCH_CONCURRENCY at a time.
+
+    Args:
+        w3: Connected Web3 instance
+        config: Configuration dictionary (see index_pools)
+        intervals: Inclusive (start_block, end_block) intervals
+        sink: Called as sink(pools, piece_start_block, piece_end_block) per piece, in completion order
+        first_pair_index: pair_index of the first pool found (pools already in the output)
+
+    Returns:
+        int: Number of pools passed to `sink`
+    """
+    pieces = fetch_intervals(
+        lambda start, end: fetch_batch_with_retry(w3, config['FACTORY_ADDRESS'], start, end),
+        intervals, config['BATCH_SIZE'], config['FETCH_CONCURRENCY'],
+    )
+    total_pools = 0
+    for piece_start, piece_end, logs in pieces:
+        pools = _decode_pools(w3, config, logs, first_pair_index + total_pools) if logs else []
+        total_pools += len(pools)
+        sink(pools, piece_start, piece_end)
+    return total_pools
+
+
+def index_pools(w3: Web3, config: dict) -> List[dict]:
+    """
+    Index Uniswap V3 pools from Factory contract events.
+
+    Keeps every pool in memory; stream_pools hands them over chunk by chunk instead.
     
+    Args:
+        w3: Connected Web3 instance
+        config: Configuration dictionary with keys:
+            - FACTORY_ADDRESS: Factory contract address
+            - START_BLOCK: Starting block number
+            - BLOCK_RANGE: Number of blocks to index
+            - BATCH_SIZE: Batch size for log requests
+            - RPC_TRANSPORT: 'async' prefetches block timestamps concurrently
+            - RPC_URL, RPC_MAX_CONNECTIONS: Used by the async transport
+            - RPC_BATCH_SIZE: Prefetch timestamps as JSON-RPC batches of this size (0 disables)
+            - STREAM_BUFFER_EVENTS, CHECKPOINT_BLOCKS: Chunking of the range (see stream_pools)
+            
+    Returns:
+        List[dict]: List of decoded pool data with timestamps
+    """
+    pools = []
+    stream_pools(w3, config, lambda chunk, *_: pools.extend(chunk))
     return pools
@@ -1,13 +1,31 @@
 """Indexer for Uniswap V3 Pool events (Initialize, Mint, Burn, Collect, Swap, Flash)."""
 
+import asyncio
 import os
 import time
-from typing import List
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Tuple
 
 import pandas as pd
-from web3 import Web3
+from web3 import AsyncWeb3, Web3
 from tqdm import tqdm
 
+from src.core.adaptive_window import AdaptiveWindow
+from src.core.addresses import format_addresses, to_checksum_address
+from src.core.gaps import fetch_intervals, record_gap
+from src.core.event_batch import EventBatch
+from src.core.parallel_decode import decode_log_batches, open_decode_pool
+from src.core.rate_limiter import get_rate_limiter
+from src.core.streaming import background_iter, chunk_windows
+from src.protocols.uniswap_v3.core.rpc import (
+    async_get_block,
+    async_get_transaction,
+    batch_call,
+    get_suggested_range,
+    is_too_many_results_error,
+    open_async_web3,
+)
 from src.protocols.uniswap_v3.decoders.event_decoder import (
     get_initialize_event_signature,
     get_mint_event_signature,
@@ -15,7 +33,9 @@ from src.protocols.uniswap_v3.decoders.event_decoder import (
     get_collect_event_signature,
     get_swap_event_signature,
     get_flash_event_signature,
-    decode_pool_event,
+    decode_pool_logs,
+    configure_decoder_crosscheck,
+    POOL_EVENT_BATCH_FIELDS,
 )
 
 
@@ -26,15 +46,16 @@ def _tx_hash_hex(tx_hash) -> str:
     return tx_hash
 
 
-def get_transaction_sender(w3: Web3, tx_hash: str, cache: dict, last_request_time: list) -> str:
+def get_transaction_sender(w3: Web3, tx_hash: str, cache: dict) -> str:
     """
-    Get transaction sender (from address) with caching, rate limiting, and retry.
+    Get transaction sender (from address) with caching and retry.
+
+    Request rate is governed by the shared RPC rate limiter (see src.core.rate_limiter).
 
     Args:
         w3: Connected Web3 instance
         tx_hash: Transaction hash (hex string)
         cache: Dictionary to cache transaction senders
-        last_request_time: Single-element list [float] tracking last RPC call time
 
     Returns:
         str: Checksummed address of transaction sender (empty string on error)
@@ -43,20 +64,13 @@ def get_transaction_sender(w3: Web3, tx_hash: str, cache: dict, last_request_tim
         return cache[tx_hash]
 
     max_retries = 5
-    min_delay = 0.15
 
     for attempt in range(max_retries):
-        elapsed = time.time() - last_request_time[0]
-        if elapsed < min_delay:
-            time.sleep(min_delay - elapsed)
-
         try:
             tx = w3.eth.get_transaction(tx_hash)
-            last_request_time[0] = time.time()
-            cache[tx_hash] = Web3.to_checksum_address(tx['from'])
+            cache[tx_hash] = to_checksum_address(tx['from'])
             return cache[tx_hash]
         except Exception as e:
-            last_request_time[0] = time.time()
             err = str(e)
             if '429' in err or 'Too Many Requests' in err or '-32603' in err or 'temporarily unavailable' in err:
                 wait = 2 ** (attempt + 1)
@@ -72,6 +86,154 @@ def get_transaction_sender(w3: Web3, tx_hash: str, cache: dict, last_request_tim
     return ''
 
 
+def get_transaction_senders_batched(w3: Web3, tx_hashes: List[str], cache: dict, batch_size: int) -> None:
+    """
+    Resolve transaction senders for many tx hashes as JSON-RPC batch requests.
+
+    Fills `cache` (tx_hash -> checksummed sender, '' on error) for every hash not
+    already cached. Failed elements are retried individually by batch_call.
+
+    Args:
+        w3: Connected Web3 instance
+        tx_hashes: Transaction hashes (hex strings)
+        cache: Dictionary to cache transaction senders
+        batch_size: Number of eth_getTransactionByHash calls per batch
+    """
+    pending = [tx_hash for tx_hash in tx_hashes if tx_hash not in cache]
+    if not pending:
+        return
+    calls = [('eth_getTransactionByHash', [tx_hash]) for tx_hash in pending]
+    results = batch_call(w3, calls, batch_size, desc="Fetching tx senders (batched)")
+    for tx_hash, tx in zip(pending, results):
+        cache[tx_hash] = to_checksum_address(tx['from']) if tx else ''
+
+
+_block_method = None  # per-block sender method, chosen once per process by _block_senders_method
+
+
+def _rpc_cost(method: str) -> float:
+    """Cost of one call of `method` for the shared rate limiter (1 when calls are not limited)."""
+    limiter = get_rate_limiter()
+    return limiter.cost(method) if limiter is not None else 1.0
+
+
+def _cache_block_senders(method: str, result, cache: dict) -> None:
+    """Fill `cache` from one eth_getBlockReceipts / eth_getBlockByNumber(full) result."""
+    if method == 'eth_getBlockReceipts':
+        for receipt in result:
+            cache[_tx_hash_hex(receipt['transactionHash'])] = to_checksum_address(receipt['from'])
+    else:
+        for tx in result['transactions']:
+            cache[_tx_hash_hex(tx['hash'])] = to_checksum_address(tx['from'])
+
+
+def _block_senders_method(w3: Web3, block_number: int, cache: dict) -> Tuple[str, bool]:
+    """
+    Pick the per-block sender method once per process.
+
+    eth_getBlockByNumber with full transactions is used when the rate limiter
+    charges more for eth_getBlockReceipts (CU mode: 500 vs 16); otherwise
+    eth_getBlockReceipts is probed on `block_number` and kept if the provider
+    supports it. The probe's receipts go into `cache`.
+
+    Returns:
+        (method, probed): probed is True if `block_number` is already resolved
+    """
+    global _block_method
+    if _block_method is not None:
+        return _block_method, False
+    if _rpc_cost('eth_getBlockReceipts') > _rpc_cost('eth_getBlockByNumber'):
+        _block_method = 'eth_getBlockByNumber'
+        return _block_method, False
+    try:
+        receipts = w3.manager.request_blocking('eth_getBlockReceipts', [hex(block_number)])
+    except Exception:
+        receipts = None
+    if not isinstance(receipts, list):
+        _block_method = 'eth_getBlockByNumber'
+        return _block_method, False
+    _block_method = 'eth_getBlockReceipts'
+    _cache_block_senders(_block_method, receipts, cache)
+    return _block_method, True
+
+
+def get_block_senders(w3: Web3, block_numbers: List[int], cache: dict, batch_size: int) -> None:
+    """
+    Resolve the sender of every transaction in the given blocks, one RPC call per block.
+
+    Uses eth_getBlockReceipts when available and not more expensive, otherwise
+    eth_getBlockByNumber with full transaction objects (see _block_senders_method);
+    calls are sent as JSON-RPC batches. Fills `cache` (tx_hash -> checksummed sender)
+    for all transactions of those blocks. Transactions of blocks that failed stay uncached.
+
+    Args:
+        w3: Connected Web3 instance
+        block_numbers: Block numbers to resolve
+        cache: Dictionary to cache transaction senders
+        batch_size: Number of per-block calls per batch
+    """
+    if not block_numbers:
+        return
+    method, probed = _block_senders_method(w3, block_numbers[0], cache)
+    if probed:
+        block_numbers = block_numbers[1:]
+        if not block_numbers:
+            return
+    print(f"Resolving tx senders per block via {method} ({len(block_numbers)} blocks)")
+    if method == 'eth_getBlockReceipts':
+        calls = [(method, [hex(block_number)]) for block_number in block_numbers]
+    else:
+        calls = [(method, [hex(block_number), True]) for block_number in block_numbers]
+
+    results = batch_call(w3, calls, max(1, batch_size), desc="Fetching block senders")
+    for result in results:
+        if result:
+            _cache_block_senders(method, result, cache)
+
+
+def _choose_tx_from_mode(config: dict, logs: List[dict]) -> str:
+    """
+    Decide how to resolve tx_from: 'tx' (one lookup per transaction) or 'block' (one call per block).
+
+    In 'auto' mode, per-block resolution is used when the per-transaction
+    lookups it replaces cost at least TX_FROM_BLOCK_RATIO times as much, in the
+    rate limiter's units (compute units in CU mode, calls otherwise). A block
+    call is priced as eth_getBlockByNumber; eth_getBlockReceipts is only used
+    when it is not more expensive.
+    """
+    mode = config['TX_FROM_MODE']
+    if mode != 'auto':
+        return mode
+    num_blocks = len({log['blockNumber'] for log in logs})
+    num_txs = len({_tx_hash_hex(log['transactionHash']) for log in logs})
+    tx_cost = num_txs * _rpc_cost('eth_getTransactionByHash')
+    block_cost = num_blocks * _rpc_cost('eth_getBlockByNumber')
+    return 'block' if num_blocks and tx_cost >= config['TX_FROM_BLOCK_RATIO'] * block_cost else 'tx'
+
+
+def resolve_transaction_senders(w3: Web3, config: dict, logs: List[dict]) -> dict:
+    """
+    Resolve tx_from for all logs on the sync transport.
+
+    Per-block resolution (see _choose_tx_from_mode) runs first; whatever it did
+    not resolve is looked up per transaction as JSON-RPC batches (RPC_BATCH_SIZE > 0)
+    or later one by one by get_transaction_sender.
+
+    Returns:
+        dict: tx_hash -> checksummed sender
+    """
+    tx_sender_cache = {}
+    mode = _choose_tx_from_mode(config, logs)
+    print(f"Resolving tx senders in '{mode}' mode")
+    if mode == 'block':
+        block_numbers = list(dict.fromkeys(log['blockNumber'] for log in logs))
+        get_block_senders(w3, block_numbers, tx_sender_cache, config['RPC_BATCH_SIZE'])
+    if config['RPC_BATCH_SIZE'] > 0:
+        tx_hashes = list(dict.fromkeys(_tx_hash_hex(log['transactionHash']) for log in logs))
+        get_transaction_senders_batched(w3, tx_hashes, tx_sender_cache, config['RPC_BATCH_SIZE'])
+    return tx_sender_cache
+
+
 def load_pool_addresses(csv_path: str) -> List[str]:
     """
     Load pool addresses from CSV file.
@@ -99,7 +261,32 @@ def load_pool_addresses(csv_path: str) -> List[str]:
     if 'pool_address' not in df.columns:
         raise ValueError(f"CSV must have 'pool_address' column; found: {list(df.columns)}")
     addresses = df['pool_address'].dropna().astype(str).str.strip().unique().tolist()
-    return [Web3.to_checksum_address(addr) for addr in addresses]
+    return [to_checksum_address(addr) for addr in addresses]
+
+
+def _event_topics() -> List[str]:
+    """topic0 values of the Initialize, Mint, Burn, Collect, Swap, Flash events, OR-ed in one eth_getLogs filter."""
+    return [
+        get_initialize_event_signature(),
+        get_mint_event_signature(),
+        get_burn_event_signature(),
+        get_collect_event_signature(),
+        get_swap_event_signature(),
+        get_flash_event_signature(),
+    ]
+
+
+def _split_block(e: Exception, batch_start: int, batch_end: int) -> int:
+    """
+    Block at which to split a range that returned too many results.
+
+    Uses the provider's suggested range when it lies inside [batch_start, batch_end),
+    otherwise halves the range.
+    """
+    suggested = get_suggested_range(e)
+    if suggested and batch_start <= suggested[1] < batch_end:
+        return suggested[1]
+    return (batch_start + batch_end) // 2
 
 
 def _fetch_logs_with_retry(
@@ -109,9 +296,13 @@ def _fetch_logs_with_retry(
     batch_start: int,
     batch_end: int,
     max_retries: int = 3,
+    window: AdaptiveWindow = None,
 ) -> List[dict]:
     """
     Fetch logs for a specific block range with retry and automatic range splitting.
+
+    On -32005 (too many results) the range is split at the end of the provider's
+    suggested range (or in half) and both parts are fetched recursively.
     
     Args:
         w3: Connected Web3 instance
@@ -120,9 +311,10 @@ def _fetch_logs_with_retry(
         batch_start: Start block
         batch_end: End block
         max_retries: Maximum retry attempts
+        window: Adaptive window controller to report errors and suggested spans to
         
     Returns:
-        List of log dictionaries
+        List of log dictionaries ([] if the range could not be fetched; it is then recorded in the gaps ledger)
     """
     retry_count = 0
     
@@ -136,40 +328,26 @@ def _fetch_logs_with_retry(
             })
             return logs
         except Exception as e:
-            error_str = str(e)
-            error_dict = e.args[0] if e.args and isinstance(e.args[0], dict) else {}
-            
-            # Check for -32005 error: too many results
-            if '-32005' in error_str or (isinstance(error_dict, dict) and error_dict.get('code') == -32005):
-                # Extract suggested range from error
-                data = error_dict.get('data', {})
-                if isinstance(data, dict) and 'from' in data and 'to' in data:
-                    suggested_from = int(data['from'], 16) if isinstance(data['from'], str) else data['from']
-                    suggested_to = int(data['to'], 16) if isinstance(data['to'], str) else data['to']
-                    
-                    # Split the range in half and recursively fetch
-                    mid_block = (batch_start + batch_end) // 2
-                    print(f"\nToo many results for blocks {batch_start}-{batch_end}, splitting at block {mid_block}")
-                    
-                    logs1 = _fetch_logs_with_retry(w3, pool_addresses, topics, batch_start, mid_block, max_retries)
-                    logs2 = _fetch_logs_with_retry(w3, pool_addresses, topics, mid_block + 1, batch_end, max_retries)
-                    return logs1 + logs2
-                else:
-                    # If no suggested range, split in half
-                    mid_block = (batch_start + batch_end) // 2
-                    if mid_block == batch_start:
-                        # Can't split further, return empty
-                        print(f"\nCannot split range {batch_start}-{batch_end} further, skipping")
-                        return []
-                    print(f"\nToo many results for blocks {batch_start}-{batch_end}, splitting at block {mid_block}")
-                    logs1 = _fetch_logs_with_retry(w3, pool_addresses, topics, batch_start, mid_block, max_retries)
-                    logs2 = _fetch_logs_with_retry(w3, pool_addresses, topics, mid_block + 1, batch_end, max_retries)
-                    return logs1 + logs2
+            if is_too_many_results_error(e):
+                if batch_start >= batch_end:
+                    print(f"\nCannot split range {batch_start}-{batch_end} further, skipping")
+                    record_gap(batch_start, batch_end, e)
+                    return []
+                split_block = _split_block(e, batch_start, batch_end)
+                if window is not None:
+                    window.record_error(suggested_span=split_block - batch_start + 1)
+                print(f"\nToo many results for blocks {batch_start}-{batch_end}, splitting at block {split_block}")
+                logs1 = _fetch_logs_with_retry(w3, pool_addresses, topics, batch_start, split_block, max_retries, window)
+                logs2 = _fetch_logs_with_retry(w3, pool_addresses, topics, split_block + 1, batch_end, max_retries, window)
+                return logs1 + logs2
             
-            # For other errors, retry with exponential backoff
+            # For other errors (timeouts, rate limits), shrink the window and retry with exponential backoff
+            if window is not None:
+                window.record_error()
             retry_count += 1
             if retry_count >= max_retries:
                 print(f"\nError fetching logs for blocks {batch_start}-{batch_end}: {e}")
+                record_gap(batch_start, batch_end, e)
                 return []
             print(f"\nRetry {retry_count}/{max_retries} for blocks {batch_start}-{batch_end}")
             time.sleep(2 ** retry_count)
@@ -177,18 +355,51 @@ def _fetch_logs_with_retry(
     return []
 
 
-def fetch_pool_logs_in_batches(
+def _fetch_window(
+    w3: Web3,
+    pool_addresses: List[str],
+    topics: List[str],
+    batch_start: int,
+    batch_end: int,
+    window: AdaptiveWindow,
+) -> List[dict]:
+    """Fetch one window and report its size and timing to the adaptive controller."""
+    started = time.monotonic()
+    logs = _fetch_logs_with_retry(w3, pool_addresses, topics, batch_start, batch_end, window=window)
+    window.record_success(batch_end - batch_start + 1, len(logs), time.monotonic() - started)
+    return logs
+
+
+def make_window(config: dict) -> AdaptiveWindow:
+    """Adaptive window controller configured from BATCH_SIZE and the ADAPTIVE_BATCH_* settings."""
+    return AdaptiveWindow(
+        config['BATCH_SIZE'],
+        min_size=config['MIN_BATCH_SIZE'],
+        max_size=config['MAX_BATCH_SIZE'],
+        target_logs=config['TARGET_LOGS_PER_BATCH'],
+        target_seconds=config['TARGET_BATCH_SECONDS'],
+        adaptive=config['ADAPTIVE_BATCH_SIZE'],
+    )
+
+
+def iter_pool_log_windows(
     w3: Web3,
     pool_addresses: List[str],
     start_block: int,
     end_block: int,
     batch_size: int,
-) -> List[dict]:
+    workers: int = 1,
+    window: AdaptiveWindow = None,
+) -> Iterator[Tuple[int, int, List[dict]]]:
     """
-    Fetch Initialize, Mint, Burn, Collect, Swap, and Flash logs for the given pool addresses in block batches.
+    Fetch Initialize, Mint, Burn, Collect, Swap, and Flash logs for the given pool addresses window by window, in block order.
 
     Uses eth_getLogs with filter by addresses and topic0 (all event types).
     Automatically handles -32005 errors (too many results) by splitting ranges.
+    Window sizes come from `window` (adaptive by default, starting at batch_size).
+    With workers > 1, up to `workers` windows are in flight at once; windows that
+    finish early wait until all earlier ones are yielded, and no new window is cut
+    while 2 * workers windows are in flight or waiting.
     Shows progress via tqdm.
 
     Args:
@@ -196,91 +407,496 @@ def fetch_pool_logs_in_batches(
         pool_addresses: List of Pool contract addresses to scan.
         start_block: First block (inclusive).
         end_block: Last block (inclusive).
-        batch_size: Number of blocks per batch.
+        batch_size: Initial number of blocks per batch (used if window is not given).
+        workers: Number of batches fetched concurrently.
+        window: Adaptive window controller (default: fixed batch_size windows).
 
-    Returns:
-        List of raw log dictionaries from all batches.
+    Yields:
+        (batch_start, batch_end, logs) for consecutive windows covering the range.
     """
     if not pool_addresses:
-        return []
+        return
 
-    topic0_initialize = get_initialize_event_signature()
-    topic0_mint = get_mint_event_signature()
-    topic0_burn = get_burn_event_signature()
-    topic0_collect = get_collect_event_signature()
-    topic0_swap = get_swap_event_signature()
-    topic0_flash = get_flash_event_signature()
-    topics = [topic0_initialize, topic0_mint, topic0_burn, topic0_collect, topic0_swap, topic0_flash]
+    topics = _event_topics()
+    if window is None:
+        window = AdaptiveWindow(batch_size, adaptive=False)
 
     total_blocks = end_block - start_block + 1
-    num_batches = (total_blocks + batch_size - 1) // batch_size
-    all_logs = []
 
     print(f"Fetching Pool logs from block {start_block} to {end_block} ({total_blocks} blocks)")
-    print(f"Pools: {len(pool_addresses)}, batch size: {batch_size} blocks ({num_batches} batches)")
+    print(f"Pools: {len(pool_addresses)}, initial batch size: {window.size} blocks "
+          f"({'adaptive' if window.adaptive else 'fixed'}), workers: {workers}")
+
+    cursor = start_block
+    with tqdm(total=total_blocks, desc="Fetching Pool logs", unit="block") as pbar:
+        if workers <= 1:
+            while cursor <= end_block:
+                batch_end = min(cursor + window.next_span() - 1, end_block)
+                logs = _fetch_window(w3, pool_addresses, topics, cursor, batch_end, window)
+                pbar.update(batch_end - cursor + 1)
+                pbar.set_postfix_str(f"window={window.size}")
+                yield cursor, batch_end, logs
+                cursor = batch_end + 1
+        else:
+            # Each worker runs its own _fetch_logs_with_retry, so -32005 splitting stays per batch;
+            # windows are cut from the current adaptive size as slots free up
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                in_flight = {}
+                completed = {}
+                next_start = start_block
+                while cursor <= end_block or in_flight or completed:
+                    while cursor <= end_block and len(in_flight) < workers and len(in_flight) + len(completed) < 2 * workers:
+                        batch_end = min(cursor + window.next_span() - 1, end_block)
+                        future = executor.submit(_fetch_window, w3, pool_addresses, topics, cursor, batch_end, window)
+                        in_flight[future] = (cursor, batch_end)
+                        cursor = batch_end + 1
+                    if in_flight:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            batch_start, batch_end = in_flight.pop(future)
+                            completed[batch_start] = (batch_end, future.result())
+                            pbar.update(batch_end - batch_start + 1)
+                        pbar.set_postfix_str(f"window={window.size}")
+                    while next_start in completed:
+                        batch_end, logs = completed.pop(next_start)
+                        yield next_start, batch_end, logs
+                        next_start = batch_end + 1
+
+    print(window.summary())
 
-    with tqdm(total=num_batches, desc="Fetching Pool logs", unit="batch") as pbar:
-        for batch_start in range(start_block, end_block + 1, batch_size):
-            batch_end = min(batch_start + batch_size - 1, end_block)
-            
-            logs = _fetch_logs_with_retry(w3, pool_addresses, topics, batch_start, batch_end)
-            all_logs.extend(logs)
-            pbar.update(1)
 
+def fetch_pool_logs_in_batches(
+    w3: Web3,
+    pool_addresses: List[str],
+    start_block: int,
+    end_block: int,
+    batch_size: int,
+    workers: int = 1,
+    window: AdaptiveWindow = None,
+) -> List[dict]:
+    """
+    Fetch Initialize, Mint, Burn, Collect, Swap, and Flash logs for the whole range into one list (see iter_pool_log_windows).
+
+    Returns:
+        List of raw log dictionaries ordered by (block_number, log_index).
+    """
+    all_logs = []
+    for _, _, logs in iter_pool_log_windows(w3, pool_addresses, start_block, end_block, batch_size, workers, window):
+        all_logs.extend(logs)
     return all_logs
 
 
-def index_pool_events(
+async def get_transaction_senders_async(
+    w3: AsyncWeb3,
+    tx_hashes: List[str],
+    cache: dict,
+    concurrency: int,
+) -> None:
+    """
+    Resolve transaction senders for many tx hashes concurrently over the async transport.
+
+    Fills `cache` (tx_hash -> checksummed sender, '' on error) for every hash not
+    already cached, keeping at most `concurrency` requests in flight.
+
+    Args:
+        w3: AsyncWeb3 instance (see open_async_web3)
+        tx_hashes: Transaction hashes (hex strings)
+        cache: Dictionary to cache transaction senders
+        concurrency: Maximum number of simultaneous requests
+    """
+    pending = [tx_hash for tx_hash in tx_hashes if tx_hash not in cache]
+    if not pending:
+        return
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(tx_hash: str) -> None:
+        async with semaphore:
+            try:
+                tx = await async_get_transaction(w3, tx_hash)
+                cache[tx_hash] = to_checksum_address(tx['from'])
+            except Exception as e:
+                print(f"\nError fetching transaction {tx_hash}: {e}")
+                cache[tx_hash] = ''
+        pbar.update(1)
+
+    with tqdm(total=len(pending), desc="Fetching tx senders", unit="tx") as pbar:
+        await asyncio.gather(*(fetch(tx_hash) for tx_hash in pending))
+
+
+async def get_block_senders_async(
+    w3: AsyncWeb3,
+    block_numbers: List[int],
+    cache: dict,
+    concurrency: int,
+) -> None:
+    """
+    Async counterpart of get_block_senders using full-transaction blocks.
+
+    Fills `cache` (tx_hash -> checksummed sender) for all transactions of the
+    given blocks, keeping at most `concurrency` requests in flight.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(block_number: int) -> None:
+        async with semaphore:
+            try:
+                block = await async_get_block(w3, block_number, full_transactions=True)
+                for tx in block['transactions']:
+                    cache[_tx_hash_hex(tx['hash'])] = to_checksum_address(tx['from'])
+            except Exception as e:
+                print(f"\nError fetching block {block_number}: {e}")
+        pbar.update(1)
+
+    with tqdm(total=len(block_numbers), desc="Fetching block senders", unit="block") as pbar:
+        await asyncio.gather(*(fetch(block_number) for block_number in block_numbers))
+
+
+async def _fetch_logs_with_retry_async(
+    w3: AsyncWeb3,
+    pool_addresses: List[str],
+    topics: List[str],
+    batch_start: int,
+    batch_end: int,
+    max_retries: int = 3,
+    window: AdaptiveWindow = None,
+) -> List[dict]:
+    """
+    Async counterpart of _fetch_logs_with_retry: the same -32005 range splitting and the
+    same retry-then-gap policy, so both transports skip the same ranges for the same errors.
+
+    Returns:
+        List of log dictionaries ([] if the range could not be fetched; it is then recorded in the gaps ledger)
+    """
+    retry_count = 0
+
+    while retry_count < max_retries:
+        try:
+            return await w3.eth.get_logs({
+                'fromBlock': batch_start,
+                'toBlock': batch_end,
+                'address': pool_addresses,
+                'topics': [topics],
+            })
+        except Exception as e:
+            if is_too_many_results_error(e):
+                if batch_start >= batch_end:
+                    print(f"\nCannot split range {batch_start}-{batch_end} further, skipping")
+                    record_gap(batch_start, batch_end, e)
+                    return []
+                split_block = _split_block(e, batch_start, batch_end)
+                if window is not None:
+                    window.record_error(suggested_span=split_block - batch_start + 1)
+                print(f"\nToo many results for blocks {batch_start}-{batch_end}, splitting at block {split_block}")
+                logs1 = await _fetch_logs_with_retry_async(w3, pool_addresses, topics, batch_start, split_block, max_retries, window)
+                logs2 = await _fetch_logs_with_retry_async(w3, pool_addresses, topics, split_block + 1, batch_end, max_retries, window)
+                return logs1 + logs2
+
+            # For other errors (timeouts, rate limits), shrink the window and retry with exponential backoff
+            if window is not None:
+                window.record_error()
+            retry_count += 1
+            if retry_count >= max_retries:
+                print(f"\nError fetching logs for blocks {batch_start}-{batch_end}: {e}")
+                record_gap(batch_start, batch_end, e)
+                return []
+            print(f"\nRetry {retry_count}/{max_retries} for blocks {batch_start}-{batch_end}")
+            await asyncio.sleep(2 ** retry_count)
+
+    return []
+
+
+async def iter_pool_log_windows_async(
+    w3: AsyncWeb3,
+    pool_addresses: List[str],
+    start_block: int,
+    end_block: int,
+    batch_size: int,
+    workers: int = 1,
+    window: AdaptiveWindow = None,
+) -> AsyncIterator[Tuple[int, int, List[dict]]]:
+    """
+    Async counterpart of iter_pool_log_windows: up to `workers` windows in flight on one event loop.
+
+    Windows are yielded in block order; fetching continues in the background
+    while the consumer handles a window, up to 2 * workers windows ahead.
+
+    Yields:
+        (batch_start, batch_end, logs) for consecutive windows covering the range.
+    """
+    if not pool_addresses:
+        return
+
+    topics = _event_topics()
+    if window is None:
+        window = AdaptiveWindow(batch_size, adaptive=False)
+    workers = max(1, workers)
+
+    print(f"Fetching Pool logs from block {start_block} to {end_block} ({end_block - start_block + 1} blocks, async)")
+    print(f"Pools: {len(pool_addresses)}, initial batch size: {window.size} blocks "
+          f"({'adaptive' if window.adaptive else 'fixed'}), workers: {workers}")
+
+    async def fetch(batch_start: int, batch_end: int) -> List[dict]:
+        started = time.monotonic()
+        logs = await _fetch_logs_with_retry_async(w3, pool_addresses, topics, batch_start, batch_end, window=window)
+        window.record_success(batch_end - batch_start + 1, len(logs), time.monotonic() - started)
+        pbar.update(batch_end - batch_start + 1)
+        pbar.set_postfix_str(f"window={window.size}")
+        return logs
+
+    pending = deque()
+    cursor = start_block
+    with tqdm(total=end_block - start_block + 1, desc="Fetching Pool logs", unit="block") as pbar:
+        try:
+            while cursor <= end_block or pending:
+                # Cut the next window only when a slot frees up, so it uses the latest adaptive size
+                running = sum(1 for _, _, task in pending if not task.done())
+                while cursor <= end_block and running < workers and len(pending) < 2 * workers:
+                    batch_end = min(cursor + window.next_span() - 1, end_block)
+                    pending.append((cursor, batch_end, asyncio.create_task(fetch(cursor, batch_end))))
+                    cursor = batch_end + 1
+                    running += 1
+                if pending[0][2].done():
+                    batch_start, batch_end, task = pending.popleft()
+                    yield batch_start, batch_end, task.result()
+                else:
+                    await asyncio.wait([task for _, _, task in pending if not task.done()], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for _, _, task in pending:
+                task.cancel()
+
+    print(window.summary())
+
+
+async def fetch_pool_logs_async(
+    w3: AsyncWeb3,
+    pool_addresses: List[str],
+    start_block: int,
+    end_block: int,
+    batch_size: int,
+    workers: int = 1,
+    window: AdaptiveWindow = None,
+) -> List[dict]:
+    """
+    Async counterpart of fetch_pool_logs_in_batches (see iter_pool_log_windows_async).
+
+    Returns:
+        List of raw log dictionaries ordered by (block_number, log_index).
+    """
+    all_logs = []
+    async for _, _, logs in iter_pool_log_windows_async(w3, pool_addresses, start_block, end_block, batch_size, workers, window):
+        all_logs.extend(logs)
+    return all_logs
+
+
+def _decode_chunk(
+    w3: Web3, config: dict, logs: List[dict], tx_sender_cache: dict, executor: Optional[ProcessPoolExecutor]
+) -> EventBatch:
+    """Decode a chunk of logs into an EventBatch and attach tx_from; undecodable logs are reported and skipped."""
+    events, positions, errors = decode_log_batches(decode_pool_logs, logs, config['DECODE_WORKERS'], executor=executor)
+    for position, error in errors:
+        print(f"\nError decoding event in tx {logs[position].get('transactionHash', 'unknown')}: {error}")
+    events.set_column('tx_from', [
+        get_transaction_sender(w3, _tx_hash_hex(logs[position]['transactionHash']), tx_sender_cache)
+        for position in positions
+    ])
+    return events
+
+
+async def _resolve_transaction_senders_async(aw3: AsyncWeb3, config: dict, logs: List[dict]) -> dict:
+    """Async transport counterpart of resolve_transaction_senders."""
+    tx_sender_cache = {}
+    if _choose_tx_from_mode(config, logs) == 'block':
+        block_numbers = list(dict.fromkeys(log['blockNumber'] for log in logs))
+        await get_block_senders_async(aw3, block_numbers, tx_sender_cache, config['RPC_MAX_CONNECTIONS'])
+    tx_hashes = list(dict.fromkeys(_tx_hash_hex(log['transactionHash']) for log in logs))
+    await get_transaction_senders_async(aw3, tx_hashes, tx_sender_cache, config['RPC_MAX_CONNECTIONS'])
+    return tx_sender_cache
+
+
+async def _stream_pool_events_async(
+    w3: Web3,
+    config: dict,
+    pool_addresses: List[str],
+    start_block: int,
+    end_block: int,
+    sink: Callable[[EventBatch, int, int], None],
+    executor: Optional[ProcessPoolExecutor],
+) -> Tuple[int, int]:
+    """Async transport path of stream_pool_events; returns (logs fetched, events decoded)."""
+    total_logs = total_events = 0
+
+    async def flush(chunk_start: int, chunk_end: int, logs: List[dict]) -> None:
+        nonlocal total_logs, total_events
+        total_logs += len(logs)
+        events = EventBatch(POOL_EVENT_BATCH_FIELDS)
+        if logs:
+            tx_sender_cache = await _resolve_transaction_senders_async(aw3, config, logs)
+            events = _decode_chunk(w3, config, logs, tx_sender_cache, executor)
+            total_events += len(events)
+        sink(events, chunk_start, chunk_end)
+
+    async with open_async_web3(config['RPC_URL'], config['RPC_MAX_CONNECTIONS']) as aw3:
+        windows = iter_pool_log_windows_async(
+            aw3, pool_addresses, start_block, end_block, config['BATCH_SIZE'],
+            workers=config['FETCH_CONCURRENCY'], window=make_window(config),
+        )
+        chunk_start, chunk = None, []
+        async for batch_start, batch_end, logs in windows:
+            if chunk_start is None:
+                chunk_start = batch_start
+            chunk.extend(logs)
+            # Same flush rule as chunk_windows on the sync path
+            full = len(chunk) >= config['STREAM_BUFFER_EVENTS']
+            if full or (config['CHECKPOINT_BLOCKS'] and batch_end - chunk_start + 1 >= config['CHECKPOINT_BLOCKS']):
+                await flush(chunk_start, batch_end, chunk)
+                chunk_start, chunk = None, []
+        if chunk_start is not None:
+            await flush(chunk_start, end_block, chunk)
+    return total_logs, total_events
+
+
+def stream_pool_events(
     w3: Web3,
     config: dict,
+    sink: Callable[[EventBatch, int, int], None],
     csv_path: str = 'data/uniswap_v3/uniswap_v3_pools.csv',
-) -> List[dict]:
+    executor: Optional[ProcessPoolExecutor] = None,
+) -> int:
     """
-    Main indexing function: load pool addresses, fetch logs in batches, decode all events.
+    Index Pool events with bounded memory: fetch -> resolve tx senders -> decode -> sink, chunk by chunk.
+
+    Logs are fetched window by window (ahead of the consumer, at most
+    2 * FETCH_CONCURRENCY windows) and grouped into chunks of about
+    STREAM_BUFFER_EVENTS logs (or CHECKPOINT_BLOCKS blocks); every chunk is
+    decoded and handed to `sink` before the next one is built, so memory does
+    not grow with the block range.
 
     Args:
         w3: Connected Web3 instance.
-        config: Configuration dict with START_BLOCK, BLOCK_RANGE, BATCH_SIZE.
-        csv_path: Path to CSV with pool_address column (default: data/uniswap_v3/uniswap_v3_pools.csv).
+        config: Configuration dict (see index_pool_events) with STREAM_BUFFER_EVENTS, CHECKPOINT_BLOCKS.
+        sink: Called as sink(events, chunk_start_block, chunk_end_block) for consecutive
+            chunks covering the whole range, in block order; events is an EventBatch
+            (src.core.event_batch), possibly empty.
+        csv_path: Path to CSV with pool_address column.
+        executor: Decode worker pool of the run (open_decode_pool); None decodes in this
+            process, or with a pool per chunk when DECODE_WORKERS > 1.
 
     Returns:
-        List of decoded Pool events (initialize, mint, burn, collect, swap, flash), each with event_type and type-specific fields.
+        int: Number of events passed to `sink`.
     """
     pool_addresses = load_pool_addresses(csv_path)
     print(f"Loaded {len(pool_addresses)} pool addresses from {csv_path}")
 
     start_block = config['START_BLOCK']
-    block_range = config['BLOCK_RANGE']
-    batch_size = config['BATCH_SIZE']
-    end_block = start_block + block_range - 1
+    end_block = start_block + config['BLOCK_RANGE'] - 1
+
+    if config['RPC_TRANSPORT'] == 'async':
+        total_logs, total_events = asyncio.run(
+            _stream_pool_events_async(w3, config, pool_addresses, start_block, end_block, sink, executor)
+        )
+    else:
+        windows = iter_pool_log_windows(
+            w3, pool_addresses, start_block, end_block, config['BATCH_SIZE'],
+            workers=config['FETCH_CONCURRENCY'], window=make_window(config),
+        )
+        # Fetching runs ahead in a background thread while chunks are decoded and written
+        prefetched = background_iter(windows, 2 * max(1, config['FETCH_CONCURRENCY']))
+        total_logs = total_events = 0
+        for chunk_start, chunk_end, logs in chunk_windows(prefetched, config['STREAM_BUFFER_EVENTS'], config['CHECKPOINT_BLOCKS']):
+            total_logs += len(logs)
+            events = EventBatch(POOL_EVENT_BATCH_FIELDS)
+            if logs:
+                tx_sender_cache = resolve_transaction_senders(w3, config, logs)
+                events = _decode_chunk(w3, config, logs, tx_sender_cache, executor)
+                total_events += len(events)
+            sink(events, chunk_start, chunk_end)
+
+    print(f"\nFound {total_logs} Pool events (Initialize/Mint/Burn/Collect/Swap/Flash)")
+    print(f"Successfully decoded {total_events} Pool events")
+    return total_events
+
+
+def backfill_pool_events(
+    w3: Web3,
+    config: dict,
+    intervals: List[Tuple[int, int]],
+    sink: Callable[[EventBatch, int, int], None],
+    csv_path: str = 'data/uniswap_v3/uniswap_v3_pools.csv',
+    executor: Optional[ProcessPoolExecutor] = None,
+) -> int:
+    """
+    Re-fetch only the given block intervals (e.g. open gaps) and hand the decoded events to `sink`.
+
+    Intervals are cut into BATCH_SIZE pieces fetched FETCH_CONCURRENCY at a time
+    (sync transport); each piece is enriched with tx_from and decoded like a
+    chunk of stream_pool_events.
+
+    Args:
+        w3: Connected Web3 instance.
+        config: Configuration dict (see index_pool_events).
+        intervals: Inclusive (start_block, end_block) intervals.
+        sink: Called as sink(events, piece_start_block, piece_end_block) per piece, in completion order.
+        csv_path: Path to CSV with pool_address column.
+        executor: Decode worker pool of the run (open_decode_pool); None decodes in this
+            process, or with a pool per chunk when DECODE_WORKERS > 1.
 
-    logs = fetch_pool_logs_in_batches(
-        w3, pool_addresses, start_block, end_block, batch_size
+    Returns:
+        int: Number of events passed to `sink`.
+    """
+    pool_addresses = load_pool_addresses(csv_path)
+    topics = _event_topics()
+    pieces = fetch_intervals(
+        lambda start, end: _fetch_logs_with_retry(w3, pool_addresses, topics, start, end),
+        intervals, config['BATCH_SIZE'], config['FETCH_CONCURRENCY'],
     )
-    print(f"\nFound {len(logs)} Pool events (Initialize/Mint/Burn/Collect/Swap/Flash)")
+    total_events = 0
+    for piece_start, piece_end, logs in pieces:
+        events = EventBatch(POOL_EVENT_BATCH_FIELDS)
+        if logs:
+            tx_sender_cache = resolve_transaction_senders(w3, config, logs)
+            events = _decode_chunk(w3, config, logs, tx_sender_cache, executor)
+            total_events += len(events)
+        sink(events, piece_start, piece_end)
+    return total_events
 
-    if not logs:
-        return []
 
-    events = []
-    decode_errors = 0
-    tx_sender_errors = 0
-    tx_sender_cache = {}
-    last_request_time = [0.0]
+def index_pool_events(
+    w3: Web3,
+    config: dict,
+    csv_path: str = 'data/uniswap_v3/uniswap_v3_pools.csv',
+) -> List[dict]:
+    """
+    Main indexing function: load pool addresses, fetch logs in batches, decode all events.
 
-    print("Decoding events and fetching transaction senders...")
-    for log in tqdm(logs, desc="Decoding events", unit="event"):
-        try:
-            event = decode_pool_event(log)
-            tx_hash = _tx_hash_hex(log['transactionHash'])
-            tx_from = get_transaction_sender(w3, tx_hash, tx_sender_cache, last_request_time)
-            if not tx_from:
-                tx_sender_errors += 1
-            event['tx_from'] = tx_from
-            events.append(event)
-        except Exception as e:
-            decode_errors += 1
-            print(f"\nError decoding event in tx {log.get('transactionHash', 'unknown')}: {e}")
+    Keeps every event in memory; stream_pool_events writes chunk by chunk instead.
+
+    Args:
+        w3: Connected Web3 instance.
+        config: Configuration dict with START_BLOCK, BLOCK_RANGE, BATCH_SIZE, FETCH_CONCURRENCY,
+            RPC_TRANSPORT, RPC_MAX_CONNECTIONS (and RPC_URL for the async transport),
+            RPC_BATCH_SIZE (sync transport: resolve tx senders as JSON-RPC batches; 0 disables),
+            TX_FROM_MODE, TX_FROM_BLOCK_RATIO (per-transaction vs per-block tx_from resolution),
+            ADAPTIVE_BATCH_SIZE, MIN/MAX_BATCH_SIZE, TARGET_LOGS_PER_BATCH, TARGET_BATCH_SECONDS,
+            DECODE_WORKERS (processes decoding large log sets), STREAM_BUFFER_EVENTS, CHECKPOINT_BLOCKS.
+        csv_path: Path to CSV with pool_address column (default: data/uniswap_v3/uniswap_v3_pools.csv).
 
-    print(f"\nSuccessfully decoded {len(events)} Pool events")
+    Returns:
+        List of decoded Pool events (initialize, mint, burn, collect, swap, flash), each with every field of
+        POOL_EVENT_BATCH_FIELDS (None where the event type has none, tx_from None when unknown;
+        addresses checksummed, transaction_hash hex).
+    """
+    events = []
+    executor = open_decode_pool(
+        config['DECODE_WORKERS'], configure_decoder_crosscheck, (config.get('DECODER_CROSSCHECK', 0.0),)
+    )
+    try:
+        # Addresses stay raw inside the pipeline; callers get checksummed strings and
+        # every field of the layout (None where an event type has no value, e.g. tx_from when unknown)
+        stream_pool_events(
+            w3, config, lambda chunk, *_: events.extend(format_addresses(event) for event in chunk.to_events(keep_empty=True)),
+            csv_path, executor,
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
     return events
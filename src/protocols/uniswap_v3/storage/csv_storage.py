@@ -1,11 +1,49 @@
 """Storage utilities for saving indexed pool data."""
 
 import os
-import pandas as pd
 from typing import List
 
+from src.core.addresses import format_addresses
+from src.core.csv_append import append_csv_rows, create_csv, reset_key_index
+from src.core.csv_writer import CsvWriter, compressed_path
+from src.core.event_batch import EventBatch
+from src.protocols.uniswap_v3.decoders.event_decoder import POOL_EVENT_BATCH_FIELDS
 
-def save_pools_to_csv(pools: List[dict], filename: str) -> None:
+
+DATA_DIR = 'data/uniswap_v3'
+
+
+POOL_COLUMNS = [
+    'pool_address',
+    'token0',
+    'token1',
+    'fee',
+    'tick_spacing',
+    'pair_index',
+    'block_number',
+    'timestamp',
+    'transaction_hash',
+    'log_index',
+]
+
+
+def create_pools_csv(filename: str) -> str:
+    """
+    Create (or truncate) a pools CSV with only the header row, for chunked appends.
+
+    Args:
+        filename: Output CSV filename (will be saved in data/ directory)
+
+    Returns:
+        str: Path of the created file
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    filepath = os.path.join(DATA_DIR, filename)
+    create_csv(filepath, POOL_COLUMNS)
+    return filepath
+
+
+def save_pools_to_csv(pools: List[dict], filename: str, append: bool = False) -> int:
     """
     Save list of pools to CSV file in data/ directory.
     
@@ -20,43 +58,77 @@ def save_pools_to_csv(pools: List[dict], filename: str) -> None:
             - block_number: Block number where pool was created
             - timestamp: Unix timestamp of the block
             - transaction_hash: Transaction hash that created the pool
+            - log_index: Log index of the PoolCreated event
         filename: Output CSV filename (will be saved in data/ directory)
+        append: Append only rows whose (transaction_hash, log_index) is not in the file yet
+            (see src.core.csv_append); the file is created with its header if missing
+
+    Returns:
+        int: Rows written
     """
     if not pools:
-        print("No pools to save")
-        return
+        if not append:
+            print("No pools to save")
+        return 0
     
     # Ensure data directory exists
-    data_dir = 'data/uniswap_v3'
-    os.makedirs(data_dir, exist_ok=True)
+    os.makedirs(DATA_DIR, exist_ok=True)
     
     # Create full path
-    filepath = os.path.join(data_dir, filename)
-    
-    # Create DataFrame with specified column order
-    df = pd.DataFrame(pools, columns=[
-        'pool_address',
-        'token0',
-        'token1',
-        'fee',
-        'tick_spacing',
-        'pair_index',
-        'block_number',
-        'timestamp',
-        'transaction_hash'
-    ])
+    filepath = os.path.join(DATA_DIR, filename)
     
+    rows = [format_addresses(pool) for pool in pools]
+    if append:
+        return append_csv_rows(filepath, rows, POOL_COLUMNS)
+
     # Save to CSV in UTF-8 without BOM to avoid encoding issues
-    df.to_csv(filepath, index=False, encoding='utf-8')
+    reset_key_index(filepath)
+    writer = CsvWriter(filepath, POOL_COLUMNS)
+    writer.write(rows)
+    writer.close()
     print(f"Saved {len(pools)} pools to {filepath}")
+    return len(pools)
+
 
+# All possible columns for all Pool event types
+POOL_EVENT_COLUMNS = [
+    'event_type', 'pool_address', 'tx_from',
+    # Initialize fields
+    'sqrtPriceX96', 'tick',
+    # Mint/Burn fields
+    'sender', 'owner', 'tickLower', 'tickUpper', 'amount', 'amount0', 'amount1',
+    # Collect fields (amount0, amount1 already included above)
+    # Swap fields
+    'recipient', 'liquidity',
+    # Flash fields
+    'paid0', 'paid1',
+    # Common fields
+    'block_number', 'transaction_hash', 'log_index'
+]
 
-def save_pool_events_to_csv(events: List[dict], filename: str) -> None:
+
+def create_pool_events_csv(filename: str) -> str:
+    """
+    Create (or truncate) a Pool events CSV with only the header row, for chunked appends.
+
+    Args:
+        filename: Output CSV filename (will be saved in data/ directory)
+
+    Returns:
+        str: Path of the created file
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    filepath = os.path.join(DATA_DIR, filename)
+    create_csv(filepath, POOL_EVENT_COLUMNS)
+    return filepath
+
+
+def save_pool_events_to_csv(events, filename: str, append: bool = False, compression: str = 'none') -> int:
     """
     Save list of Pool events (Initialize, Mint, Burn, Collect, Swap, Flash) to CSV file in data/ directory.
 
     Args:
-        events: List of event dicts with at least:
+        events: EventBatch of decoded events (src.core.event_batch), or a list of event dicts with at least:
             - event_type: 'initialize' | 'mint' | 'burn' | 'collect' | 'swap' | 'flash'
             - pool_address, tx_from, block_number, transaction_hash, log_index
             - initialize: sqrtPriceX96, tick
@@ -66,36 +138,47 @@ def save_pool_events_to_csv(events: List[dict], filename: str) -> None:
             - swap: sender, recipient, amount0, amount1, sqrtPriceX96, liquidity, tick
             - flash: sender, recipient, amount0, amount1, paid0, paid1
         filename: Output CSV filename (will be saved in data/ directory)
+        append: Append only rows whose (transaction_hash, log_index) is not in the file yet
+            (see src.core.csv_append); the file is created with its header if missing
+        compression: 'none', 'gzip' or 'zstd' (adds .gz / .zst to filename; not with append)
+
+    Returns:
+        int: Rows written
     """
     if not events:
-        print("No pool events to save")
-        return
-
-    data_dir = 'data/uniswap_v3'
-    os.makedirs(data_dir, exist_ok=True)
-    filepath = os.path.join(data_dir, filename)
-
-    # Define all possible columns for all event types
-    columns = [
-        'event_type', 'pool_address', 'tx_from',
-        # Initialize fields
-        'sqrtPriceX96', 'tick',
-        # Mint/Burn fields
-        'sender', 'owner', 'tickLower', 'tickUpper', 'amount', 'amount0', 'amount1',
-        # Collect fields (amount0, amount1 already included above)
-        # Swap fields
-        'recipient', 'liquidity',
-        # Flash fields
-        'paid0', 'paid1',
-        # Common fields
-        'block_number', 'transaction_hash', 'log_index'
-    ]
-
-    rows = []
-    for e in events:
-        row = {k: e.get(k, '') for k in columns}
-        rows.append(row)
-
-    df = pd.DataFrame(rows, columns=columns)
-    df.to_csv(filepath, index=False, encoding='utf-8')
+        if not append:
+            print("No pool events to save")
+        return 0
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    filepath = os.path.join(DATA_DIR, filename)
+
+    if not isinstance(events, EventBatch):
+        events = EventBatch.from_events(POOL_EVENT_BATCH_FIELDS, events)
+
+    if append:
+        data = {column: events.formatted_column(column) for column in POOL_EVENT_COLUMNS}
+        return append_csv_rows(filepath, data, POOL_EVENT_COLUMNS)
+    reset_key_index(filepath)
+    filepath = compressed_path(filepath, compression)
+    writer = CsvWriter(filepath, POOL_EVENT_COLUMNS, compression)
+    writer.write(events)
+    writer.close()
     print(f"Saved {len(events)} pool events to {filepath}")
+    return len(events)
+
+
+def open_pool_events_csv(filename: str, compression: str) -> CsvWriter:
+    """
+    Streaming writer of a Pool events CSV compressed on the fly (CSV_COMPRESSION).
+
+    Args:
+        filename: Output CSV filename (will be saved in data/ directory; .gz / .zst is added)
+        compression: 'gzip' or 'zstd'
+
+    Returns:
+        CsvWriter: write(events) per chunk, close() at the end
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    filepath = compressed_path(os.path.join(DATA_DIR, filename), compression)
+    return CsvWriter(filepath, POOL_EVENT_COLUMNS, compression)
@@ -0,0 +1,70 @@
+"""Typed Parquet storage for Uniswap V3 Pool events (--format parquet)."""
+
+import os
+from typing import Dict
+
+from src.core.event_batch import ADDRESS, AMOUNT, HASH, INT32, INT64
+from src.core.parquet_sink import ParquetEventWriter
+from src.protocols.uniswap_v3.storage.csv_storage import DATA_DIR
+
+
+_COMMON_FIELDS = [
+    ('block_number', INT64),
+    ('transaction_hash', HASH),
+    ('log_index', INT32),
+]
+
+# Columns of every Pool event type, in output order (see src.core.event_batch for the kinds)
+POOL_EVENT_FIELDS = {
+    'initialize': [
+        ('pool_address', ADDRESS), ('tx_from', ADDRESS),
+        ('sqrtPriceX96', AMOUNT), ('tick', INT32),
+    ] + _COMMON_FIELDS,
+    'mint': [
+        ('pool_address', ADDRESS), ('tx_from', ADDRESS), ('sender', ADDRESS), ('owner', ADDRESS),
+        ('tickLower', INT32), ('tickUpper', INT32), ('amount', AMOUNT), ('amount0', AMOUNT), ('amount1', AMOUNT),
+    ] + _COMMON_FIELDS,
+    'burn': [
+        ('pool_address', ADDRESS), ('tx_from', ADDRESS), ('owner', ADDRESS),
+        ('tickLower', INT32), ('tickUpper', INT32), ('amount', AMOUNT), ('amount0', AMOUNT), ('amount1', AMOUNT),
+    ] + _COMMON_FIELDS,
+    'collect': [
+        ('pool_address', ADDRESS), ('tx_from', ADDRESS), ('owner', ADDRESS), ('recipient', ADDRESS),
+        ('tickLower', INT32), ('tickUpper', INT32), ('amount0', AMOUNT), ('amount1', AMOUNT),
+    ] + _COMMON_FIELDS,
+    'swap': [
+        ('pool_address', ADDRESS), ('tx_from', ADDRESS), ('sender', ADDRESS), ('recipient', ADDRESS),
+        ('amount0', AMOUNT), ('amount1', AMOUNT), ('sqrtPriceX96', AMOUNT), ('liquidity', AMOUNT), ('tick', INT32),
+    ] + _COMMON_FIELDS,
+    'flash': [
+        ('pool_address', ADDRESS), ('tx_from', ADDRESS), ('sender', ADDRESS), ('recipient', ADDRESS),
+        ('amount0', AMOUNT), ('amount1', AMOUNT), ('paid0', AMOUNT), ('paid1', AMOUNT),
+    ] + _COMMON_FIELDS,
+}
+
+
+def pool_events_parquet_paths() -> Dict[str, str]:
+    """Output file of every Pool event type: data/uniswap_v3/uniswap_v3_{event_type}_events.parquet."""
+    return {
+        event_type: os.path.join(DATA_DIR, f"uniswap_v3_{event_type}_events.parquet")
+        for event_type in POOL_EVENT_FIELDS
+    }
+
+
+def open_pool_events_parquet(config: dict) -> ParquetEventWriter:
+    """
+    Parquet writer for Pool events, one file per event type.
+
+    Args:
+        config: Configuration (PARQUET_COMPRESSION, PARQUET_ROW_GROUP_BLOCKS, PARQUET_AMOUNTS)
+
+    Returns:
+        ParquetEventWriter: write(events, start_block, end_block) per chunk, close() at the end
+    """
+    return ParquetEventWriter(
+        pool_events_parquet_paths(),
+        POOL_EVENT_FIELDS,
+        compression=config['PARQUET_COMPRESSION'],
+        row_group_blocks=config['PARQUET_ROW_GROUP_BLOCKS'],
+        amounts=config['PARQUET_AMOUNTS'],
+    )
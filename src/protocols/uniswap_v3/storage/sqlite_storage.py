@@ -0,0 +1,73 @@
+"""SQLite storage for Uniswap V3 Pool events (--format sqlite)."""
+
+import os
+from typing import Optional
+
+import pandas as pd
+
+from src.core.sqlite_sink import SQLiteEventStore
+from src.protocols.uniswap_v3.decoders.event_decoder import POOL_EVENT_BATCH_FIELDS
+from src.protocols.uniswap_v3.storage.csv_storage import DATA_DIR
+
+
+DB_PATH = os.path.join(DATA_DIR, 'uniswap_v3.sqlite')
+
+# Same columns as the CSV output, typed (see src.core.sqlite_sink)
+POOL_EVENT_SQL_COLUMNS = POOL_EVENT_BATCH_FIELDS
+
+
+def open_pool_events_store(path: str = DB_PATH) -> SQLiteEventStore:
+    """Pool events table (pool_events) of the SQLite database at `path`."""
+    return SQLiteEventStore(path, 'pool_events', POOL_EVENT_SQL_COLUMNS, 'pool_address')
+
+
+def save_pool_events_to_sqlite(events, path: str = DB_PATH) -> int:
+    """
+    Insert Pool events (Initialize, Mint, Burn, Collect, Swap, Flash) into the SQLite database, skipping events already stored.
+
+    Args:
+        events: EventBatch or decoded event dicts (see save_pool_events_to_csv)
+        path: Database file (default data/uniswap_v3/uniswap_v3.sqlite)
+
+    Returns:
+        int: Rows inserted
+    """
+    store = open_pool_events_store(path)
+    try:
+        inserted = store.insert(events)
+        store.create_indexes()
+    finally:
+        store.close()
+    print(f"Saved {inserted} pool events to {path}")
+    return inserted
+
+
+def query_pool_events(
+    pool: Optional[str] = None,
+    start_block: Optional[int] = None,
+    end_block: Optional[int] = None,
+    event_type: Optional[str] = None,
+    transaction_hash: Optional[str] = None,
+    limit: Optional[int] = None,
+    path: str = DB_PATH,
+) -> pd.DataFrame:
+    """
+    Pool events from the SQLite database, e.g. all swaps of one pool between two blocks.
+
+    Args:
+        pool: Pool address
+        start_block: First block (inclusive)
+        end_block: Last block (inclusive)
+        event_type: Event type (e.g. 'swap')
+        transaction_hash: Transaction hash
+        limit: Maximum number of rows
+        path: Database file
+
+    Returns:
+        pd.DataFrame: Matching events ordered by (block_number, log_index)
+    """
+    store = open_pool_events_store(path)
+    try:
+        return store.query(pool, start_block, end_block, event_type, transaction_hash, limit)
+    finally:
+        store.close()
@@ -0,0 +1,138 @@
+"""Vectorized batch decoding agrees with the per-log decoders, whatever form the raw log fields come in."""
+
+import random
+
+import pytest
+from eth_abi import encode
+from hexbytes import HexBytes
+
+from src.core.addresses import format_addresses
+from src.core.batch_decoder import _concat, decode_batch
+from src.protocols.uniswap_v2.decoders import event_decoder as v2
+from src.protocols.uniswap_v3.decoders import event_decoder as v3
+
+
+@pytest.fixture(autouse=True)
+def no_crosscheck():
+    v2.configure_decoder_crosscheck(0.0)
+    v3.configure_decoder_crosscheck(0.0)
+
+
+def _v2_logs(count: int, seed: int) -> list:
+    """Swap, Mint and Burn logs with random amounts (up to 256 bits) as returned by web3."""
+    rng = random.Random(seed)
+    logs = []
+    for i in range(count):
+        kind = rng.choice(['swap', 'mint', 'burn'])
+        topic0 = HexBytes(getattr(v2, f'get_{kind}_event_signature')())
+        num_indexed, num_words = {'swap': (2, 4), 'mint': (1, 2), 'burn': (2, 2)}[kind]
+        indexed = [HexBytes(encode(['address'], ['0x' + rng.getrandbits(160).to_bytes(20, 'big').hex()]))
+                   for _ in range(num_indexed)]
+        amounts = [rng.getrandbits(rng.choice([8, 64, 65, 256])) for _ in range(num_words)]
+        logs.append({
+            'address': HexBytes(rng.getrandbits(160).to_bytes(20, 'big')),
+            'topics': [topic0] + indexed,
+            'data': HexBytes(encode(['uint256'] * num_words, amounts)),
+            'blockNumber': 18_000_000 + i // 4,
+            'transactionHash': HexBytes(rng.getrandbits(256).to_bytes(32, 'big')),
+            'logIndex': i % 4,
+        })
+    return logs
+
+
+def _v3_swap_logs(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    topic0 = HexBytes(v3.get_swap_event_signature())
+    logs = []
+    for i in range(count):
+        sender, recipient = ('0x' + rng.getrandbits(160).to_bytes(20, 'big').hex() for _ in range(2))
+        data = [rng.getrandbits(255) - (1 << 254), -rng.getrandbits(60), rng.getrandbits(160),
+                rng.getrandbits(128), rng.randint(-(1 << 23), (1 << 23) - 1)]
+        logs.append({
+            'address': HexBytes(rng.getrandbits(160).to_bytes(20, 'big')),
+            'topics': [topic0, HexBytes(encode(['address'], [sender])), HexBytes(encode(['address'], [recipient]))],
+            'data': HexBytes(encode(['int256', 'int256', 'uint160', 'uint128', 'int24'], data)),
+            'blockNumber': 18_000_000 + i,
+            'transactionHash': HexBytes(rng.getrandbits(256).to_bytes(32, 'big')),
+            'logIndex': 0,
+        })
+    return logs
+
+
+def _as_json_rpc(log: dict, prefix: str = '0x') -> dict:
+    """The log as raw JSON-RPC returns it: hex strings, optionally without the 0x prefix."""
+    return {
+        **log,
+        'address': prefix + bytes(log['address']).hex(),
+        'topics': [prefix + bytes(topic).hex() for topic in log['topics']],
+        'data': prefix + bytes(log['data']).hex(),
+        'transactionHash': '0x' + bytes(log['transactionHash']).hex(),
+    }
+
+
+def _expected(logs: list, decode) -> list:
+    return [format_addresses(decode(log)) for log in logs]
+
+
+def _decoded(batch) -> list:
+    return [format_addresses(event) for event in batch.to_events()]
+
+
+FORMS = {
+    'hexbytes': lambda logs: logs,
+    'hex strings': lambda logs: [_as_json_rpc(log) for log in logs],
+    'no prefix': lambda logs: [_as_json_rpc(log, '') for log in logs],
+    'mixed': lambda logs: [_as_json_rpc(log, ['0x', ''][i % 2]) if i % 3 else log for i, log in enumerate(logs)],
+}
+
+
+@pytest.mark.parametrize('form', sorted(FORMS))
+def test_pair_logs_match_per_log_decoders(form):
+    logs = FORMS[form](_v2_logs(200, seed=1))
+    batch, positions, errors = v2.decode_pair_logs(logs)
+    assert errors == []
+    assert positions == list(range(len(logs)))
+    assert _decoded(batch) == _expected(logs, v2.decode_pair_event)
+
+
+@pytest.mark.parametrize('form', sorted(FORMS))
+def test_pool_logs_match_per_log_decoders(form):
+    logs = FORMS[form](_v3_swap_logs(200, seed=2))
+    batch, positions, errors = v3.decode_pool_logs(logs)
+    assert errors == []
+    assert positions == list(range(len(logs)))
+    assert _decoded(batch) == _expected(logs, v3.decode_pool_event)
+
+
+def test_unprefixed_strings_are_not_shifted():
+    logs = _v2_logs(10, seed=3)
+    assert _concat([_as_json_rpc(log, '')['data'] for log in logs], 64) == b''.join(bytes(log['data'])[:64] for log in logs)
+
+
+def test_short_data_falls_back_to_per_log_decoding():
+    logs = [_as_json_rpc(log) for log in _v2_logs(50, seed=4)]
+    broken = next(i for i, log in enumerate(logs) if log['topics'][0] == logs[0]['topics'][0])
+    logs[broken]['data'] = logs[broken]['data'][:-64]
+    batch, positions, errors = v2.decode_pair_logs(logs)
+    assert [position for position, _ in errors] == [broken]
+    assert positions == [i for i in range(len(logs)) if i != broken]
+    assert _decoded(batch) == _expected([logs[i] for i in positions], v2.decode_pair_event)
+
+
+def test_short_unprefixed_data_raises_value_error():
+    logs = [_as_json_rpc(log, '') for log in _v3_swap_logs(5, seed=5)]
+    logs[2]['data'] = logs[2]['data'][:-2]
+    layout = v3._pool_event_layouts.get(logs[0]['topics'][0])
+    with pytest.raises(ValueError, match='Data too short'):
+        decode_batch(logs, layout)
+
+
+def test_out_of_range_value_falls_back_and_is_reported():
+    logs = _v3_swap_logs(20, seed=6)
+    data = bytearray(logs[7]['data'])
+    data[4 * 32:5 * 32] = (1 << 23).to_bytes(32, 'big')
+    logs[7]['data'] = HexBytes(bytes(data))
+    batch, positions, errors = v3.decode_pool_logs(logs)
+    assert [position for position, _ in errors] == [7]
+    assert len(batch) == 19
+    assert _decoded(batch) == _expected([logs[i] for i in positions], v3.decode_pool_event)
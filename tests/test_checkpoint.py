@@ -0,0 +1,156 @@
+"""Checkpointed runs resume exactly where the last committed chunk ended."""
+
+import json
+import os
+
+import pytest
+
+from src.core.checkpoint import Checkpoint, atomic_write_json, start_or_resume
+
+
+COLUMNS = ['block_number', 'transaction_hash', 'log_index']
+
+# Chunks of (end_block, rows) as a run would write them
+CHUNKS = [
+    (109, [(100, '0xaa', 0), (104, '0xab', 1)]),
+    (119, [(115, '0xac', 0)]),
+    (129, []),
+    (139, [(130, '0xad', 0), (130, '0xad', 1), (138, '0xae', 3)]),
+]
+
+
+def _create(path: str):
+    def create() -> str:
+        with open(path, 'w') as f:
+            f.write(','.join(COLUMNS) + '\n')
+        return path
+    return create
+
+
+def _append(path: str, rows: list) -> int:
+    with open(path, 'a') as f:
+        for row in rows:
+            f.write(','.join(map(str, row)) + '\n')
+    return len(rows)
+
+
+def _run(checkpoint: Checkpoint, path: str, first_block: int, crash_after: int = None) -> None:
+    """Write the chunks from `first_block` on, committing each; stop mid-chunk after `crash_after` chunks."""
+    written = 0
+    for end_block, rows in CHUNKS:
+        if end_block < first_block:
+            continue
+        if written == crash_after:
+            # Rows reach the file, the process dies before the checkpoint is replaced
+            _append(path, rows or [(end_block, '0xff', 9)])
+            return
+        checkpoint.commit(end_block, _append(path, rows))
+        written += 1
+
+
+def _read(path: str) -> str:
+    with open(path) as f:
+        return f.read()
+
+
+@pytest.fixture
+def output(tmp_path):
+    return str(tmp_path / 'events.csv')
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return Checkpoint(str(tmp_path / 'checkpoints'), 'uniswap_v2', 'index-pair-events')
+
+
+def _complete_output(tmp_path) -> str:
+    path = str(tmp_path / 'complete.csv')
+    checkpoint = Checkpoint(str(tmp_path / 'complete'), 'uniswap_v2', 'index-pair-events')
+    first_block = start_or_resume(checkpoint, 100, 139, False, path, _create(path))
+    _run(checkpoint, path, first_block)
+    return _read(path)
+
+
+@pytest.mark.parametrize('crash_after', range(len(CHUNKS)))
+def test_resume_after_crash_matches_uninterrupted_run(tmp_path, output, checkpoint, crash_after):
+    first_block = start_or_resume(checkpoint, 100, 139, False, output, _create(output))
+    _run(checkpoint, output, first_block, crash_after)
+
+    # A new process: fresh Checkpoint object over the same directory
+    resumed = Checkpoint(str(tmp_path / 'checkpoints'), 'uniswap_v2', 'index-pair-events')
+    first_block = start_or_resume(resumed, 100, 139, True, output, _create(output))
+    assert first_block == ([100] + [end + 1 for end, _ in CHUNKS])[crash_after]
+    _run(resumed, output, first_block)
+
+    assert _read(output) == _complete_output(tmp_path)
+    assert resumed.rows == sum(len(rows) for _, rows in CHUNKS)
+    assert resumed.state['end_block'] == 139
+
+
+def test_resume_of_complete_range_has_nothing_left(output, checkpoint):
+    start_or_resume(checkpoint, 100, 139, False, output, _create(output))
+    _run(checkpoint, output, 100)
+    assert start_or_resume(checkpoint, 100, 139, True, output, _create(output)) == 140
+    # A shorter run over the same checkpoint is complete as well
+    assert checkpoint.resume(100, 120, output) == 121
+
+
+def test_resume_without_checkpoint_starts_fresh(output, checkpoint):
+    with open(output, 'w') as f:
+        f.write('stale\n')
+    assert start_or_resume(checkpoint, 100, 139, True, output, _create(output)) == 100
+    assert _read(output) == ','.join(COLUMNS) + '\n'
+    assert checkpoint.load()['end_block'] == 99
+
+
+def test_resume_rejects_other_start_block(output, checkpoint):
+    start_or_resume(checkpoint, 100, 139, False, output, _create(output))
+    with pytest.raises(ValueError, match='START_BLOCK'):
+        checkpoint.resume(101, 139, output)
+
+
+def test_resume_rejects_other_output(tmp_path, output, checkpoint):
+    start_or_resume(checkpoint, 100, 139, False, output, _create(output))
+    with pytest.raises(ValueError, match='Checkpoint is for output'):
+        checkpoint.resume(100, 139, str(tmp_path / 'other.csv'))
+
+
+def test_resume_rejects_truncated_output(output, checkpoint):
+    start_or_resume(checkpoint, 100, 139, False, output, _create(output))
+    _run(checkpoint, output, 100)
+    with open(output, 'r+') as f:
+        f.truncate(os.path.getsize(output) - 1)
+    with pytest.raises(ValueError, match='checkpoint recorded'):
+        checkpoint.resume(100, 139, output)
+
+
+def test_resume_rejects_missing_output(output, checkpoint):
+    start_or_resume(checkpoint, 100, 139, False, output, _create(output))
+    os.remove(output)
+    with pytest.raises(ValueError, match='missing'):
+        checkpoint.resume(100, 139, output)
+
+
+def test_append_keeps_existing_rows(output, checkpoint):
+    start_or_resume(checkpoint, 100, 139, False, output, _create(output))
+    _run(checkpoint, output, 100)
+    before = _read(output)
+    assert start_or_resume(checkpoint, 140, 200, False, output, _create(output), append=True, columns=COLUMNS) == 140
+    assert _read(output) == before
+    assert checkpoint.rows == sum(len(rows) for _, rows in CHUNKS)
+    assert checkpoint.state['start_block'] == 140
+
+
+def test_append_rejects_other_header(output, checkpoint):
+    start_or_resume(checkpoint, 100, 139, False, output, _create(output))
+    with pytest.raises(ValueError):
+        start_or_resume(checkpoint, 140, 200, False, output, _create(output), append=True, columns=COLUMNS[:-1])
+
+
+def test_atomic_write_json_replaces_whole_file(tmp_path):
+    path = str(tmp_path / 'state' / 'checkpoint.json')
+    atomic_write_json(path, {'end_block': 1})
+    atomic_write_json(path, {'end_block': 2})
+    with open(path) as f:
+        assert json.load(f) == {'end_block': 2}
+    assert os.listdir(os.path.dirname(path)) == ['checkpoint.json']
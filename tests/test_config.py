@@ -0,0 +1,29 @@
+"""load_config refuses settings the run could not carry out before any work starts."""
+
+import sys
+
+import pytest
+
+from src.protocols.uniswap_v2.core import config as v2
+from src.protocols.uniswap_v3.core import config as v3
+
+
+OVERRIDES = {'RPC_URL': 'http://localhost:8545'}
+
+
+@pytest.mark.parametrize('protocol', [v2, v3])
+def test_zstd_without_zstandard_is_refused(protocol, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'zstandard', None)
+    with pytest.raises(ValueError, match='pip install zstandard'):
+        protocol.load_config(dict(OVERRIDES, CSV_COMPRESSION='zstd'))
+
+
+@pytest.mark.parametrize('protocol', [v2, v3])
+def test_unknown_compression_is_refused(protocol):
+    with pytest.raises(ValueError, match='CSV_COMPRESSION'):
+        protocol.load_config(dict(OVERRIDES, CSV_COMPRESSION='lz4'))
+
+
+@pytest.mark.parametrize('protocol', [v2, v3])
+def test_gzip_needs_no_extra_package(protocol):
+    assert protocol.load_config(dict(OVERRIDES, CSV_COMPRESSION='gzip'))['CSV_COMPRESSION'] == 'gzip'
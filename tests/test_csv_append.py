@@ -0,0 +1,126 @@
+"""Appending to output CSVs writes every (transaction_hash, log_index) at most once."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.core import csv_append
+from src.core.csv_append import append_csv_rows, check_header, count_csv_rows, create_csv
+
+
+COLUMNS = ['event_type', 'amount', 'block_number', 'transaction_hash', 'log_index']
+
+
+def _row(n: int, log_index: int = 0, event_type: str = 'swap') -> dict:
+    return {
+        'event_type': event_type,
+        'amount': str(10 ** 30 + n),
+        'block_number': str(18_000_000 + n),
+        'transaction_hash': '0x' + f'{n:064x}',
+        'log_index': str(log_index),
+    }
+
+
+@pytest.fixture
+def output(tmp_path):
+    path = str(tmp_path / 'events.csv')
+    yield path
+    _new_process()
+
+
+def _new_process() -> None:
+    """Forget the cached key indexes, as a new process would."""
+    for index in csv_append._indexes.values():
+        index.close()
+    csv_append._indexes.clear()
+
+
+def _keys(path: str) -> list:
+    frame = pd.read_csv(path, dtype=str)
+    return list(zip(frame['transaction_hash'], frame['log_index'].astype(int)))
+
+
+def test_repeated_rows_are_skipped(output):
+    rows = [_row(n) for n in range(100)]
+    assert append_csv_rows(output, rows, COLUMNS) == 100
+    assert append_csv_rows(output, rows, COLUMNS) == 0
+    overlap = [_row(n) for n in range(90, 120)]
+    assert append_csv_rows(output, overlap, COLUMNS) == 20
+    assert _keys(output) == [(_row(n)['transaction_hash'], 0) for n in range(120)]
+    assert count_csv_rows(output, COLUMNS) == 120
+
+
+def test_log_index_is_part_of_the_key(output):
+    rows = [_row(7, log_index) for log_index in range(5)]
+    assert append_csv_rows(output, rows, COLUMNS) == 5
+    assert append_csv_rows(output, rows[:2] + [_row(7, 5)], COLUMNS) == 1
+
+
+def test_duplicates_within_one_append_are_written_once(output):
+    assert append_csv_rows(output, [_row(1), _row(2), _row(1)], COLUMNS) == 2
+    assert len(_keys(output)) == 2
+
+
+def test_hash_spellings_share_a_key(output):
+    append_csv_rows(output, [_row(3)], COLUMNS)
+    unprefixed = dict(_row(3), transaction_hash=_row(3)['transaction_hash'][2:])
+    upper = dict(_row(3), transaction_hash='0X' + _row(3)['transaction_hash'][2:])
+    assert append_csv_rows(output, [unprefixed, upper], COLUMNS) == 0
+
+
+def test_columns_input_matches_row_dicts(tmp_path, output):
+    rows = [_row(n, n % 3) for n in range(50)]
+    append_csv_rows(output, rows, COLUMNS)
+    other = str(tmp_path / 'columns.csv')
+    append_csv_rows(other, {column: [row[column] for row in rows] for column in COLUMNS}, COLUMNS)
+    with open(output, 'rb') as a, open(other, 'rb') as b:
+        assert a.read() == b.read()
+
+
+def test_index_persists_across_processes(output):
+    append_csv_rows(output, [_row(n) for n in range(10)], COLUMNS)
+    _new_process()
+    assert append_csv_rows(output, [_row(n) for n in range(15)], COLUMNS) == 5
+
+
+def test_index_is_rebuilt_from_the_csv(output):
+    append_csv_rows(output, [_row(n) for n in range(10)], COLUMNS)
+    _new_process()
+    csv_append.reset_key_index(output)
+    assert append_csv_rows(output, [_row(n) for n in range(12)], COLUMNS) == 2
+
+
+def test_rows_written_behind_the_index_are_scanned(output):
+    """A crash between writing rows and committing the index leaves rows the index does not know."""
+    append_csv_rows(output, [_row(n) for n in range(10)], COLUMNS)
+    _new_process()
+    with open(output, 'a') as f:
+        f.write(','.join(_row(10)[column] for column in COLUMNS) + '\n')
+    assert append_csv_rows(output, [_row(10), _row(11)], COLUMNS) == 1
+    assert len(_keys(output)) == 12
+
+
+def test_truncated_rows_can_be_written_again(output):
+    """--resume truncates the CSV to the checkpoint; the rows cut off must not count as present."""
+    append_csv_rows(output, [_row(n) for n in range(10)], COLUMNS)
+    size = os.path.getsize(output)
+    append_csv_rows(output, [_row(n) for n in range(10, 20)], COLUMNS)
+    with open(output, 'r+b') as f:
+        f.truncate(size)
+    assert append_csv_rows(output, [_row(n) for n in range(20)], COLUMNS) == 10
+    assert _keys(output) == [(_row(n)['transaction_hash'], 0) for n in range(20)]
+
+
+def test_create_csv_starts_over(output):
+    append_csv_rows(output, [_row(n) for n in range(10)], COLUMNS)
+    create_csv(output, COLUMNS)
+    assert append_csv_rows(output, [_row(n) for n in range(10)], COLUMNS) == 10
+
+
+def test_other_header_is_refused(output):
+    create_csv(output, COLUMNS[:-1])
+    with pytest.raises(ValueError, match='re-index it without --append'):
+        check_header(output, COLUMNS)
+    with pytest.raises(ValueError):
+        append_csv_rows(output, [_row(1)], COLUMNS)
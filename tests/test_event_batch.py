@@ -0,0 +1,142 @@
+"""EventBatch keeps every decoded value exactly through its column operations."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.core.addresses import format_addresses
+from src.core.event_batch import ADDRESS, AMOUNT, HASH, INT32, INT64, TEXT, EventBatch
+
+
+FIELDS = [
+    ('event_type', TEXT), ('pool_address', ADDRESS), ('sender', ADDRESS), ('amount0', AMOUNT), ('amount1', AMOUNT),
+    ('tick', INT32), ('block_number', INT64), ('transaction_hash', HASH), ('log_index', INT64),
+]
+
+AMOUNTS = [0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1, 1 << 64, (1 << 256) - 1, -1, -(1 << 63), -(1 << 63) - 1, -(1 << 255)]
+
+
+def _events(count: int, seed: int, amounts=AMOUNTS) -> list:
+    """Swap and mint dicts as the per-log decoders return them; mints have no tick or sender."""
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        event = {
+            'event_type': rng.choice(['swap', 'mint']),
+            'pool_address': rng.getrandbits(160).to_bytes(20, 'big'),
+            'amount0': rng.choice(amounts),
+            'amount1': rng.choice(amounts),
+            'block_number': 18_000_000 + i,
+            'transaction_hash': '0x' + rng.getrandbits(256).to_bytes(32, 'big').hex(),
+            'log_index': rng.randint(0, 500),
+        }
+        if event['event_type'] == 'swap':
+            event['sender'] = rng.getrandbits(160).to_bytes(20, 'big')
+            event['tick'] = rng.randint(-(1 << 23), (1 << 23) - 1)
+        events.append(event)
+    return events
+
+
+def _normalized(events: list) -> list:
+    return [format_addresses(event) for event in events]
+
+
+def test_events_round_trip():
+    events = _events(300, seed=1)
+    assert _normalized(EventBatch.from_events(FIELDS, events).to_events()) == _normalized(events)
+
+
+@pytest.mark.parametrize('amounts, dtype', [
+    ([0, 5, (1 << 64) - 1], np.uint64),
+    ([-3, 7, (1 << 63) - 1], np.int64),
+    (AMOUNTS, object),
+])
+def test_amount_columns_use_the_narrowest_exact_dtype(amounts, dtype):
+    batch = EventBatch.from_events(FIELDS, [{'amount0': value} for value in amounts])
+    assert batch.array('amount0').dtype == dtype
+    assert batch.column('amount0') == amounts
+
+
+def test_concat_keeps_exact_values_across_dtypes():
+    parts = [
+        EventBatch.from_events(FIELDS, _events(50, seed=2, amounts=[0, (1 << 64) - 1])),
+        EventBatch.from_events(FIELDS, _events(50, seed=3, amounts=[-(1 << 63), 5])),
+        EventBatch(FIELDS, 0),
+        EventBatch.from_events(FIELDS, _events(50, seed=4)),
+    ]
+    batch = EventBatch.concat(FIELDS, parts)
+    expected = [event for part in parts for event in part.to_events()]
+    assert len(batch) == 150
+    assert batch.to_events() == expected
+    assert batch.array('amount0').dtype == object
+
+
+def test_concat_merges_text_categories():
+    first = EventBatch.from_columns(FIELDS, 3, {'event_type': 'swap'})
+    second = EventBatch.from_events(FIELDS, [{'event_type': 'mint'}, {'event_type': 'swap'}, {}])
+    batch = EventBatch.concat(FIELDS, [first, second])
+    assert batch.column('event_type') == ['swap', 'swap', 'swap', 'mint', 'swap', None]
+    assert batch.counts() == {'swap': 4, 'mint': 1}
+
+
+def test_take_reorders_and_filters():
+    events = _events(40, seed=5)
+    batch = EventBatch.from_events(FIELDS, events)
+    order = np.random.default_rng(5).permutation(40)
+    assert batch.take(order).to_events() == [batch.row(i) for i in order.tolist()]
+    mask = np.array([event['event_type'] == 'swap' for event in events])
+    assert batch.take(mask).to_events() == [batch.row(i) for i in np.flatnonzero(mask).tolist()]
+
+
+def test_missing_fields_are_empty_cells():
+    batch = EventBatch.from_events(FIELDS, [{'event_type': 'mint', 'amount0': 3}, {'event_type': 'swap', 'tick': -5}])
+    assert batch.row(0) == {'event_type': 'mint', 'amount0': 3}
+    assert batch.formatted_column('tick') == ['', '-5']
+    assert batch.formatted_column('sender') == ['', '']
+    assert batch.formatted_column('not_a_field') == ['', '']
+
+
+def test_formatted_column_matches_text_output():
+    events = _events(20, seed=6)
+    batch = EventBatch.from_events(FIELDS, events)
+    formatted = _normalized(events)
+    assert batch.formatted_column('pool_address') == [event['pool_address'] for event in formatted]
+    assert batch.formatted_column('amount1') == [str(event['amount1']) for event in events]
+    assert batch.formatted_column('transaction_hash') == [event['transaction_hash'] for event in events]
+
+
+def test_packed_columns_are_taken_as_they_are():
+    events = _events(10, seed=7)
+    batch = EventBatch.from_columns(FIELDS, 10, {
+        'pool_address': b''.join(event['pool_address'] for event in events),
+        'block_number': np.arange(10),
+    })
+    assert batch.column('pool_address') == [event['pool_address'] for event in events]
+    assert batch.column('block_number') == list(range(10))
+    with pytest.raises(ValueError):
+        batch.set_column('pool_address', b'\x00' * 19)
+
+
+def test_hex_string_addresses_are_stored_raw():
+    address = bytes(range(20))
+    batch = EventBatch.from_events(FIELDS, [{'sender': '0x' + address.hex()}, {'sender': address.hex().upper()}, {'sender': ''}])
+    assert batch.column('sender') == [address, address, None]
+
+
+def test_set_row_overwrites_and_widens():
+    batch = EventBatch.from_events(FIELDS, _events(5, seed=8, amounts=[1, 2]))
+    replacement = dict(_events(1, seed=9)[0], event_type='burn', amount0=-(1 << 200))
+    replacement.pop('sender', None)
+    batch.set_row(2, replacement)
+    assert format_addresses(batch.row(2)) == format_addresses(replacement)
+    assert batch.column('amount0')[2] == -(1 << 200)
+    assert batch.counts()['burn'] == 1
+
+
+def test_keep_empty_rows_have_every_field():
+    batch = EventBatch.from_events(FIELDS, [{'event_type': 'mint', 'amount0': 3}, {'event_type': 'swap', 'tick': -5}])
+    names = [name for name, _ in FIELDS]
+    assert [list(event) for event in batch.to_events(keep_empty=True)] == [names, names]
+    assert batch.row(0, keep_empty=True) == dict.fromkeys(names, None) | {'event_type': 'mint', 'amount0': 3}
+    assert batch.row(1, keep_empty=True)['sender'] is None
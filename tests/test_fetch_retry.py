@@ -0,0 +1,114 @@
+"""The sync and async eth_getLogs paths retry, split and skip the same ranges for the same errors."""
+
+import asyncio
+
+import pytest
+
+from src.core import gaps
+from src.protocols.uniswap_v2.indexers import pairs_indexer
+from src.protocols.uniswap_v3.indexers import pools_indexer
+
+
+TOO_MANY = ValueError({'code': -32005, 'message': 'query returned more than 10000 results'})
+
+
+class _Window:
+    def __init__(self):
+        self.errors = []
+
+    def record_error(self, suggested_span: int = None) -> None:
+        self.errors.append(suggested_span)
+
+
+class _Provider:
+    """
+    Scripted eth_getLogs: ranges wider than `max_span` fail with -32005, `failures`
+    maps a range to the errors it raises first, every other call returns one log per block.
+    """
+
+    def __init__(self, failures: dict, max_span: int = 1000):
+        self.failures = {key: list(errors) for key, errors in failures.items()}
+        self.max_span = max_span
+        self.calls = []
+
+    def get_logs(self, params: dict) -> list:
+        start, end = params['fromBlock'], params['toBlock']
+        self.calls.append((start, end))
+        if end - start + 1 > self.max_span:
+            raise TOO_MANY
+        errors = self.failures.get((start, end))
+        if errors:
+            raise errors.pop(0)
+        return [{'blockNumber': block} for block in range(start, end + 1)]
+
+
+class _SyncWeb3:
+    def __init__(self, provider: _Provider):
+        self.eth = provider
+
+
+class _AsyncEth:
+    def __init__(self, provider: _Provider):
+        self.provider = provider
+
+    async def get_logs(self, params: dict) -> list:
+        return self.provider.get_logs(params)
+
+
+class _AsyncWeb3:
+    def __init__(self, provider: _Provider):
+        self.eth = _AsyncEth(provider)
+
+
+async def _no_sleep(seconds) -> None:
+    pass
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    for indexer in (pairs_indexer, pools_indexer):
+        monkeypatch.setattr(indexer.time, 'sleep', lambda seconds: None)
+    monkeypatch.setattr(asyncio, 'sleep', _no_sleep)
+
+
+def _fetch(indexer, transport: str, failures: dict, max_span: int, tmp_path, monkeypatch) -> tuple:
+    """(logs, eth_getLogs calls, recorded gaps, window errors) of fetching blocks 100-139."""
+    ledger = gaps.GapLedger(str(tmp_path / transport), 'test', 'index')
+    monkeypatch.setattr(gaps, '_ledger', ledger)
+    provider, window = _Provider(failures, max_span), _Window()
+    if transport == 'sync':
+        logs = indexer._fetch_logs_with_retry(_SyncWeb3(provider), [], [], 100, 139, window=window)
+    else:
+        logs = asyncio.run(indexer._fetch_logs_with_retry_async(_AsyncWeb3(provider), [], [], 100, 139, window=window))
+    return [log['blockNumber'] for log in logs], provider.calls, ledger.recorded, window.errors
+
+
+SCENARIOS = {
+    # Errors the retryable-error classifier does not know are retried like any other
+    'unknown error once': ({(100, 139): [ValueError('connection reset by peer')]}, 1000, list(range(100, 140)), []),
+    'rate limited throughout': ({(100, 139): [ValueError('429 Too Many Requests')] * 3}, 1000, [], [(100, 139)]),
+    'malformed response throughout': ({(100, 139): [KeyError('result')] * 3}, 1000, [], [(100, 139)]),
+    'split': ({}, 10, list(range(100, 140)), []),
+    'split with one failing half': (
+        {(120, 129): [ValueError('bad gateway')] * 3}, 10, list(range(100, 120)) + list(range(130, 140)), [(120, 129)],
+    ),
+}
+
+
+@pytest.mark.parametrize('indexer', [pairs_indexer, pools_indexer], ids=['v2', 'v3'])
+@pytest.mark.parametrize('scenario', sorted(SCENARIOS))
+def test_transports_agree(indexer, scenario, tmp_path, monkeypatch):
+    failures, max_span, blocks, skipped = SCENARIOS[scenario]
+    sync = _fetch(indexer, 'sync', failures, max_span, tmp_path, monkeypatch)
+    async_ = _fetch(indexer, 'async', failures, max_span, tmp_path, monkeypatch)
+    assert async_ == sync
+    logs, _, recorded, _ = sync
+    assert logs == blocks
+    assert recorded == skipped
+
+
+def test_every_failed_attempt_shrinks_the_window(tmp_path, monkeypatch):
+    failures = {(100, 139): [ValueError('429 Too Many Requests')] * 2}
+    for transport in ('sync', 'async'):
+        logs, calls, recorded, errors = _fetch(pairs_indexer, transport, failures, 1000, tmp_path, monkeypatch)
+        assert (len(logs), len(calls), recorded, errors) == (40, 3, [], [None, None])
@@ -0,0 +1,112 @@
+"""Re-running a block range of a partitioned dataset replaces its files without ever losing data."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.core.event_batch import ADDRESS, AMOUNT, HASH, INT64, TEXT, EventBatch
+from src.core.partitions import PartitionedEventWriter, load_manifest, read_events
+
+
+COLUMNS = [
+    ('event_type', TEXT), ('pair_address', ADDRESS), ('amount0', AMOUNT),
+    ('block_number', INT64), ('transaction_hash', HASH), ('log_index', INT64),
+]
+FIELDS = {'swap': COLUMNS, 'mint': COLUMNS}
+
+CONFIG = {
+    'OUTPUT_FORMAT': 'csv', 'PARTITION_BLOCKS': 50, 'PARTITION_PAIR_BUCKETS': 0,
+    'PARQUET_COMPRESSION': 'zstd', 'PARQUET_ROW_GROUP_BLOCKS': 10, 'PARQUET_AMOUNTS': 'decimal',
+}
+
+
+def _events(start_block: int, end_block: int, amount: int) -> EventBatch:
+    """Two events per block; `amount` tells the runs apart."""
+    events = [
+        {
+            'event_type': 'swap' if log_index else 'mint',
+            'pair_address': bytes([block % 7 + 1]) * 20,
+            'amount0': amount + block,
+            'block_number': block,
+            'transaction_hash': '0x' + f'{block:064x}',
+            'log_index': log_index,
+        }
+        for block in range(start_block, end_block + 1) for log_index in range(2)
+    ]
+    return EventBatch.from_events(COLUMNS, events)
+
+
+def _run(root: str, start_block: int, end_block: int, amount: int, chunk: int = 25, crash_at: int = None) -> None:
+    """Write [start_block, end_block] in chunks like stream_*_events; stop without close() before block `crash_at`."""
+    writer = PartitionedEventWriter(root, FIELDS, 'pair_address', start_block, end_block, CONFIG)
+    for first in range(start_block, end_block + 1, chunk):
+        last = min(first + chunk - 1, end_block)
+        if crash_at is not None and last >= crash_at:
+            return
+        writer.write(_events(first, last, amount), first, last)
+    writer.close()
+
+
+def _amounts(root: str) -> list:
+    frames = [read_events(root, event_type) for event_type in FIELDS]
+    df = pd.concat(frames).sort_values(['block_number', 'log_index'])
+    return list(zip(df['block_number'], df['log_index'], df['amount0'].astype(int)))
+
+
+def _expected(start_block: int, end_block: int, amount: int) -> list:
+    return [(block, log_index, amount + block) for block in range(start_block, end_block + 1) for log_index in range(2)]
+
+
+def _files_on_disk(root: str) -> set:
+    return {
+        os.path.relpath(os.path.join(directory, name), root)
+        for directory, _, names in os.walk(root) for name in names if name.startswith('part-')
+    }
+
+
+def _listed(root: str) -> set:
+    return {entry['path'] for entry in load_manifest(root)['files']}
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path / 'events')
+
+
+def test_rerun_replaces_the_range(root):
+    _run(root, 100, 199, amount=1000)
+    _run(root, 100, 199, amount=2000)
+    assert _amounts(root) == _expected(100, 199, 2000)
+    assert _files_on_disk(root) == _listed(root)
+
+
+def test_failed_rerun_keeps_earlier_data(root):
+    _run(root, 100, 199, amount=1000)
+    # Bucket 100-149 is finished (renamed over the earlier file), 150-199 never is
+    _run(root, 100, 199, amount=2000, crash_at=175)
+    assert _amounts(root) == _expected(100, 149, 2000) + _expected(150, 199, 1000)
+    _run(root, 100, 199, amount=3000)
+    assert _amounts(root) == _expected(100, 199, 3000)
+    assert _files_on_disk(root) == _listed(root)
+
+
+def test_failed_wider_rerun_keeps_earlier_files(root):
+    _run(root, 100, 149, amount=1000)
+    _run(root, 150, 199, amount=1000)
+    earlier = _listed(root)
+    _run(root, 100, 249, amount=2000, crash_at=100)
+    assert _listed(root) == earlier
+    assert _amounts(root) == _expected(100, 199, 1000)
+    _run(root, 100, 249, amount=2000)
+    assert _amounts(root) == _expected(100, 249, 2000)
+    assert _files_on_disk(root) == _listed(root)
+    assert not earlier & _listed(root)
+
+
+def test_partial_overlap_is_refused_and_keeps_files(root):
+    _run(root, 100, 199, amount=1000)
+    with pytest.raises(ValueError, match='partly overlaps'):
+        _run(root, 150, 249, amount=2000)
+    assert _amounts(root) == _expected(100, 199, 1000)
+    assert _files_on_disk(root) == _listed(root)
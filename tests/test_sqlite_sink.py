@@ -0,0 +1,84 @@
+"""Events read back from the SQLite store match the CSV output of the same events."""
+
+import random
+
+import pandas as pd
+import pytest
+
+from src.core.csv_writer import CsvWriter
+from src.core.event_batch import EventBatch
+from src.protocols.uniswap_v2.storage.csv_storage import PAIR_EVENT_COLUMNS
+from src.protocols.uniswap_v2.storage.sqlite_storage import (
+    PAIR_EVENT_SQL_COLUMNS, query_pair_events, save_pair_events_to_sqlite,
+)
+
+
+def _address(rng) -> bytes:
+    return rng.getrandbits(160).to_bytes(20, 'big')
+
+
+def _events(count: int, seed: int) -> list:
+    """Swap, Mint and Burn dicts as the per-log decoders return them (tx_from unknown for some)."""
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        event = {
+            'event_type': rng.choice(['swap', 'mint', 'burn']),
+            'pair_address': _address(rng),
+            'sender': _address(rng),
+            'tx_from': _address(rng) if i % 5 else None,
+            'block_number': 18_000_000 + i // 3,
+            'transaction_hash': '0x' + rng.getrandbits(256).to_bytes(32, 'big').hex(),
+            'log_index': i % 3,
+        }
+        if event['event_type'] == 'swap':
+            for name in ('amount0In', 'amount1In', 'amount0Out', 'amount1Out'):
+                event[name] = rng.getrandbits(rng.choice([8, 64, 65, 112]))
+            event['to'] = _address(rng)
+        else:
+            event['amount0'] = rng.getrandbits(112)
+            event['amount1'] = rng.getrandbits(112)
+            if event['event_type'] == 'burn':
+                event['to'] = _address(rng)
+        events.append(event)
+    return events
+
+
+@pytest.fixture
+def stored(tmp_path):
+    """(events, database path, CSV of the same events)."""
+    events = _events(200, seed=1)
+    database = str(tmp_path / 'uniswap_v2.sqlite')
+    save_pair_events_to_sqlite(events, database)
+    csv_path = str(tmp_path / 'pair_events.csv')
+    writer = CsvWriter(csv_path, PAIR_EVENT_COLUMNS)
+    writer.write(EventBatch.from_events(PAIR_EVENT_SQL_COLUMNS, events))
+    writer.close()
+    return events, database, csv_path
+
+
+def _as_text(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame.astype(object).where(frame.notna(), '').astype(str)
+
+
+def test_query_matches_csv_output(stored):
+    _, database, csv_path = stored
+    expected = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    expected = expected.sort_values(['block_number', 'log_index'], key=lambda column: column.astype(int), kind='stable')
+    frame = query_pair_events(path=database)
+    pd.testing.assert_frame_equal(_as_text(frame), expected.reset_index(drop=True))
+    assert frame['transaction_hash'].str.startswith('0x').all()
+
+
+def test_transaction_hash_filter_round_trips(stored):
+    events, database, _ = stored
+    transaction_hash = events[42]['transaction_hash']
+    frame = query_pair_events(transaction_hash=transaction_hash, path=database)
+    assert frame['transaction_hash'].tolist() == [transaction_hash]
+    assert query_pair_events(transaction_hash=transaction_hash[2:].upper(), path=database)['log_index'].tolist() == [42 % 3]
+
+
+def test_stored_events_are_not_inserted_again(stored):
+    events, database, _ = stored
+    assert save_pair_events_to_sqlite(events[:50], database) == 0
+    assert len(query_pair_events(path=database)) == len(events)
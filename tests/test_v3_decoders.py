@@ -0,0 +1,136 @@
+"""Fast-path V3 pool event decoders agree with the eth_abi reference decoders over the full value ranges."""
+
+import itertools
+import random
+
+import pytest
+from eth_abi import encode
+from hexbytes import HexBytes
+
+from src.core.addresses import format_addresses
+from src.protocols.uniswap_v3.decoders import event_decoder as d
+
+
+INT256 = [-(1 << 255), -(1 << 255) + 1, -1, 0, 1, (1 << 255) - 1]
+UINT256 = [0, 1, (1 << 255) - 1, 1 << 255, (1 << 256) - 1]
+UINT160 = [0, 1, 1 << 159, (1 << 160) - 1]
+UINT128 = [0, 1, 1 << 127, (1 << 128) - 1]
+INT24 = [-(1 << 23), -(1 << 23) + 1, -1, 0, 1, (1 << 23) - 1]
+ADDRESS = ['0x' + '00' * 20, '0x' + 'ff' * 20, '0x' + '80' + '00' * 19]
+
+BOUNDS = {'int256': INT256, 'uint256': UINT256, 'uint160': UINT160, 'uint128': UINT128, 'int24': INT24, 'address': ADDRESS}
+
+# (indexed types after topic0, data types) of every event
+LAYOUTS = {
+    'initialize': ([], ['uint160', 'int24']),
+    'mint': (['address', 'int24', 'int24'], ['address', 'uint128', 'uint256', 'uint256']),
+    'burn': (['address', 'int24', 'int24'], ['uint128', 'uint256', 'uint256']),
+    'collect': (['address', 'int24', 'int24'], ['address', 'uint128', 'uint128']),
+    'swap': (['address', 'address'], ['int256', 'int256', 'uint160', 'uint128', 'int24']),
+    'flash': (['address', 'address'], ['uint256', 'uint256', 'uint256', 'uint256']),
+}
+
+DECODERS = {
+    'initialize': (d.decode_initialize_event, d.decode_initialize_event_abi),
+    'mint': (d.decode_mint_event, d.decode_mint_event_abi),
+    'burn': (d.decode_burn_event, d.decode_burn_event_abi),
+    'collect': (d.decode_collect_event, d.decode_collect_event_abi),
+    'swap': (d.decode_swap_event, d.decode_swap_event_abi),
+    'flash': (d.decode_flash_event, d.decode_flash_event_abi),
+}
+
+
+@pytest.fixture(autouse=True)
+def no_crosscheck():
+    d.configure_decoder_crosscheck(0.0)
+
+
+def _random_value(rng: random.Random, type_name: str):
+    if type_name == 'address':
+        return '0x' + rng.getrandbits(160).to_bytes(20, 'big').hex()
+    bits = int(type_name.lstrip('uint'))
+    value = rng.getrandbits(rng.randint(1, bits))
+    if type_name.startswith('int'):
+        value = value - (1 << (bits - 1)) if value >> (bits - 1) else value
+    return value
+
+
+def _log(name: str, indexed: list, data: list, block_number: int = 12_369_621, log_index: int = 0) -> dict:
+    """Log of event `name` with the given indexed and data values, as returned by web3."""
+    indexed_types, data_types = LAYOUTS[name]
+    topic0 = HexBytes(getattr(d, f'get_{name}_event_signature')())
+    return {
+        'address': '0x8ad599c3A0ff1De082011EFDDc58f1908eb6e6D8',
+        'topics': [topic0] + [HexBytes(encode([t], [v])) for t, v in zip(indexed_types, indexed)],
+        'data': HexBytes(encode(data_types, data)),
+        'blockNumber': block_number,
+        'transactionHash': HexBytes(bytes(range(32))),
+        'logIndex': log_index,
+    }
+
+
+def _boundary_logs(name: str) -> list:
+    """Logs where every field runs through the boundary values of its type."""
+    indexed_types, data_types = LAYOUTS[name]
+    types = indexed_types + data_types
+    rows = max(len(BOUNDS[t]) for t in types)
+    logs = []
+    for shift in range(rows):
+        values = [BOUNDS[t][(i + shift) % len(BOUNDS[t])] for i, t in enumerate(types)]
+        logs.append(_log(name, values[:len(indexed_types)], values[len(indexed_types):], log_index=shift))
+    return logs
+
+
+def _random_logs(name: str, count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    indexed_types, data_types = LAYOUTS[name]
+    return [
+        _log(name, [_random_value(rng, t) for t in indexed_types], [_random_value(rng, t) for t in data_types],
+             block_number=rng.randint(12_369_621, 20_000_000), log_index=rng.randint(0, 500))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize('name', sorted(LAYOUTS))
+def test_boundary_values_match_eth_abi(name):
+    fast, reference = DECODERS[name]
+    for log in _boundary_logs(name):
+        assert format_addresses(fast(log)) == reference(log)
+
+
+@pytest.mark.parametrize('name', sorted(LAYOUTS))
+def test_random_values_match_eth_abi(name):
+    fast, reference = DECODERS[name]
+    for log in _random_logs(name, 300, seed=sorted(LAYOUTS).index(name)):
+        assert format_addresses(fast(log)) == reference(log)
+
+
+def test_signed_extremes_are_decoded_exactly():
+    log = _log('swap', [ADDRESS[0], ADDRESS[1]], [-(1 << 255), -1, (1 << 160) - 1, (1 << 128) - 1, -(1 << 23)])
+    event = d.decode_swap_event(log)
+    assert event['amount0'] == -(1 << 255)
+    assert event['amount1'] == -1
+    assert event['sqrtPriceX96'] == (1 << 160) - 1
+    assert event['liquidity'] == (1 << 128) - 1
+    assert event['tick'] == -(1 << 23)
+
+
+@pytest.mark.parametrize('name', sorted(LAYOUTS))
+def test_dispatch_matches_per_event_decoder(name):
+    fast, _ = DECODERS[name]
+    for log in _boundary_logs(name):
+        assert d.decode_pool_event(log) == fast(log)
+
+
+def test_all_boundary_combinations_of_ticks():
+    _, reference = DECODERS['burn']
+    for lower, upper in itertools.product(INT24, repeat=2):
+        log = _log('burn', [ADDRESS[2], lower, upper], [1, 2, 3])
+        assert format_addresses(d.decode_burn_event(log)) == reference(log)
+
+
+def test_truncated_data_is_rejected():
+    log = _log('swap', [ADDRESS[0], ADDRESS[1]], [1, 2, 3, 4, 5])
+    log['data'] = log['data'][:-32]
+    with pytest.raises(ValueError):
+        d.decode_swap_event(log)